@@ -0,0 +1,180 @@
+"""
+Resumable sentiment backfill for journal entries.
+
+Scores every entry without a current analysis (never scored, scored by
+another model, or left pending/failed) and writes the results back in bulk.
+Progress is checkpointed after each page, so an interrupted run resumes
+where it stopped:
+
+    python -m app.cli.backfill --concurrency 16 --page-size 500
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import argparse
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import settings
+from app.repositories.journals import journal_repository
+from app.services.supabase import init_supabase, close_supabase
+from app.services.ai import analyze_sentiment, active_sentiment_model, init_ai_client, close_ai_client, sentiment_batcher
+from app.services.journal_sentiment import analysis_update
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT = ".sentiment_backfill.json"
+
+def load_checkpoint(path: str, model: str) -> Dict[str, Any]:
+    """
+    Reads the checkpoint of a previous run for the same model
+
+    Args:
+        path: Checkpoint file path
+        model: Model the backfill scores with
+
+    Returns:
+        The saved progress, or a fresh one
+    """
+    fresh = {"model": model, "last_id": None, "processed": 0, "updated": 0, "failed": 0}
+    if not os.path.exists(path):
+        return fresh
+
+    with open(path) as f:
+        checkpoint = json.load(f)
+
+    if checkpoint.get("model") != model:
+        logger.info(f"Checkpoint was written for model {checkpoint.get('model')}, starting over")
+        return fresh
+
+    return checkpoint
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    # Write then rename, so an interruption never leaves a truncated checkpoint
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+async def _score_page(rows: List[Dict[str, Any]], semaphore: asyncio.Semaphore) -> List[Optional[Dict[str, Any]]]:
+    async def score(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                sentiment_data = await analyze_sentiment(row["content"])
+            except Exception as e:
+                logger.warning(f"Failed to analyze journal entry {row['id']}: {str(e)}")
+                return None
+            if not sentiment_data:
+                return None
+            return analysis_update(row, sentiment_data)
+
+    # Concurrent calls are coalesced into batched inference requests by the sentiment batcher
+    return await asyncio.gather(*(score(row) for row in rows))
+
+async def backfill(
+    page_size: int,
+    concurrency: int,
+    checkpoint_path: str,
+    max_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Runs the backfill from the last checkpoint
+
+    Args:
+        page_size: Rows fetched and written per round trip
+        concurrency: Maximum entries being scored at once
+        checkpoint_path: File used to persist progress
+        max_rows: Stop after this many rows (for trial runs)
+
+    Returns:
+        The final progress counters
+    """
+    model = active_sentiment_model()
+    checkpoint = load_checkpoint(checkpoint_path, model)
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    run_processed = 0
+
+    logger.info(f"Backfilling sentiment with {model}, resuming after {checkpoint['last_id'] or 'the start'}")
+
+    next_page = asyncio.ensure_future(
+        journal_repository.list_needing_analysis(model, checkpoint["last_id"], page_size)
+    )
+    while True:
+        rows = await next_page
+        if max_rows is not None:
+            rows = rows[:max(0, max_rows - run_processed)]
+        if not rows:
+            break
+
+        # Keyset pagination: the next page only depends on the last id, so fetch it while this one is scored
+        next_page = asyncio.ensure_future(
+            journal_repository.list_needing_analysis(model, rows[-1]["id"], page_size)
+        )
+
+        results = await _score_page(rows, semaphore)
+        updates = [result for result in results if result is not None]
+        updated = await journal_repository.bulk_update_analysis(updates)
+
+        run_processed += len(rows)
+        checkpoint["last_id"] = rows[-1]["id"]
+        checkpoint["processed"] += len(rows)
+        checkpoint["updated"] += updated
+        checkpoint["failed"] += len(rows) - len(updates)
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"{checkpoint['processed']} rows processed ({checkpoint['updated']} updated, "
+            f"{checkpoint['failed']} failed), {run_processed / elapsed:.1f} rows/s"
+        )
+
+    if not next_page.done():
+        next_page.cancel()
+
+    elapsed = time.perf_counter() - started
+    checkpoint["rows_per_second"] = round(run_processed / elapsed, 2) if elapsed else 0.0
+    return checkpoint
+
+async def run(args: argparse.Namespace) -> None:
+    init_supabase()
+    init_ai_client()
+    try:
+        result = await backfill(args.page_size, args.concurrency, args.checkpoint, args.limit)
+    finally:
+        await close_supabase()
+        await close_ai_client()
+
+    logger.info(
+        f"Backfill finished: {result['processed']} rows processed, {result['updated']} updated, "
+        f"{result['failed']} failed, {result['rows_per_second']} rows/s"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill sentiment analysis of journal entries")
+    parser.add_argument("--page-size", type=int, default=500, help="rows fetched and written per round trip")
+    parser.add_argument("--concurrency", type=int, default=16, help="entries scored concurrently")
+    parser.add_argument("--batch-size", type=int, default=settings.SENTIMENT_BATCH_SIZE, help="texts per inference request")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="progress file used to resume")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the beginning")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many rows")
+    parser.add_argument("--allow-fallback", action="store_true", help="store local lexicon scores when the model is unavailable")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if not settings.DEBUG else logging.DEBUG,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    sentiment_batcher.max_batch_size = max(1, args.batch_size)
+    # Lexicon scores would be recomputed by the next run anyway, so fail the row instead by default
+    settings.SENTIMENT_LOCAL_FALLBACK = args.allow_fallback
+
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Mood rollup consistency repair.
+
+Rollups are maintained by a trigger on every mood write; this rebuilds them
+from raw moods, e.g. after a bulk load with triggers disabled:
+
+    python -m app.cli.rollups [--user-id USER_ID]
+"""
+import asyncio
+import logging
+import argparse
+from typing import Optional
+
+from app.config.settings import settings
+from app.repositories.moods import mood_repository
+from app.services.supabase import init_supabase, close_supabase
+
+logger = logging.getLogger(__name__)
+
+async def run(user_id: Optional[str]) -> None:
+    init_supabase()
+    try:
+        buckets = await mood_repository.rebuild_rollups(user_id)
+    finally:
+        await close_supabase()
+
+    logger.info(f"Rebuilt {buckets} mood rollup buckets for {user_id or 'all users'}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild mood rollups from raw moods")
+    parser.add_argument("--user-id", default=None, help="only rebuild this user's rollups")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if not settings.DEBUG else logging.DEBUG,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    asyncio.run(run(args.user_id))
+
+if __name__ == "__main__":
+    main()
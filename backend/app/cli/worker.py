@@ -0,0 +1,51 @@
+"""
+Standalone background job worker.
+
+Runs the job queue without the API, e.g. next to a Lambda deployment where
+request handlers cannot keep workers alive. Use with JOB_QUEUE_BACKEND=redis
+so jobs enqueued by the API are picked up here:
+
+    python -m app.cli.worker
+"""
+import asyncio
+import signal
+import logging
+
+from app.config.settings import settings
+from app.services.supabase import init_supabase, close_supabase
+from app.services.ai import init_ai_client, close_ai_client
+from app.services.jobs import job_queue
+
+# Registers the job handlers
+import app.services.journal_sentiment  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+async def run() -> None:
+    init_supabase()
+    init_ai_client()
+    await job_queue.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await stop.wait()
+    logger.info("Stopping worker")
+
+    await job_queue.stop()
+    await close_supabase()
+    await close_ai_client()
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO if not settings.DEBUG else logging.DEBUG,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    if not job_queue.durable:
+        logger.warning("JOB_QUEUE_BACKEND is not 'redis', this worker only sees jobs it enqueues itself")
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -12,19 +12,82 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1 day
     
+    # Password hashing worker pool
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")  # 'thread' or 'process'
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 100
+    
     # Supabase
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
+    SUPABASE_POOL_SIZE: int = 20  # max concurrent connections
+    SUPABASE_POOL_KEEPALIVE: int = 10  # idle connections kept open
+    SUPABASE_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    SUPABASE_HTTP2: bool = os.getenv("SUPABASE_HTTP2", "True").lower() == "true"  # used when h2 is installed
     
     # AI Service
     HUGGINGFACE_API_KEY: str = os.getenv("HUGGINGFACE_API_KEY", "")
-    MODEL_ENDPOINT: str = os.getenv("MODEL_ENDPOINT", "")
+    MODEL_ENDPOINT: str = os.getenv("MODEL_ENDPOINT", "")  # "local", a full inference URL, or empty for SENTIMENT_MODEL
+    HF_API_URL: str = os.getenv("HF_API_URL", "https://api-inference.huggingface.co/models")
+    HF_MAX_CONNECTIONS: int = 20
+    HF_MAX_KEEPALIVE: int = 10
+    HF_KEEPALIVE_EXPIRY: float = 60.0  # seconds
+    HF_HTTP2: bool = os.getenv("HF_HTTP2", "True").lower() == "true"  # used when h2 is installed
+    HF_CONNECT_TIMEOUT: float = 5.0  # seconds
+    HF_SENTIMENT_TIMEOUT: float = 10.0  # seconds
+    HF_CHAT_TIMEOUT: float = 30.0  # seconds
+    HF_MIN_TIMEOUT: float = 1.0  # floor for adaptive timeouts, in seconds
+    HF_TIMEOUT_PERCENTILE: float = 99.0  # adaptive timeouts follow this latency percentile
+    HF_TIMEOUT_MULTIPLIER: float = 2.0  # headroom over that percentile
+    HF_MAX_RETRIES: int = 2
+    HF_RETRY_BASE_DELAY: float = 0.2  # seconds, doubled per attempt with full jitter
+    HF_RETRY_MAX_DELAY: float = 2.0  # seconds
+    HF_RETRY_BUDGET_RATIO: float = 0.1  # retries allowed per regular request
+    HF_RETRY_BUDGET_MIN_PER_SECOND: float = 1.0
+    HF_MAX_WARMUP_WAIT: float = 20.0  # longest model loading time worth waiting for, in seconds
+    HF_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive failures that open a model's circuit
+    HF_BREAKER_RECOVERY_TIME: float = 30.0  # seconds before a trial call
+    SENTIMENT_MODEL: str = os.getenv("SENTIMENT_MODEL", "distilbert-base-uncased-finetuned-sst-2-english")
+    SENTIMENT_CACHE_MAX_SIZE: int = 4096
+    SENTIMENT_CACHE_TTL: int = 60 * 60  # 1 hour in process
+    SENTIMENT_CACHE_REDIS_TTL: int = 60 * 60 * 24 * 7  # 1 week in Redis
+    SENTIMENT_BATCH_SIZE: int = 16  # max texts per inference request
+    SENTIMENT_BATCH_WAIT_MS: float = 10.0  # max time to wait for a batch to fill
+    SENTIMENT_CHUNK_CHARS: int = 512  # max characters per model input
+    SENTIMENT_MAX_CHUNKS: int = 32  # longer entries are sampled evenly
+    SENTIMENT_CHUNK_CONCURRENCY: int = 8
+    SENTIMENT_LOCAL_FALLBACK: bool = os.getenv("SENTIMENT_LOCAL_FALLBACK", "True").lower() == "true"
+    CHAT_HISTORY_TOKEN_BUDGET: int = 1024  # estimated prompt tokens sent per chat turn
+    SINGLEFLIGHT_REDIS: bool = os.getenv("SINGLEFLIGHT_REDIS", "False").lower() == "true"  # dedupe across workers
+    SINGLEFLIGHT_LOCK_TTL: float = 30.0  # seconds
+    
+    # Chat conversation store
+    CONVERSATION_STORE: str = os.getenv("CONVERSATION_STORE", "memory")  # 'memory' or 'redis'
+    CONVERSATION_TTL: int = 60 * 60 * 24  # seconds since the last message
+    CONVERSATION_MAX_MESSAGES: int = 100
+    CONVERSATION_CACHE_MAX_SIZE: int = 1024  # conversations kept by the in-memory store
     
     # Redis for caching and rate limiting
     REDIS_URL: str = os.getenv("REDIS_URL", "")
     RATE_LIMIT_REQUESTS: int = 100
     RATE_LIMIT_PERIOD: int = 60  # seconds
     
+    # Background jobs
+    JOB_QUEUE_BACKEND: str = os.getenv("JOB_QUEUE_BACKEND", "memory")  # 'memory' or 'redis' (durable)
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))  # concurrent jobs per process
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_DELAY: float = 5.0  # seconds before the first retry, doubled per attempt
+    
+    # Data import and export
+    EXPORT_PAGE_SIZE: int = 1000  # rows read per keyset page while streaming an export
+    IMPORT_BATCH_SIZE: int = 500  # rows per insert during a bulk import
+    IMPORT_MAX_ERRORS: int = 100  # row errors listed in an import result, the rest are only counted
+    
+    # Authenticated user cache
+    USER_CACHE_TTL: int = 60  # seconds
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_REDIS: bool = os.getenv("USER_CACHE_REDIS", "False").lower() == "true"
+    
     # CORS
     CORS_ORIGINS: list = [
         "http://localhost:3000",  # Local frontend development
@@ -7,6 +7,11 @@ import logging
 
 from app.config.settings import settings
 from app.middleware.rate_limiter import RateLimiter
+from app.services.cache import user_cache
+from app.services.passwords import password_pool
+from app.services.supabase import init_supabase, close_supabase, supabase_pool_stats
+from app.services.ai import init_ai_client, close_ai_client, ai_client_stats, sync_sentiment_cache_model
+from app.services.jobs import job_queue
 
 # Setup logging
 logging.basicConfig(
@@ -30,6 +35,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursors and chat conversation ids are returned in headers
+    expose_headers=["X-Next-Cursor", "X-Conversation-Id"],
 )
 
 # Add rate limiter middleware if Redis is configured
@@ -44,6 +51,30 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    return {
+        "user_cache": user_cache.stats(),
+        "password_pool": password_pool.stats(),
+        "supabase_pool": supabase_pool_stats(),
+        "huggingface": ai_client_stats(),
+        "jobs": await job_queue.stats(),
+    }
+
+@app.on_event("startup")
+async def startup():
+    init_supabase()
+    init_ai_client()
+    await sync_sentiment_cache_model()
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await job_queue.stop()
+    password_pool.shutdown()
+    await close_supabase()
+    await close_ai_client()
+
 # For AWS Lambda deployment
 handler = Mangum(app)
 
@@ -0,0 +1,18 @@
+"""
+Async data-access layer for the Supabase tables
+"""
+
+from app.repositories.users import UserRepository, user_repository
+from app.repositories.moods import MoodRepository, mood_repository
+from app.repositories.journals import JournalRepository, journal_repository
+
+__all__ = [
+    # Users
+    "UserRepository", "user_repository",
+    
+    # Moods
+    "MoodRepository", "mood_repository",
+    
+    # Journals
+    "JournalRepository", "journal_repository"
+]
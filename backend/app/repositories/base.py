@@ -0,0 +1,221 @@
+import re
+import json
+import uuid
+import base64
+import asyncio
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from postgrest._async.request_builder import AsyncRequestBuilder
+
+from app.services.supabase import get_async_postgrest
+
+# Cursor sort values are interpolated into a filter, so only timestamp characters are accepted
+_CURSOR_VALUE_RE = re.compile(r"^[0-9T:.+\- ]+$")
+
+def encode_cursor(row: Dict[str, Any], column: str) -> str:
+    """
+    Builds the opaque cursor pointing just after a row
+
+    Args:
+        row: The last row of a page, with the sort column and id
+        column: The sort column
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([row[column], row["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Reads a cursor built by encode_cursor
+
+    Args:
+        cursor: The cursor string
+
+    Returns:
+        The sort value and id of the row the cursor points after
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        uuid.UUID(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(value, str) or not _CURSOR_VALUE_RE.match(value):
+        raise ValueError("Invalid cursor")
+
+    return value, row_id
+
+class BaseRepository:
+    """
+    Base class for table repositories built on the shared async PostgREST client
+    """
+
+    table: str = ""
+    # Columns clients may request with a fields= projection
+    fields: Tuple[str, ...] = ()
+
+    def query(self) -> AsyncRequestBuilder:
+        """
+        Starts a query against the repository table
+
+        Returns:
+            AsyncRequestBuilder: Request builder for the table
+        """
+        return get_async_postgrest().from_(self.table)
+
+    def projection(self, fields: Optional[str], required: Tuple[str, ...] = ("id",)) -> str:
+        """
+        Turns a comma-separated fields= parameter into a select list
+
+        Args:
+            fields: Requested columns, None or empty for all of them
+            required: Columns always selected, e.g. the id and pagination keys
+
+        Returns:
+            Column list for select()
+
+        Raises:
+            ValueError: If a requested column is not exposed
+        """
+        if not fields:
+            return '*'
+
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in self.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(self.fields)}")
+
+        # dict.fromkeys keeps the order and drops duplicates
+        return ','.join(dict.fromkeys([*required, *requested]))
+
+    @staticmethod
+    def keyset(
+        query: AsyncRequestBuilder,
+        column: str,
+        cursor: Optional[str] = None,
+        desc: bool = False,
+    ) -> AsyncRequestBuilder:
+        """
+        Orders a query by (column, id) and continues after a cursor, so pages
+        are read by an index seek instead of skipping over earlier rows
+
+        Args:
+            query: Query to paginate
+            column: Sort column, with id as the tie-breaker
+            cursor: Cursor of the previous page, None for the first page
+            desc: Newest first
+
+        Returns:
+            The query
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        direction = ".desc" if desc else ""
+        # Repeated order() calls add separate parameters, so both keys go in one
+        query.params = query.params.add('order', f'{column}{direction},id{direction}')
+
+        if cursor:
+            value, row_id = decode_cursor(cursor)
+            op = "lt" if desc else "gt"
+            # postgrest-py has no or_() in this version, so the logic tree is added as a raw parameter
+            query.params = query.params.add(
+                'or',
+                f'({column}.{op}."{value}",and({column}.eq."{value}",id.{op}.{row_id}))'
+            )
+
+        return query
+
+    async def iter_for_user(
+        self,
+        user_id: str,
+        column: str,
+        columns: str = '*',
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        page_size: int = 1000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Reads all of a user's rows oldest first, one keyset page at a time.
+        The next page is fetched while the caller processes the current one.
+
+        Args:
+            user_id: Owner of the rows
+            column: Sort column, with id as the tie-breaker
+            columns: Column list for select(), must include the sort column and id
+            start: Only rows at or after this time
+            end: Only rows at or before this time
+            page_size: Rows per round trip
+
+        Yields:
+            Non-empty pages of rows
+        """
+        async def fetch(cursor: Optional[str]) -> List[Dict[str, Any]]:
+            query = self.query().select(columns).eq('user_id', user_id)
+            if start:
+                query = query.gte(column, start.isoformat())
+            if end:
+                query = query.lte(column, end.isoformat())
+            response = await self.keyset(query, column, cursor).limit(page_size).execute()
+            return response.data
+
+        next_page = asyncio.ensure_future(fetch(None))
+        try:
+            while True:
+                rows = await next_page
+                if not rows:
+                    return
+
+                if len(rows) == page_size:
+                    next_page = asyncio.ensure_future(fetch(encode_cursor(rows[-1], column)))
+                yield rows
+
+                if len(rows) < page_size:
+                    return
+        finally:
+            # The consumer may stop early, e.g. when a streaming client disconnects
+            if not next_page.done():
+                next_page.cancel()
+
+    @staticmethod
+    def first(rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        return rows[0] if rows else None
+
+    async def insert(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        response = await self.query().insert(data).execute()
+        return self.first(response.data)
+
+    async def insert_many(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Inserts rows with the same columns in one round trip
+
+        Returns:
+            The created rows
+        """
+        if not rows:
+            return []
+        response = await self.query().insert(rows).execute()
+        return response.data
+
+    @staticmethod
+    async def rpc(func: str, params: Dict[str, Any]) -> Any:
+        """
+        Calls a SQL function exposed by PostgREST
+
+        Args:
+            func: Name of the function
+            params: Named function arguments
+
+        Returns:
+            The decoded function result
+        """
+        builder = await get_async_postgrest().rpc(func, params)
+        response = await builder.execute()
+        return response.data
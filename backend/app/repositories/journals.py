@@ -0,0 +1,155 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.repositories.base import BaseRepository, encode_cursor
+
+class JournalRepository(BaseRepository):
+    """
+    Data access for the journal_entries table
+    """
+
+    table = "journal_entries"
+    fields = (
+        "id", "user_id", "title", "content", "mood_id", "tags", "image_urls", "created_at", "updated_at",
+        "sentiment_score", "sentiment_status", "sentiment_label",
+    )
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 20,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        columns: str = '*',
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Lists a user's journal entries, newest first. Pages either by cursor, which
+        seeks straight to the page through the index, or by offset for older
+        clients, which scans past every skipped row. The columns must include
+        created_at and id to build the next cursor.
+
+        Returns:
+            The page and the cursor of the next page, None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = self.query().select(columns).eq('user_id', user_id)
+
+        if start_date:
+            query = query.gte('created_at', start_date.isoformat())
+
+        if end_date:
+            query = query.lte('created_at', end_date.isoformat())
+
+        query = self.keyset(query, 'created_at', cursor, desc=True)
+
+        # One extra row tells whether there is a next page
+        query = query.limit(limit + 1)
+
+        if skip and not cursor:
+            # postgrest-py has no offset() in this version, and its range() end bound changed between releases
+            query.params = query.params.add('offset', str(skip))
+
+        response = await query.execute()
+        rows = response.data[:limit]
+        next_cursor = encode_cursor(rows[-1], 'created_at') if len(response.data) > limit else None
+        return rows, next_cursor
+
+    async def list_needing_analysis(
+        self,
+        model: str,
+        after_id: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """
+        Keyset-paginated scan of entries without a current analysis: never
+        scored, scored by another model, or whose analysis is pending or failed
+        """
+        query = self.query().select('id,content')
+        # postgrest-py has no or_() in this version, so the logic tree is added as a raw parameter
+        query.params = query.params.add(
+            'or',
+            f'(sentiment_score.is.null,sentiment_model.is.null,sentiment_model.neq."{model}",sentiment_status.neq.done)'
+        )
+
+        if after_id:
+            query = query.gt('id', after_id)
+
+        response = await query.order('id').limit(limit).execute()
+        return response.data
+
+    async def bulk_update_analysis(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Writes the analysis columns of many entries in one round trip, skipping
+        entries whose content no longer matches the analyzed content
+
+        Args:
+            rows: Dicts with the entry id, content_md5 and its analysis columns,
+                see journal_sentiment.analysis_update
+
+        Returns:
+            Number of updated entries
+        """
+        if not rows:
+            return 0
+        result = await self.rpc('bulk_update_journal_sentiment', {'updates': rows})
+        return result[0]['updated'] if result else 0
+
+    async def get_by_id(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        response = await self.query().select('*').eq('id', entry_id).execute()
+        return self.first(response.data)
+
+    async def get_many(self, entry_ids: List[str], chunk_size: int = 100) -> List[Dict[str, Any]]:
+        """
+        Reads entries by id, in chunks that keep the in() filter within URL length limits
+        """
+        rows: List[Dict[str, Any]] = []
+        for start in range(0, len(entry_ids), chunk_size):
+            response = await self.query().select('*').in_('id', entry_ids[start:start + chunk_size]).execute()
+            rows.extend(response.data)
+        return rows
+
+    async def set_status_where_pending(self, entry_ids: List[str], status: str, chunk_size: int = 100) -> None:
+        """
+        Sets sentiment_status of the entries whose analysis is still pending
+        """
+        for start in range(0, len(entry_ids), chunk_size):
+            await self.query() \
+                .update({'sentiment_status': status}) \
+                .in_('id', entry_ids[start:start + chunk_size]) \
+                .eq('sentiment_status', 'pending') \
+                .execute()
+
+    async def get_owned(self, entry_id: str, user_id: str, columns: str = '*') -> Optional[Dict[str, Any]]:
+        response = await self.query().select(columns).eq('id', entry_id).eq('user_id', user_id).execute()
+        return self.first(response.data)
+
+    async def update(self, entry_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        response = await self.query().update(data).eq('id', entry_id).execute()
+        return self.first(response.data)
+
+    async def update_owned(self, entry_id: str, user_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Updates an entry only if it belongs to the user, in one round trip.
+        A trigger resets sentiment_status to pending when the content changes.
+
+        Returns:
+            The updated row, None if no entry matched
+        """
+        response = await self.query().update(data).eq('id', entry_id).eq('user_id', user_id).execute()
+        return self.first(response.data)
+
+    async def delete_owned(self, entry_id: str, user_id: str) -> bool:
+        """
+        Deletes an entry only if it belongs to the user, in one round trip
+
+        Returns:
+            Whether an entry was deleted
+        """
+        response = await self.query().delete().eq('id', entry_id).eq('user_id', user_id).execute()
+        return bool(response.data)
+
+journal_repository = JournalRepository()
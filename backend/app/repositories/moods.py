@@ -0,0 +1,135 @@
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.repositories.base import BaseRepository, encode_cursor
+
+class MoodRepository(BaseRepository):
+    """
+    Data access for the moods table
+    """
+
+    table = "moods"
+    fields = ("id", "user_id", "score", "notes", "timestamp", "created_at")
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 20,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        columns: str = '*',
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Lists a user's moods, newest first. Pages either by cursor, which
+        seeks straight to the page through the index, or by offset for older
+        clients, which scans past every skipped row. The columns must include
+        timestamp and id to build the next cursor.
+
+        Returns:
+            The page and the cursor of the next page, None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = self.query().select(columns).eq('user_id', user_id)
+
+        if start_date:
+            query = query.gte('timestamp', start_date.isoformat())
+
+        if end_date:
+            query = query.lte('timestamp', end_date.isoformat())
+
+        query = self.keyset(query, 'timestamp', cursor, desc=True)
+
+        # One extra row tells whether there is a next page
+        query = query.limit(limit + 1)
+
+        if skip and not cursor:
+            # postgrest-py has no offset() in this version, and its range() end bound changed between releases
+            query.params = query.params.add('offset', str(skip))
+
+        response = await query.execute()
+        rows = response.data[:limit]
+        next_cursor = encode_cursor(rows[-1], 'timestamp') if len(response.data) > limit else None
+        return rows, next_cursor
+
+    async def list_series(
+        self,
+        user_id: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        page_size: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Loads the timestamp and score of every mood in a date range, oldest first.
+        Reads in keyset pages on (timestamp, id) so long histories are not cut
+        off by the PostgREST row limit.
+
+        Returns:
+            Rows with "id", "timestamp" and "score"
+        """
+        rows: List[Dict[str, Any]] = []
+        pages = self.iter_for_user(
+            user_id,
+            'timestamp',
+            columns='id,timestamp,score',
+            start=datetime.combine(start, time.min) if start else None,
+            end=datetime.combine(end, time.max) if end else None,
+            page_size=page_size,
+        )
+        async for page in pages:
+            rows.extend(page)
+        return rows
+
+    async def aggregate(self, user_id: str, period: str, start: date, end: date) -> List[Dict[str, Any]]:
+        """
+        Reads per-day, week or month aggregates from the trigger-maintained
+        rollups. Week and month buckets overlapping the range are included whole.
+
+        Returns:
+            One {"bucket", "score_sum", "entries"} row per bucket, in bucket order
+        """
+        return await self.rpc('aggregate_mood_rollups', {
+            'p_user_id': user_id,
+            'p_period': period,
+            'p_start': start.isoformat(),
+            'p_end': end.isoformat()
+        })
+
+    async def rebuild_rollups(self, user_id: Optional[str] = None) -> int:
+        """
+        Recomputes rollups from raw moods, for one user or everyone
+
+        Returns:
+            Number of rollup buckets written
+        """
+        result = await self.rpc('rebuild_mood_rollups', {'p_user_id': user_id})
+        return result[0]['buckets'] if result else 0
+
+    async def get_owned(self, mood_id: str, user_id: str, columns: str = '*') -> Optional[Dict[str, Any]]:
+        response = await self.query().select(columns).eq('id', mood_id).eq('user_id', user_id).execute()
+        return self.first(response.data)
+
+    async def update_owned(self, mood_id: str, user_id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Updates a mood only if it belongs to the user, in one round trip
+
+        Returns:
+            The updated row, None if no mood matched
+        """
+        response = await self.query().update(data).eq('id', mood_id).eq('user_id', user_id).execute()
+        return self.first(response.data)
+
+    async def delete_owned(self, mood_id: str, user_id: str) -> bool:
+        """
+        Deletes a mood only if it belongs to the user, in one round trip
+
+        Returns:
+            Whether a mood was deleted
+        """
+        response = await self.query().delete().eq('id', mood_id).eq('user_id', user_id).execute()
+        return bool(response.data)
+
+mood_repository = MoodRepository()
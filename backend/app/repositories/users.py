@@ -0,0 +1,30 @@
+from typing import Any, Dict, Optional
+
+from app.repositories.base import BaseRepository
+
+class UserRepository(BaseRepository):
+    """
+    Data access for the users table
+    """
+
+    table = "users"
+
+    async def get_by_id(self, user_id: str, columns: str = '*') -> Optional[Dict[str, Any]]:
+        response = await self.query().select(columns).eq('id', user_id).execute()
+        return self.first(response.data)
+
+    async def get_by_email(self, email: str, columns: str = '*') -> Optional[Dict[str, Any]]:
+        response = await self.query().select(columns).eq('email', email).execute()
+        return self.first(response.data)
+
+    async def insert_if_new_email(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Inserts a user unless the email is taken, in one round trip
+
+        Returns:
+            The created row, None if a user with the email already exists
+        """
+        response = await self.query().upsert(data, on_conflict='email', ignore_duplicates=True).execute()
+        return self.first(response.data)
+
+user_repository = UserRepository()
@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from typing import List, Dict, Any, Optional
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import json
+import os
 
 from app.routers.auth import get_current_user
-from app.services.ai import chat_with_bot, analyze_sentiment
-from pydantic import BaseModel, Field
+from app.services.ai import chat_with_bot, stream_chat_with_bot, analyze_sentiment
+from app.services.conversations import conversation_store, new_conversation_id
+from pydantic import BaseModel, Field, validator
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
@@ -13,20 +17,62 @@ class ChatMessage(BaseModel):
 
 class ChatRequest(BaseModel):
     message: str = Field(..., description="User message")
-    history: Optional[List[ChatMessage]] = Field(None, description="Chat history")
+    conversation_id: Optional[str] = Field(None, description="Conversation to continue, a new one is started when omitted")
+    history: Optional[List[ChatMessage]] = Field(None, description="Chat history, only used to seed a new conversation")
 
 class ChatResponse(BaseModel):
     response: str = Field(..., description="Assistant response")
     suggestions: List[str] = Field(default_factory=list, description="Follow-up suggestions")
+    conversation_id: Optional[str] = Field(None, description="Conversation the reply belongs to")
 
 class SentimentRequest(BaseModel):
-    text: str = Field(..., description="Text to analyze")
+    text: str = Field(..., min_length=1, description="Text to analyze")
+
+    @validator("text")
+    def text_not_blank(cls, value: str) -> str:
+        if not value.strip():
+            raise ValueError("Text must not be blank")
+        return value
+
+class SentimentChunk(BaseModel):
+    score: float = Field(..., description="Sentiment score of the chunk")
+    label: str = Field(..., description="Sentiment label of the chunk")
+    length: int = Field(..., description="Chunk length in characters")
 
 class SentimentResponse(BaseModel):
     score: float = Field(..., description="Sentiment score (0 to 1, higher is more positive)")
     label: str = Field(..., description="Sentiment label (POSITIVE or NEGATIVE)")
     keywords: List[str] = Field(default_factory=list, description="Extracted keywords")
     suggestions: Optional[List[str]] = Field(None, description="Suggestions based on sentiment")
+    chunks: Optional[List[SentimentChunk]] = Field(None, description="Per-chunk scores for long texts")
+
+async def _load_conversation(request: ChatRequest, user_id: str) -> Tuple[str, List[Dict[str, str]], List[Dict[str, str]]]:
+    """
+    Resolves the conversation a chat request belongs to
+    
+    Returns:
+        The conversation id, the history to send to the model and any
+        client-supplied messages that still need to be stored
+    """
+    conversation_id = request.conversation_id or new_conversation_id()
+    
+    history = []
+    if request.conversation_id:
+        history = await conversation_store.get(user_id, conversation_id)
+    
+    seed = []
+    if not history and request.history:
+        # Convert history to the format expected by the AI service
+        seed = [{"role": msg.role, "content": msg.content} for msg in request.history]
+        history = list(seed)
+    
+    return conversation_id, history, seed
+
+async def _save_turn(user_id: str, conversation_id: str, seed: List[Dict[str, str]], message: str, reply: str) -> None:
+    await conversation_store.append(user_id, conversation_id, seed + [
+        {"role": "user", "content": message},
+        {"role": "assistant", "content": reply}
+    ])
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
@@ -35,17 +81,77 @@ async def chat(
 ):
     """
     Chat with the CBT-trained assistant
+    
+    The conversation is kept server-side, so clients only send the new message
+    and the `conversation_id` returned by the previous turn.
     """
-    # Convert history to the format expected by the AI service
-    history = []
-    if request.history:
-        history = [{"role": msg.role, "content": msg.content} for msg in request.history]
+    user_id = str(current_user["id"])
+    conversation_id, history, seed = await _load_conversation(request, user_id)
     
     response = await chat_with_bot(request.message, history)
+    # Canned fallback replies are not part of the conversation
+    if not response.get("fallback"):
+        await _save_turn(user_id, conversation_id, seed, request.message, response["response"])
     
     return ChatResponse(
         response=response["response"],
-        suggestions=response.get("suggestions", [])
+        suggestions=response.get("suggestions", []),
+        conversation_id=conversation_id
+    )
+
+def _sse_event(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+async def _chat_event_stream(
+    user_id: str,
+    conversation_id: str,
+    seed: List[Dict[str, str]],
+    message: str,
+    history: List[Dict[str, str]]
+) -> AsyncIterator[str]:
+    # Mangum buffers the whole response on Lambda, so stream a single event there instead
+    if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+        response = await chat_with_bot(message, history)
+        if not response.get("fallback"):
+            await _save_turn(user_id, conversation_id, seed, message, response["response"])
+        yield _sse_event({"token": response["response"]})
+        yield _sse_event({"suggestions": response.get("suggestions", []), "conversation_id": conversation_id}, event="done")
+        return
+    
+    reply = []
+    async for event in stream_chat_with_bot(message, history):
+        if event["type"] == "token":
+            reply.append(event["text"])
+            yield _sse_event({"token": event["text"]})
+        else:
+            # Apologies and replies cut short by an error are not stored
+            if not event.get("fallback"):
+                await _save_turn(user_id, conversation_id, seed, message, "".join(reply))
+            yield _sse_event({"suggestions": event["suggestions"], "conversation_id": conversation_id}, event="done")
+
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    current_user = Depends(get_current_user)
+):
+    """
+    Chat with the CBT-trained assistant, streaming the reply as Server-Sent Events
+    
+    Emits one `data: {"token": ...}` event per generated token, followed by an
+    `event: done` event carrying the follow-up suggestions and conversation id.
+    """
+    user_id = str(current_user["id"])
+    conversation_id, history, seed = await _load_conversation(request, user_id)
+    
+    return StreamingResponse(
+        _chat_event_stream(user_id, conversation_id, seed, request.message, history),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Conversation-Id": conversation_id
+        }
     )
 
 @router.post("/sentiment", response_model=SentimentResponse)
@@ -68,7 +174,8 @@ async def analyze_text_sentiment(
         score=result["score"],
         label=result["label"],
         keywords=result["keywords"],
-        suggestions=result.get("suggestions")
+        suggestions=result.get("suggestions"),
+        chunks=result.get("chunks")
     )
 
 # Breathing exercise endpoint
@@ -2,19 +2,28 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from typing import Optional
 
 from app.config.settings import settings
 from app.schemas.auth import Token, TokenData, UserCreate, UserResponse
-from app.services.supabase import get_supabase_client
+from app.repositories.users import user_repository
+from app.services.cache import user_cache
+from app.services.passwords import hash_password, verify_password, PasswordPoolFullError
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# Only what requests need from the user row; the password hash is never loaded into the cache
+PROFILE_COLUMNS = "id,email,full_name"
+
+def password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
 # JWT token creation
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -25,15 +34,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 # User authentication
 async def authenticate_user(email: str, password: str):
-    supabase = get_supabase_client()
-    response = supabase.table('users').select('*').eq('email', email).execute()
+    user = await user_repository.get_by_email(email, columns="id,password")
     
-    if len(response.data) == 0:
+    if user is None:
         return False
     
-    user = response.data[0]
-    if not pwd_context.verify(password, user['password']):
-        return False
+    try:
+        if not await verify_password(password, user['password']):
+            return False
+    except PasswordPoolFullError:
+        raise password_pool_busy()
     
     return user
 
@@ -53,13 +63,18 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
     
-    supabase = get_supabase_client()
-    response = supabase.table('users').select('*').eq('id', token_data.user_id).execute()
+    cached_user = await user_cache.get(token_data.user_id)
+    if cached_user is not None:
+        return cached_user
+    
+    user = await user_repository.get_by_id(token_data.user_id, columns=PROFILE_COLUMNS)
     
-    if len(response.data) == 0:
+    if user is None:
         raise credentials_exception
-        
-    return response.data[0]
+    
+    await user_cache.set(token_data.user_id, user)
+    
+    return user
 
 @router.post("/register")
 def register():
@@ -75,18 +90,11 @@ def profile():
 
 @router.post("/register", response_model=UserResponse)
 async def register_user(user: UserCreate):
-    supabase = get_supabase_client()
-    
-    # Check if user already exists
-    existing_user = supabase.table('users').select('*').eq('email', user.email).execute()
-    if len(existing_user.data) > 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
     # Hash the password
-    hashed_password = pwd_context.hash(user.password)
+    try:
+        hashed_password = await hash_password(user.password)
+    except PasswordPoolFullError:
+        raise password_pool_busy()
     
     # Create the user in Supabase
     new_user = {
@@ -96,15 +104,15 @@ async def register_user(user: UserCreate):
         "created_at": datetime.utcnow().isoformat()
     }
     
-    response = supabase.table('users').insert(new_user).execute()
+    # The unique email constraint decides duplicates, so concurrent sign-ups cannot both succeed
+    created_user = await user_repository.insert_if_new_email(new_user)
     
-    if len(response.data) == 0:
+    if created_user is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create user"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Email already registered"
         )
     
-    created_user = response.data[0]
     return {
         "id": created_user["id"],
         "email": created_user["email"],
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
 
 from app.schemas.journals import (
     JournalEntryCreate, 
+    JournalEntryImport, 
     JournalEntryUpdate, 
-    JournalEntryResponse, 
+    JournalEntryResponse, JournalEntryPartial, 
     JournalAnalysis
 )
+from app.schemas.imports import ImportResult
+from app.config.settings import settings
 from app.routers.auth import get_current_user
-from app.services.supabase import get_supabase_client
-from app.services.ai import analyze_sentiment
+from app.repositories.journals import journal_repository
+from app.services.export import export_stream, EXPORT_FORMATS
+from app.services.imports import read_records, resolve_format, import_records
+from app.services.journal_sentiment import enqueue_journal_sentiment, enqueue_journal_sentiment_batch, ensure_analysis, SENTIMENT_PENDING
 
 router = APIRouter(prefix="/journals", tags=["journals"])
 
@@ -19,8 +25,6 @@ async def create_journal_entry(
     entry: JournalEntryCreate, 
     current_user = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
-    
     new_entry = {
         "title": entry.title,
         "content": entry.content,
@@ -28,75 +32,189 @@ async def create_journal_entry(
         "user_id": current_user["id"],
         "created_at": datetime.utcnow().isoformat(),
         "tags": entry.tags,
-        "image_urls": entry.image_urls
+        "image_urls": entry.image_urls,
+        "sentiment_status": SENTIMENT_PENDING
     }
     
-    response = supabase.table('journal_entries').insert(new_entry).execute()
+    created_entry = await journal_repository.insert(new_entry)
     
-    if len(response.data) == 0:
+    if created_entry is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create journal entry"
         )
     
-    created_entry = response.data[0]
-    
-    # Queue sentiment analysis as a background task
-    # In a production environment, you'd use a message queue like Celery
-    # For simplicity, we're doing it synchronously here
-    try:
-        sentiment_data = await analyze_sentiment(created_entry["content"])
-        if sentiment_data:
-            supabase.table('journal_entries').update({
-                "sentiment_score": sentiment_data["score"]
-            }).eq('id', created_entry["id"]).execute()
-            created_entry["sentiment_score"] = sentiment_data["score"]
-    except Exception:
-        # Continue even if sentiment analysis fails
-        pass
+    # Sentiment is analyzed in the background, the score fills in later
+    await enqueue_journal_sentiment(created_entry["id"])
     
     return created_entry
 
-@router.get("/", response_model=List[JournalEntryResponse])
+@router.get("/", response_model=List[JournalEntryPartial], response_model_exclude_unset=True)
 async def get_journal_entries(
+    response: Response,
     current_user = Depends(get_current_user),
     skip: int = 0,
     limit: int = Query(default=20, lte=100),
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
 ):
-    supabase = get_supabase_client()
+    # Cursor pagination stays fast at any depth, skip is kept for existing clients
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or skip, not both"
+        )
+    
+    try:
+        # The sort key and id are always selected, the next cursor is built from them
+        columns = journal_repository.projection(fields, required=("id", "created_at"))
+        rows, next_cursor = await journal_repository.list_for_user(
+            current_user["id"],
+            skip=skip,
+            limit=limit,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+            columns=columns
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    query = supabase.table('journal_entries').select('*').eq('user_id', current_user["id"])
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
-    if start_date:
-        query = query.gte('created_at', start_date.isoformat())
+    return rows
+
+@router.post("/import", response_model=ImportResult)
+async def import_journal_entries(
+    request: Request,
+    current_user = Depends(get_current_user),
+    import_format: Optional[str] = Query(default=None, alias="format"),
+    batch_size: int = Query(default=settings.IMPORT_BATCH_SIZE, ge=1, le=5000),
+    defer_sentiment: bool = False
+):
+    """
+    Import journal entries from a streamed CSV (with a header row) or NDJSON body
+    
+    Each row is validated like POST /journals, optionally with its original
+    created_at. Valid rows are inserted in batches and invalid ones are reported
+    by row number without aborting the import. In CSV, tags and image_urls are
+    JSON arrays. The format comes from the format parameter or the Content-Type
+    header, and gzip bodies are accepted with Content-Encoding: gzip.
+    
+    Sentiment of each inserted batch is analyzed by one background job. With
+    defer_sentiment=true the entries stay pending for the backfill command.
+    """
+    imported_at = datetime.utcnow().isoformat()
+    
+    def to_row(entry: JournalEntryImport) -> dict:
+        return {
+            "title": entry.title,
+            "content": entry.content,
+            "mood_id": entry.mood_id,
+            "user_id": current_user["id"],
+            "created_at": entry.created_at.isoformat() if entry.created_at else imported_at,
+            "tags": entry.tags,
+            "image_urls": entry.image_urls,
+            "sentiment_status": SENTIMENT_PENDING
+        }
+    
+    async def analyze_batch(created: List[dict]) -> None:
+        if not defer_sentiment:
+            await enqueue_journal_sentiment_batch([row["id"] for row in created])
     
-    if end_date:
-        query = query.lte('created_at', end_date.isoformat())
+    try:
+        records = read_records(
+            request.stream(),
+            resolve_format(import_format, request.headers.get("content-type")),
+            gzipped=request.headers.get("content-encoding") == "gzip"
+        )
+        return await import_records(
+            records,
+            JournalEntryImport,
+            to_row,
+            journal_repository.insert_many,
+            batch_size,
+            json_fields=("tags", "image_urls"),
+            max_errors=settings.IMPORT_MAX_ERRORS,
+            on_inserted=analyze_batch
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+# Declared before /{entry_id}, which would otherwise capture "export"
+@router.get("/export")
+async def export_journals(
+    current_user = Depends(get_current_user),
+    export_format: str = Query(default="ndjson", alias="format"),
+    gzip: bool = False,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    fields: Optional[str] = None
+):
+    """
+    Download all of the user's journal entries as NDJSON or CSV, oldest first
     
-    # Apply pagination
-    query = query.order('created_at', desc=True).range(skip, skip + limit - 1)
+    The file is streamed from keyset-paged reads, so memory use does not grow
+    with the size of the history. Pass gzip=true for a compressed file.
+    """
+    try:
+        columns = journal_repository.projection(fields, required=("id", "created_at"))
+        if columns == '*':
+            columns = ','.join(journal_repository.fields)
+        pages = journal_repository.iter_for_user(
+            current_user["id"],
+            'created_at',
+            columns=columns,
+            start=start_date,
+            end=end_date,
+            page_size=settings.EXPORT_PAGE_SIZE
+        )
+        body = export_stream(pages, export_format, columns.split(','), compress=gzip)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    response = query.execute()
-    return response.data
+    filename = f"journals.{export_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
-@router.get("/{entry_id}", response_model=JournalEntryResponse)
+@router.get("/{entry_id}", response_model=JournalEntryPartial, response_model_exclude_unset=True)
 async def get_journal_entry(
     entry_id: str,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    fields: Optional[str] = None
 ):
-    supabase = get_supabase_client()
+    try:
+        columns = journal_repository.projection(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    response = supabase.table('journal_entries').select('*').eq('id', entry_id).eq('user_id', current_user["id"]).execute()
+    entry = await journal_repository.get_owned(entry_id, current_user["id"], columns)
     
-    if len(response.data) == 0:
+    if entry is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Journal entry not found"
         )
     
-    return response.data[0]
+    return entry
 
 @router.put("/{entry_id}", response_model=JournalEntryResponse)
 async def update_journal_entry(
@@ -104,64 +222,37 @@ async def update_journal_entry(
     entry_update: JournalEntryUpdate,
     current_user = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
-    
-    # Check if entry exists and belongs to user
-    response = supabase.table('journal_entries').select('*').eq('id', entry_id).eq('user_id', current_user["id"]).execute()
-    
-    if len(response.data) == 0:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Journal entry not found"
-        )
-    
     # Prepare update data
     update_data = {k: v for k, v in entry_update.dict().items() if v is not None}
     update_data["updated_at"] = datetime.utcnow().isoformat()
     
-    # Update the entry
-    response = supabase.table('journal_entries').update(update_data).eq('id', entry_id).execute()
+    # The ownership check is part of the update, no matching row means not found
+    updated_entry = await journal_repository.update_owned(entry_id, current_user["id"], update_data)
     
-    if len(response.data) == 0:
+    if updated_entry is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update journal entry"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Journal entry not found"
         )
     
-    # Re-analyze sentiment if content was updated
-    if entry_update.content:
-        try:
-            sentiment_data = await analyze_sentiment(entry_update.content)
-            if sentiment_data:
-                supabase.table('journal_entries').update({
-                    "sentiment_score": sentiment_data["score"]
-                }).eq('id', entry_id).execute()
-                response.data[0]["sentiment_score"] = sentiment_data["score"]
-        except Exception:
-            # Continue even if sentiment analysis fails
-            pass
-    
-    return response.data[0]
+    # A trigger marks the analysis pending when the content actually changed, re-analyze it in the background
+    if entry_update.content and updated_entry.get("sentiment_status") == SENTIMENT_PENDING:
+        await enqueue_journal_sentiment(entry_id)
+    
+    return updated_entry
 
 @router.delete("/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_journal_entry(
     entry_id: str,
     current_user = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
-    
-    # Check if entry exists and belongs to user
-    response = supabase.table('journal_entries').select('*').eq('id', entry_id).eq('user_id', current_user["id"]).execute()
-    
-    if len(response.data) == 0:
+    # The ownership check is part of the delete, no matching row means not found
+    if not await journal_repository.delete_owned(entry_id, current_user["id"]):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Journal entry not found"
         )
     
-    # Delete the entry
-    supabase.table('journal_entries').delete().eq('id', entry_id).execute()
-    
     # No content in response
     return None
 
@@ -170,40 +261,30 @@ async def analyze_journal_entry(
     entry_id: str,
     current_user = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
-    
     # Get the journal entry
-    response = supabase.table('journal_entries').select('*').eq('id', entry_id).eq('user_id', current_user["id"]).execute()
+    entry = await journal_repository.get_owned(entry_id, current_user["id"])
     
-    if len(response.data) == 0:
+    if entry is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Journal entry not found"
         )
     
-    entry = response.data[0]
-    
-    # Perform sentiment analysis
-    sentiment_data = await analyze_sentiment(entry["content"])
+    # Served from the stored analysis unless the content or model changed since
+    analyzed_entry = await ensure_analysis(entry)
     
-    if not sentiment_data:
+    if not analyzed_entry:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Sentiment analysis failed"
         )
     
-    # Update the entry with sentiment score if it doesn't have one
-    if not entry.get("sentiment_score"):
-        supabase.table('journal_entries').update({
-            "sentiment_score": sentiment_data["score"]
-        }).eq('id', entry_id).execute()
-    
     return {
         "entry_id": entry_id,
-        "sentiment_score": sentiment_data["score"],
-        "sentiment_label": sentiment_data["label"],
-        "keywords": sentiment_data["keywords"],
-        "suggestions": sentiment_data.get("suggestions", [])
+        "sentiment_score": analyzed_entry["sentiment_score"],
+        "sentiment_label": analyzed_entry["sentiment_label"],
+        "keywords": analyzed_entry.get("keywords") or [],
+        "suggestions": analyzed_entry.get("suggestions") or []
     }
 
 @router.get("/")
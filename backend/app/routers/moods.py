@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime, timedelta, date
-import statistics
 
-from app.schemas.moods import MoodCreate, MoodUpdate, MoodResponse, MoodAggregation
+from app.schemas.imports import ImportResult
+from app.schemas.moods import MoodCreate, MoodUpdate, MoodResponse, MoodPartial, MoodAggregation, MoodAnalytics, MoodDailySeries
+from app.config.settings import settings
 from app.routers.auth import get_current_user
-from app.services.supabase import get_supabase_client
+from app.repositories.moods import mood_repository
+from app.services.export import export_stream, EXPORT_FORMATS
+from app.services.imports import read_records, resolve_format, import_records
+from app.services.mood_analytics import MoodSeries, summarize, daily_series, DEFAULT_EWMA_SPAN
 
 router = APIRouter(prefix="/moods", tags=["moods"])
 
@@ -14,8 +19,6 @@ async def create_mood(
     mood: MoodCreate,
     current_user = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
-    
     new_mood = {
         "score": mood.score,
         "notes": mood.notes,
@@ -24,56 +27,192 @@ async def create_mood(
         "created_at": datetime.utcnow().isoformat()
     }
     
-    response = supabase.table('moods').insert(new_mood).execute()
+    created_mood = await mood_repository.insert(new_mood)
     
-    if len(response.data) == 0:
+    if created_mood is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create mood entry"
         )
     
-    return response.data[0]
+    return created_mood
 
-@router.get("/", response_model=List[MoodResponse])
+@router.get("/", response_model=List[MoodPartial], response_model_exclude_unset=True)
 async def get_moods(
+    response: Response,
     current_user = Depends(get_current_user),
     skip: int = 0,
     limit: int = Query(default=20, lte=100),
     start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
 ):
-    supabase = get_supabase_client()
+    # Cursor pagination stays fast at any depth, skip is kept for existing clients
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or skip, not both"
+        )
     
-    query = supabase.table('moods').select('*').eq('user_id', current_user["id"])
+    try:
+        # The sort key and id are always selected, the next cursor is built from them
+        columns = mood_repository.projection(fields, required=("id", "timestamp"))
+        rows, next_cursor = await mood_repository.list_for_user(
+            current_user["id"],
+            skip=skip,
+            limit=limit,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+            columns=columns
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    if start_date:
-        query = query.gte('timestamp', start_date.isoformat())
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
-    if end_date:
-        query = query.lte('timestamp', end_date.isoformat())
+    return rows
+
+# Declared before /{mood_id}, which would otherwise capture "export", "import" and "analytics"
+@router.get("/export")
+async def export_moods(
+    current_user = Depends(get_current_user),
+    export_format: str = Query(default="ndjson", alias="format"),
+    gzip: bool = False,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    fields: Optional[str] = None
+):
+    """
+    Download all of the user's moods as NDJSON or CSV, oldest first
+    
+    The file is streamed from keyset-paged reads, so memory use does not grow
+    with the size of the history. Pass gzip=true for a compressed file.
+    """
+    try:
+        columns = mood_repository.projection(fields, required=("id", "timestamp"))
+        if columns == '*':
+            columns = ','.join(mood_repository.fields)
+        pages = mood_repository.iter_for_user(
+            current_user["id"],
+            'timestamp',
+            columns=columns,
+            start=start_date,
+            end=end_date,
+            page_size=settings.EXPORT_PAGE_SIZE
+        )
+        body = export_stream(pages, export_format, columns.split(','), compress=gzip)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    # Apply pagination and sorting
-    query = query.order('timestamp', desc=True).range(skip, skip + limit - 1)
+    filename = f"moods.{export_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/import", response_model=ImportResult)
+async def import_moods(
+    request: Request,
+    current_user = Depends(get_current_user),
+    import_format: Optional[str] = Query(default=None, alias="format"),
+    batch_size: int = Query(default=settings.IMPORT_BATCH_SIZE, ge=1, le=5000)
+):
+    """
+    Import moods from a streamed CSV (with a header row) or NDJSON body
+    
+    Each row is validated like POST /moods. Valid rows are inserted in batches
+    and invalid ones are reported by row number without aborting the import.
+    The format comes from the format parameter or the Content-Type header, and
+    gzip bodies are accepted with Content-Encoding: gzip.
+    """
+    imported_at = datetime.utcnow().isoformat()
     
-    response = query.execute()
-    return response.data
+    def to_row(mood: MoodCreate) -> dict:
+        return {
+            "score": mood.score,
+            "notes": mood.notes,
+            "user_id": current_user["id"],
+            "timestamp": (mood.timestamp or datetime.utcnow()).isoformat(),
+            "created_at": imported_at
+        }
+    
+    try:
+        records = read_records(
+            request.stream(),
+            resolve_format(import_format, request.headers.get("content-type")),
+            gzipped=request.headers.get("content-encoding") == "gzip"
+        )
+        return await import_records(
+            records,
+            MoodCreate,
+            to_row,
+            mood_repository.insert_many,
+            batch_size,
+            max_errors=settings.IMPORT_MAX_ERRORS
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/analytics", response_model=MoodAnalytics)
+async def get_mood_analytics(
+    current_user = Depends(get_current_user),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    span: int = Query(default=DEFAULT_EWMA_SPAN, ge=2, le=365)
+):
+    # The whole history by default; the series is loaded once and every statistic is a vectorized pass over it
+    rows = await mood_repository.list_series(current_user["id"], start_date, end_date)
+    return summarize(MoodSeries.from_rows(rows), span)
+
+@router.get("/analytics/daily", response_model=MoodDailySeries)
+async def get_mood_daily_series(
+    current_user = Depends(get_current_user),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    span: int = Query(default=DEFAULT_EWMA_SPAN, ge=2, le=365)
+):
+    rows = await mood_repository.list_series(current_user["id"], start_date, end_date)
+    return {
+        "span": span,
+        "data": daily_series(MoodSeries.from_rows(rows), span)
+    }
 
-@router.get("/{mood_id}", response_model=MoodResponse)
+@router.get("/{mood_id}", response_model=MoodPartial, response_model_exclude_unset=True)
 async def get_mood(
     mood_id: str,
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_user),
+    fields: Optional[str] = None
 ):
-    supabase = get_supabase_client()
+    try:
+        columns = mood_repository.projection(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    response = supabase.table('moods').select('*').eq('id', mood_id).eq('user_id', current_user["id"]).execute()
+    mood = await mood_repository.get_owned(mood_id, current_user["id"], columns)
     
-    if len(response.data) == 0:
+    if mood is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Mood entry not found"
         )
     
-    return response.data[0]
+    return mood
 
 @router.put("/{mood_id}", response_model=MoodResponse)
 async def update_mood(
@@ -81,50 +220,35 @@ async def update_mood(
     mood_update: MoodUpdate,
     current_user = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
-    
-    # Check if mood exists and belongs to user
-    response = supabase.table('moods').select('*').eq('id', mood_id).eq('user_id', current_user["id"]).execute()
-    
-    if len(response.data) == 0:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Mood entry not found"
-        )
-    
     # Prepare update data
     update_data = {k: v for k, v in mood_update.dict().items() if v is not None}
     
-    # Update the mood
-    response = supabase.table('moods').update(update_data).eq('id', mood_id).execute()
+    # The ownership check is part of the update, no matching row means not found
+    if update_data:
+        updated_mood = await mood_repository.update_owned(mood_id, current_user["id"], update_data)
+    else:
+        updated_mood = await mood_repository.get_owned(mood_id, current_user["id"])
     
-    if len(response.data) == 0:
+    if updated_mood is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update mood entry"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Mood entry not found"
         )
     
-    return response.data[0]
+    return updated_mood
 
 @router.delete("/{mood_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_mood(
     mood_id: str,
     current_user = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
-    
-    # Check if mood exists and belongs to user
-    response = supabase.table('moods').select('*').eq('id', mood_id).eq('user_id', current_user["id"]).execute()
-    
-    if len(response.data) == 0:
+    # The ownership check is part of the delete, no matching row means not found
+    if not await mood_repository.delete_owned(mood_id, current_user["id"]):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Mood entry not found"
         )
     
-    # Delete the mood
-    supabase.table('moods').delete().eq('id', mood_id).execute()
-    
     # No content in response
     return None
 
@@ -154,59 +278,28 @@ async def aggregate_moods(
         else:  # month
             start_date = end_date - timedelta(days=90)  # Last 3 months
     
-    supabase = get_supabase_client()
-    
-    # Get all moods in the date range
-    response = supabase.table('moods') \
-        .select('*') \
-        .eq('user_id', current_user["id"]) \
-        .gte('timestamp', datetime.combine(start_date, datetime.min.time()).isoformat()) \
-        .lte('timestamp', datetime.combine(end_date, datetime.max.time()).isoformat()) \
-        .execute()
+    # Read from the rollups the database maintains on every mood write
+    buckets = await mood_repository.aggregate(current_user["id"], period, start_date, end_date)
     
-    if len(response.data) == 0:
+    if len(buckets) == 0:
         return {
             "period": period,
             "data": [],
             "average_score": 0
         }
     
-    # Process data based on period
-    aggregated_data = {}
-    
-    for mood in response.data:
-        mood_date = datetime.fromisoformat(mood["timestamp"].replace("Z", "+00:00")).date()
-        
-        if period == "day":
-            key = mood_date.isoformat()
-        elif period == "week":
-            # Get the Monday of the week
-            week_start = mood_date - timedelta(days=mood_date.weekday())
-            key = week_start.isoformat()
-        else:  # month
-            key = f"{mood_date.year}-{mood_date.month:02d}"
-        
-        if key not in aggregated_data:
-            aggregated_data[key] = []
-        
-        aggregated_data[key].append(mood["score"])
-    
-    # Calculate averages for each period
-    result_data = []
-    for key, scores in aggregated_data.items():
-        avg_score = statistics.mean(scores)
-        result_data.append({
-            "period": key,
-            "average_score": round(avg_score, 2),
-            "count": len(scores)
-        })
-    
-    # Sort by period
-    result_data.sort(key=lambda x: x["period"])
+    result_data = [
+        {
+            "period": bucket["bucket"],
+            "average_score": round(bucket["score_sum"] / bucket["entries"], 2),
+            "count": bucket["entries"]
+        }
+        for bucket in buckets
+    ]
     
     # Calculate overall average
-    all_scores = [mood["score"] for mood in response.data]
-    overall_average = statistics.mean(all_scores) if all_scores else 0
+    total_entries = sum(bucket["entries"] for bucket in buckets)
+    overall_average = sum(bucket["score_sum"] for bucket in buckets) / total_entries
     
     return {
         "period": period,
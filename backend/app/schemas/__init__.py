@@ -3,16 +3,20 @@ Pydantic models for API requests and responses
 """
 
 from app.schemas.auth import Token, TokenData, UserCreate, UserResponse
-from app.schemas.journals import JournalEntryCreate, JournalEntryUpdate, JournalEntryResponse, JournalAnalysis
-from app.schemas.moods import MoodCreate, MoodUpdate, MoodResponse, MoodAggregation
+from app.schemas.journals import JournalEntryCreate, JournalEntryImport, JournalEntryUpdate, JournalEntryResponse, JournalEntryPartial, JournalAnalysis
+from app.schemas.imports import ImportResult, ImportRowError
+from app.schemas.moods import MoodCreate, MoodUpdate, MoodResponse, MoodPartial, MoodAggregation, MoodAnalytics, MoodDailySeries
 
 __all__ = [
     # Auth schemas
     "Token", "TokenData", "UserCreate", "UserResponse",
     
     # Journal schemas
-    "JournalEntryCreate", "JournalEntryUpdate", "JournalEntryResponse", "JournalAnalysis",
+    "JournalEntryCreate", "JournalEntryImport", "JournalEntryUpdate", "JournalEntryResponse", "JournalEntryPartial", "JournalAnalysis",
+    
+    # Import schemas
+    "ImportResult", "ImportRowError",
     
     # Mood schemas
-    "MoodCreate", "MoodUpdate", "MoodResponse", "MoodAggregation"
+    "MoodCreate", "MoodUpdate", "MoodResponse", "MoodPartial", "MoodAggregation", "MoodAnalytics", "MoodDailySeries"
 ] 
\ No newline at end of file
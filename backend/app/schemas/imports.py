@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class ImportRowError(BaseModel):
+    row: int  # 1-based data row, not counting the CSV header
+    errors: List[str]
+
+class ImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ImportRowError]  # Capped at IMPORT_MAX_ERRORS
+    stopped_at: Optional[int] = None  # First row not imported when a database error stopped the import
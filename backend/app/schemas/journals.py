@@ -11,6 +11,9 @@ class JournalEntryCreate(JournalEntryBase):
     tags: Optional[List[str]] = []
     image_urls: Optional[List[str]] = []
 
+class JournalEntryImport(JournalEntryCreate):
+    created_at: Optional[datetime] = None  # Kept when migrating entries from another app
+
 class JournalEntryUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     content: Optional[str] = Field(None, min_length=1)
@@ -24,12 +27,31 @@ class JournalEntryInDB(JournalEntryBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     sentiment_score: Optional[float] = None
+    sentiment_status: Optional[str] = None  # pending, done or failed
+    sentiment_label: Optional[str] = None
     tags: List[str] = []
     image_urls: List[str] = []
 
 class JournalEntryResponse(JournalEntryInDB):
     pass
 
+class JournalEntryPartial(BaseModel):
+    """
+    Any subset of journal entry columns, for responses projected with fields=
+    """
+    id: Optional[str] = None
+    user_id: Optional[str] = None
+    title: Optional[str] = None
+    content: Optional[str] = None
+    mood_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    sentiment_score: Optional[float] = None
+    sentiment_status: Optional[str] = None
+    sentiment_label: Optional[str] = None
+    tags: Optional[List[str]] = None
+    image_urls: Optional[List[str]] = None
+
 class JournalAnalysis(BaseModel):
     entry_id: str
     sentiment_score: float
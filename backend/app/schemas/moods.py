@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 class MoodBase(BaseModel):
@@ -22,7 +22,51 @@ class MoodInDB(MoodBase):
 class MoodResponse(MoodInDB):
     pass
 
+class MoodPartial(BaseModel):
+    """
+    Any subset of mood columns, for responses projected with fields=
+    """
+    id: Optional[str] = None
+    user_id: Optional[str] = None
+    score: Optional[int] = None
+    notes: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
 class MoodAggregation(BaseModel):
     period: str  # 'day', 'week', 'month'
     data: List[dict]
-    average_score: float 
\ No newline at end of file
+    average_score: float
+
+class MoodWeekday(BaseModel):
+    day: str
+    average_score: Optional[float] = None
+    count: int
+
+class MoodAnalytics(BaseModel):
+    count: int
+    first_timestamp: Optional[datetime] = None
+    last_timestamp: Optional[datetime] = None
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    std: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    percentiles: Dict[str, float]  # 'p10', 'p25', 'p75', 'p90'
+    trend_per_day: Optional[float] = None  # Least-squares score change per day
+    trend_per_week: Optional[float] = None
+    rolling: Dict[str, Optional[float]]  # '7d', '30d' averages ending on the last mood's day
+    ewma: Optional[float] = None
+    day_of_week: List[MoodWeekday]
+
+class MoodDailyPoint(BaseModel):
+    date: str
+    count: int
+    average_score: Optional[float] = None
+    rolling_7: Optional[float] = None
+    rolling_30: Optional[float] = None
+    ewma: Optional[float] = None
+
+class MoodDailySeries(BaseModel):
+    span: int
+    data: List[MoodDailyPoint]
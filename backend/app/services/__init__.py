@@ -2,15 +2,47 @@
 Service modules for external service integrations
 """
 
-from app.services.supabase import get_supabase_client, healthcheck_supabase
-from app.services.ai import analyze_sentiment, chat_with_bot
+from app.services.supabase import get_async_postgrest, healthcheck_supabase, init_supabase, close_supabase
+from app.services.ai import analyze_sentiment, chat_with_bot, stream_chat_with_bot
+from app.services.conversations import conversation_store, fit_history_to_budget
+from app.services.keywords import extract_keywords, extract_keywords_batch
+from app.services.cache import TTLCache, TieredCache, user_cache
+from app.services.passwords import hash_password, verify_password, password_pool
+from app.services.jobs import JobQueue, job_queue
+from app.services.mood_analytics import MoodSeries, summarize, daily_series
 
 __all__ = [
     # Supabase
-    "get_supabase_client",
+    "get_async_postgrest",
     "healthcheck_supabase",
+    "init_supabase",
+    "close_supabase",
     
     # AI services
     "analyze_sentiment",
-    "chat_with_bot"
+    "chat_with_bot",
+    "stream_chat_with_bot",
+    "conversation_store",
+    "fit_history_to_budget",
+    "extract_keywords",
+    "extract_keywords_batch",
+    
+    # Caching
+    "TTLCache",
+    "TieredCache",
+    "user_cache",
+    
+    # Password hashing
+    "hash_password",
+    "verify_password",
+    "password_pool",
+    
+    # Background jobs
+    "JobQueue",
+    "job_queue",
+    
+    # Mood analytics
+    "MoodSeries",
+    "summarize",
+    "daily_series"
 ] 
\ No newline at end of file
@@ -1,131 +1,658 @@
 import httpx
 import json
-from typing import Dict, Any, Optional, List
+import asyncio
+import time
+import hashlib
+import re
+import unicodedata
+from typing import AsyncIterator, Dict, Any, Optional, List
 import os
 import logging
 
 from app.config.settings import settings
+from app.services.http_metrics import ConnectionStats, http2_available
+from app.services.cache import TieredCache
+from app.services.lexicon import lexicon_scorer, LEXICON_MODEL
+from app.services.keywords import extract_keywords
+from app.services.conversations import fit_history_to_budget
+from app.services.singleflight import SingleFlight
+from app.services.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, RetryBudget, backoff_delay
 
 logger = logging.getLogger(__name__)
 
-async def analyze_sentiment(text: str) -> Optional[Dict[str, Any]]:
+SENTIMENT_MODEL = settings.SENTIMENT_MODEL
+CHAT_MODEL = "meta-llama/Llama-2-7b-chat-hf"
+
+# MODEL_ENDPOINT selects the sentiment backend: "local" for the in-process
+# lexicon scorer, a full URL for a custom inference endpoint, or empty for
+# the hosted SENTIMENT_MODEL
+SENTIMENT_ENDPOINT = settings.MODEL_ENDPOINT if settings.MODEL_ENDPOINT.startswith("http") else SENTIMENT_MODEL
+
+# Identity of the remote sentiment model, recorded on results and cache entries.
+# A custom endpoint may serve any model, so it is identified by its URL
+REMOTE_SENTIMENT_MODEL = SENTIMENT_ENDPOINT
+
+# Shared keep-alive client for the Hugging Face inference API, created at startup
+_hf_client: Optional[httpx.AsyncClient] = None
+
+hf_connection_stats = ConnectionStats("huggingface")
+
+# Per-endpoint latency split into connection setup and inference (server) time
+_latency: Dict[str, Dict[str, float]] = {}
+
+def get_hf_client() -> httpx.AsyncClient:
     """
-    Analyzes the sentiment of a text using Hugging Face API
+    Returns the shared Hugging Face inference client, creating it if needed
     
-    Args:
-        text: The text to analyze
-        
     Returns:
-        Dict with sentiment analysis results or None if failed
+        httpx.AsyncClient: Pooled client with auth headers set
     """
-    if not settings.HUGGINGFACE_API_KEY:
-        logger.warning("Hugging Face API key not set, skipping sentiment analysis")
-        # Return mock data for development without API key
-        return {
-            "score": 0.75,
-            "label": "POSITIVE",
-            "keywords": ["happy", "good", "better"],
-        }
+    global _hf_client
     
-    try:
-        async with httpx.AsyncClient() as client:
-            headers = {
+    if _hf_client is None:
+        _hf_client = httpx.AsyncClient(
+            base_url=settings.HF_API_URL,
+            headers={
                 "Authorization": f"Bearer {settings.HUGGINGFACE_API_KEY}",
                 "Content-Type": "application/json"
-            }
-            
-            # Using distilbert-base-uncased-finetuned-sst-2-english for sentiment
-            payload = {
-                "inputs": text[:512]  # Limit text length
-            }
-            
-            response = await client.post(
-                "https://api-inference.huggingface.co/models/distilbert-base-uncased-finetuned-sst-2-english",
-                headers=headers,
+            },
+            limits=httpx.Limits(
+                max_connections=settings.HF_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HF_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HF_KEEPALIVE_EXPIRY,
+            ),
+            http2=settings.HF_HTTP2 and http2_available(),
+            event_hooks=hf_connection_stats.async_hooks(),
+        )
+    
+    return _hf_client
+
+def init_ai_client() -> None:
+    """
+    Creates the shared inference client, called on application startup
+    """
+    if settings.HUGGINGFACE_API_KEY:
+        get_hf_client()
+
+async def close_ai_client() -> None:
+    """
+    Closes the shared inference client, called on application shutdown
+    """
+    global _hf_client
+    
+    if _hf_client is not None:
+        await _hf_client.aclose()
+        _hf_client = None
+
+def _record_latency(endpoint: str, total: float, setup: float) -> None:
+    stats = _latency.setdefault(endpoint, {"requests": 0, "total_time": 0.0, "setup_time": 0.0})
+    stats["requests"] += 1
+    stats["total_time"] += total
+    stats["setup_time"] += setup
+
+# Resilience state: one circuit per model, one latency window per endpoint and batch size, one shared retry budget
+_breakers: Dict[str, CircuitBreaker] = {}
+_latency_trackers: Dict[str, LatencyTracker] = {}
+retry_budget = RetryBudget(
+    ratio=settings.HF_RETRY_BUDGET_RATIO,
+    min_per_second=settings.HF_RETRY_BUDGET_MIN_PER_SECOND,
+)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+def _breaker(model: str) -> CircuitBreaker:
+    breaker = _breakers.get(model)
+    if breaker is None:
+        breaker = _breakers[model] = CircuitBreaker(
+            model,
+            failure_threshold=settings.HF_BREAKER_FAILURE_THRESHOLD,
+            recovery_time=settings.HF_BREAKER_RECOVERY_TIME,
+        )
+    return breaker
+
+def _latency_window(endpoint: str, batch_size: int) -> str:
+    # Latency grows with the batch, so each power-of-two batch size bucket gets its own window
+    return f"{endpoint}:{1 << (max(batch_size, 1) - 1).bit_length()}"
+
+def _latency_tracker(window: str) -> LatencyTracker:
+    return _latency_trackers.setdefault(window, LatencyTracker())
+
+def _inference_timeout(window: str, ceiling: float) -> httpx.Timeout:
+    read = _latency_tracker(window).timeout(
+        ceiling,
+        floor=settings.HF_MIN_TIMEOUT,
+        percentile=settings.HF_TIMEOUT_PERCENTILE,
+        multiplier=settings.HF_TIMEOUT_MULTIPLIER,
+    )
+    return httpx.Timeout(read, connect=settings.HF_CONNECT_TIMEOUT)
+
+def _warmup_time(response: httpx.Response) -> Optional[float]:
+    # Hugging Face answers 503 with {"error": "... is currently loading", "estimated_time": 20.0} while a model warms up
+    if response.status_code != 503:
+        return None
+    try:
+        return float(response.json()["estimated_time"])
+    except Exception:
+        return None
+
+async def _post_inference(endpoint: str, model: str, payload: Dict[str, Any], timeout: float, batch_size: int = 1) -> httpx.Response:
+    """
+    Posts a payload to a Hugging Face model on the shared client and records latency.
+    Transient failures are retried with jittered backoff within the shared retry
+    budget, model warm-up is waited out when short enough, and calls fail fast
+    while the model's circuit is open.
+    
+    Args:
+        endpoint: Metrics label for the call (e.g. "sentiment", "chat")
+        model: Model path on the inference API
+        payload: JSON payload
+        timeout: Maximum read timeout in seconds for this endpoint
+        batch_size: Number of inputs in the payload, selects the latency window the adaptive timeout comes from
+        
+    Returns:
+        The HTTP response of the last attempt
+        
+    Raises:
+        CircuitOpenError: If the model's circuit is open
+        httpx.TransportError: If the last attempt failed to get a response
+    """
+    breaker = _breaker(model)
+    if not breaker.allow():
+        raise CircuitOpenError(f"Circuit for {model} is open")
+    
+    retry_budget.record_request()
+    window = _latency_window(endpoint, batch_size)
+    attempt = 0
+    
+    while True:
+        started = time.perf_counter()
+        try:
+            response = await get_hf_client().post(
+                model if model.startswith("http") else f"/{model}",
                 json=payload,
-                timeout=10.0
+                timeout=_inference_timeout(window, timeout)
             )
+        except httpx.TransportError as e:
+            breaker.record_failure()
+            if attempt >= settings.HF_MAX_RETRIES or breaker.state == CircuitBreaker.OPEN or not retry_budget.try_retry():
+                raise
+            delay = backoff_delay(attempt, settings.HF_RETRY_BASE_DELAY, settings.HF_RETRY_MAX_DELAY)
+            logger.warning(f"{endpoint} inference failed ({type(e).__name__}), retrying in {delay:.2f}s")
+        else:
+            total = time.perf_counter() - started
+            _record_latency(endpoint, total, response.request.extensions.get("connection_setup_time", 0.0))
             
-            if response.status_code != 200:
-                logger.error(f"Hugging Face API error: {response.text}")
-                return None
-            
-            sentiment_data = response.json()
+            if response.status_code not in RETRYABLE_STATUS:
+                breaker.record_success()
+                if response.status_code == 200:
+                    _latency_tracker(window).record(total)
+                return response
             
-            # Extract keywords using textrank algorithm (simplified version)
-            keywords = extract_keywords(text)
+            warmup = _warmup_time(response)
+            if warmup is not None and warmup > settings.HF_MAX_WARMUP_WAIT:
+                # Not worth waiting for, fail fast until the model should be loaded
+                breaker.trip(warmup)
+                return response
+            if warmup is None:
+                breaker.record_failure()
             
-            # Build result
-            if isinstance(sentiment_data, list) and len(sentiment_data) > 0:
-                result = {
-                    "score": next((item["score"] for item in sentiment_data if item["label"] == "POSITIVE"), 0.5),
-                    "label": sentiment_data[0]["label"],
-                    "keywords": keywords
-                }
-                
-                # Generate suggestions based on sentiment
-                if result["label"] == "NEGATIVE" and result["score"] < 0.3:
-                    result["suggestions"] = [
-                        "Consider practicing deep breathing for 5 minutes",
-                        "Try to identify specific triggers for these feelings",
-                        "Remember a time you felt more positive about this situation"
-                    ]
-                
-                return result
-            
-            return None
+            if attempt >= settings.HF_MAX_RETRIES or breaker.state == CircuitBreaker.OPEN or not retry_budget.try_retry():
+                return response
+            delay = warmup if warmup is not None else backoff_delay(attempt, settings.HF_RETRY_BASE_DELAY, settings.HF_RETRY_MAX_DELAY)
+            logger.warning(f"{endpoint} inference returned {response.status_code}, retrying in {delay:.2f}s")
+        
+        attempt += 1
+        await asyncio.sleep(delay)
+
+# Number of remote sentiment failures answered by the local scorer
+local_fallbacks = 0
+
+# Sentiment results keyed on a hash of the normalized text and the model name
+sentiment_cache = TieredCache(
+    "sentiment",
+    max_size=settings.SENTIMENT_CACHE_MAX_SIZE,
+    ttl=settings.SENTIMENT_CACHE_TTL,
+    redis_url=settings.REDIS_URL,
+    redis_ttl=settings.SENTIMENT_CACHE_REDIS_TTL,
+)
+
+def _single_flight(namespace: str) -> SingleFlight:
+    return SingleFlight(
+        namespace,
+        redis_url=settings.REDIS_URL if settings.SINGLEFLIGHT_REDIS else None,
+        lock_ttl=settings.SINGLEFLIGHT_LOCK_TTL,
+    )
+
+# Identical requests already in flight share one upstream call
+sentiment_flight = _single_flight("sentiment")
+chat_flight = _single_flight("chat")
+
+def _normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+def sentiment_cache_key(text: str, model: str = REMOTE_SENTIMENT_MODEL) -> str:
+    """
+    Builds the sentiment cache key for a text
+    
+    Args:
+        text: The analyzed text
+        model: Sentiment model name
+        
+    Returns:
+        Hex digest identifying the (model, normalized text) pair
+    """
+    return hashlib.sha256(f"{model}\x00{_normalize_text(text)}".encode()).hexdigest()
+
+async def purge_sentiment_cache() -> None:
+    """
+    Drops every cached sentiment result from both tiers
+    """
+    await sentiment_cache.clear()
+
+async def sync_sentiment_cache_model() -> None:
+    """
+    Purges cached sentiment results produced by a different model, called on application startup
+    """
+    await sentiment_cache.ensure_version(REMOTE_SENTIMENT_MODEL)
+
+def ai_client_stats() -> Dict[str, Any]:
+    """
+    Returns connection reuse and latency statistics for the inference client
+    """
+    latency = {}
+    for endpoint, stats in _latency.items():
+        requests = stats["requests"]
+        latency[endpoint] = {
+            "requests": requests,
+            "avg_total_ms": round(stats["total_time"] / requests * 1000, 2),
+            "avg_connection_setup_ms": round(stats["setup_time"] / requests * 1000, 2),
+            "avg_inference_ms": round((stats["total_time"] - stats["setup_time"]) / requests * 1000, 2),
+        }
+    
+    return {
+        "connections": hf_connection_stats.stats(),
+        "latency": latency,
+        "sentiment_cache": sentiment_cache.stats(),
+        "sentiment_batching": sentiment_batcher.stats(),
+        "sentiment_backend": "local" if use_local_sentiment() else "remote",
+        "sentiment_local_fallbacks": local_fallbacks,
+        "chat_streaming": chat_stream_stats.stats(),
+        "circuit_breakers": {model: breaker.stats() for model, breaker in _breakers.items()},
+        "retry_budget": retry_budget.stats(),
+        "adaptive_timeouts": {window: tracker.stats() for window, tracker in _latency_trackers.items()},
+        "single_flight": {"sentiment": sentiment_flight.stats(), "chat": chat_flight.stats()},
+    }
+
+async def _query_sentiment_model(texts: List[str]) -> List[Optional[List[Dict[str, Any]]]]:
+    """
+    Sends a batch of texts to the sentiment model in a single request
+    
+    Args:
+        texts: Texts to classify
+        
+    Returns:
+        One list of {"label", "score"} predictions per text, or None for texts that failed
+    """
+    # Using distilbert-base-uncased-finetuned-sst-2-english for sentiment
+    payload = {
+        "inputs": [text[:settings.SENTIMENT_CHUNK_CHARS] for text in texts]  # Limit text length
+    }
+    
+    response = await _post_inference("sentiment", SENTIMENT_ENDPOINT, payload, settings.HF_SENTIMENT_TIMEOUT, len(texts))
+    
+    if response.status_code != 200:
+        logger.error(f"Hugging Face API error: {response.text}")
+        return [None] * len(texts)
+    
+    sentiment_data = response.json()
+    if not isinstance(sentiment_data, list):
+        logger.error(f"Unexpected Hugging Face response: {sentiment_data}")
+        return [None] * len(texts)
+    
+    # A single input may come back as a flat list of predictions
+    if len(texts) == 1 and sentiment_data and isinstance(sentiment_data[0], dict):
+        sentiment_data = [sentiment_data]
+    
+    if len(sentiment_data) != len(texts):
+        logger.error(f"Hugging Face returned {len(sentiment_data)} results for {len(texts)} inputs")
+        return [None] * len(texts)
+    
+    return [predictions if predictions else None for predictions in sentiment_data]
+
+class SentimentBatcher:
+    """
+    Coalesces concurrent sentiment requests into batched inference calls.
+    A batch is sent when it reaches max_batch_size or after max_wait_ms,
+    whichever comes first, and each caller gets its own predictions back.
+    """
+    
+    def __init__(self, max_batch_size: int = 16, max_wait_ms: float = 10.0):
+        """
+        Initialize the batcher
+        
+        Args:
+            max_batch_size: Maximum number of texts per inference request
+            max_wait_ms: Maximum time the first queued text waits for others
+        """
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[tuple] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+    
+    async def submit(self, text: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Queues a text for the next batch and waits for its predictions
+        
+        Args:
+            text: The text to classify
             
-    except Exception as e:
-        logger.exception(f"Error during sentiment analysis: {str(e)}")
-        return None
+        Returns:
+            List of {"label", "score"} predictions, or None if inference failed
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, batch: List[tuple]) -> None:
+        # Identical texts in the same batch are only sent once
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(texts))
+        
+        try:
+            predictions = dict(zip(texts, await _query_sentiment_model(texts)))
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping sentiment batch: {str(e)}")
+            predictions = {}
+        except Exception as e:
+            logger.exception(f"Error during batched sentiment analysis: {str(e)}")
+            predictions = {}
+        
+        for text, future in batch:
+            if not future.done():
+                future.set_result(predictions.get(text))
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+        }
 
-def extract_keywords(text: str, max_keywords: int = 5) -> List[str]:
+sentiment_batcher = SentimentBatcher(
+    max_batch_size=settings.SENTIMENT_BATCH_SIZE,
+    max_wait_ms=settings.SENTIMENT_BATCH_WAIT_MS,
+)
+
+def use_local_sentiment() -> bool:
+    """
+    Whether sentiment is scored in-process instead of by the remote model
+    """
+    return settings.MODEL_ENDPOINT == "local" or not settings.HUGGINGFACE_API_KEY
+
+def active_sentiment_model() -> str:
+    """
+    Name of the model new sentiment results are expected to come from
+    """
+    return LEXICON_MODEL if use_local_sentiment() else REMOTE_SENTIMENT_MODEL
+
+def content_fingerprint(text: str) -> str:
+    """
+    Hashes a text after whitespace and Unicode normalization, so edits that
+    do not change the analyzed content keep the same fingerprint
+    
+    Args:
+        text: The text to fingerprint
+        
+    Returns:
+        Hex digest of the normalized text
+    """
+    return hashlib.sha256(_normalize_text(text).encode()).hexdigest()
+
+_SENTENCE_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+def split_into_chunks(text: str, max_chars: int = settings.SENTIMENT_CHUNK_CHARS) -> List[str]:
     """
-    Simple keyword extraction function
-    In a production system, you would use a proper NLP library like spaCy or NLTK
+    Splits text on sentence boundaries into windows that fit the sentiment model
     
     Args:
-        text: The text to extract keywords from
-        max_keywords: Maximum number of keywords to extract
+        text: The text to split
+        max_chars: Maximum window length in characters
         
     Returns:
-        List of extracted keywords
-    """
-    # This is a very simplified version
-    # In production, use TextRank or similar algorithms
-    words = text.lower().split()
-    
-    # Remove stopwords (very basic list)
-    stopwords = {"i", "me", "my", "myself", "we", "our", "ours", "ourselves", "you", 
-                "your", "yours", "yourself", "yourselves", "he", "him", "his", "himself", 
-                "she", "her", "hers", "herself", "it", "its", "itself", "they", "them", 
-                "their", "theirs", "themselves", "what", "which", "who", "whom", "this", 
-                "that", "these", "those", "am", "is", "are", "was", "were", "be", "been", 
-                "being", "have", "has", "had", "having", "do", "does", "did", "doing", 
-                "a", "an", "the", "and", "but", "if", "or", "because", "as", "until", 
-                "while", "of", "at", "by", "for", "with", "about", "against", "between", 
-                "into", "through", "during", "before", "after", "above", "below", "to", 
-                "from", "up", "down", "in", "out", "on", "off", "over", "under", "again", 
-                "further", "then", "once", "here", "there", "when", "where", "why", "how", 
-                "all", "any", "both", "each", "few", "more", "most", "other", "some", "such", 
-                "no", "nor", "not", "only", "own", "same", "so", "than", "too", "very", "s", 
-                "t", "can", "will", "just", "don", "should", "now"}
-    
-    filtered_words = [word for word in words if word not in stopwords and len(word) > 3]
-    
-    # Count word frequency
-    word_freq = {}
-    for word in filtered_words:
-        if word in word_freq:
-            word_freq[word] += 1
+        List of chunks, each at most max_chars long
+    """
+    chunks: List[str] = []
+    current = ""
+    
+    for sentence in _SENTENCE_BOUNDARY_RE.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        
+        # Hard-split sentences that are longer than a whole window
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
         else:
-            word_freq[word] = 1
+            current = f"{current} {sentence}" if current else sentence
+    
+    if current:
+        chunks.append(current)
+    
+    # Keep an even sample of very long entries to bound the number of inference inputs
+    max_chunks = settings.SENTIMENT_MAX_CHUNKS
+    if len(chunks) > max_chunks:
+        step = len(chunks) / max_chunks
+        chunks = [chunks[int(i * step)] for i in range(max_chunks)]
+    
+    return chunks or [text[:max_chars]]
+
+async def _score_chunks_remotely(chunks: List[str]) -> List[Optional[List[Dict[str, Any]]]]:
+    # Chunks go through the batcher concurrently, so they usually share one request
+    semaphore = asyncio.Semaphore(settings.SENTIMENT_CHUNK_CONCURRENCY)
+    
+    async def score(chunk: str) -> Optional[List[Dict[str, Any]]]:
+        async with semaphore:
+            try:
+                return await sentiment_batcher.submit(chunk)
+            except Exception as e:
+                logger.exception(f"Error during sentiment analysis: {str(e)}")
+                return None
+    
+    return await asyncio.gather(*(score(chunk) for chunk in chunks))
+
+def _positive_score(predictions: List[Dict[str, Any]]) -> float:
+    return next((item["score"] for item in predictions if item["label"] == "POSITIVE"), 0.5)
+
+def _build_sentiment_result(
+    text: str,
+    chunks: List[str],
+    chunk_predictions: List[List[Dict[str, Any]]],
+    model: str
+) -> Dict[str, Any]:
+    # Extract keywords using TextRank
+    keywords = extract_keywords(text)
+    
+    # Length-weighted aggregate of the per-chunk positive scores
+    chunk_scores = [_positive_score(predictions) for predictions in chunk_predictions]
+    total_length = sum(len(chunk) for chunk in chunks)
     
-    # Sort by frequency
-    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+    # Text without any sentences carries no sentiment either way
+    if total_length == 0:
+        return {"score": 0.5, "label": "NEUTRAL", "keywords": keywords, "model": model}
     
-    # Return top keywords
-    return [word for word, _ in sorted_words[:max_keywords]]
+    score = sum(len(chunk) * chunk_score for chunk, chunk_score in zip(chunks, chunk_scores)) / total_length
+    
+    result = {
+        "score": round(score, 4),
+        "label": "POSITIVE" if score >= 0.5 else "NEGATIVE",
+        "keywords": keywords,
+        "model": model
+    }
+    
+    if len(chunks) > 1:
+        result["chunks"] = [
+            {
+                "score": chunk_score,
+                "label": "POSITIVE" if chunk_score >= 0.5 else "NEGATIVE",
+                "length": len(chunk)
+            }
+            for chunk, chunk_score in zip(chunks, chunk_scores)
+        ]
+    
+    # Generate suggestions based on sentiment
+    if result["label"] == "NEGATIVE" and result["score"] < 0.3:
+        result["suggestions"] = [
+            "Consider practicing deep breathing for 5 minutes",
+            "Try to identify specific triggers for these feelings",
+            "Remember a time you felt more positive about this situation"
+        ]
+    
+    return result
+
+async def analyze_sentiment(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Analyzes the sentiment of a text using Hugging Face API, or the local
+    lexicon scorer when selected or when the remote call fails.
+    Long texts are split into sentence-aligned chunks that are scored
+    together and combined into a length-weighted score.
+    
+    Args:
+        text: The text to analyze
+        
+    Returns:
+        Dict with sentiment analysis results or None if failed
+    """
+    # Blank text has nothing to score, so no model call is needed
+    if not text.strip():
+        return _build_sentiment_result(text, [], [], active_sentiment_model())
+    
+    chunks = split_into_chunks(text)
+    
+    if use_local_sentiment():
+        return _build_sentiment_result(text, chunks, lexicon_scorer.score_batch(chunks), LEXICON_MODEL)
+    
+    cache_key = sentiment_cache_key(text)
+    cached_result = await sentiment_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+    
+    return await sentiment_flight.do(cache_key, lambda: _analyze_remotely(text, chunks, cache_key))
+
+async def _analyze_remotely(text: str, chunks: List[str], cache_key: str) -> Optional[Dict[str, Any]]:
+    global local_fallbacks
+    
+    chunk_predictions = await _score_chunks_remotely(chunks)
+    
+    if not all(chunk_predictions):
+        if settings.SENTIMENT_LOCAL_FALLBACK:
+            logger.warning("Remote sentiment analysis failed, falling back to local lexicon scorer")
+            local_fallbacks += 1
+            return _build_sentiment_result(text, chunks, lexicon_scorer.score_batch(chunks), LEXICON_MODEL)
+        return None
+    
+    result = _build_sentiment_result(text, chunks, chunk_predictions, REMOTE_SENTIMENT_MODEL)
+    await sentiment_cache.set(cache_key, result)
+    return result
+
+CHAT_SYSTEM_PROMPT = (
+    "You are a helpful assistant trained in cognitive behavioral therapy (CBT). " +
+    "Your goal is to help users identify negative thought patterns and develop " +
+    "healthier thinking habits. Be empathetic and supportive, but also help " +
+    "users challenge distorted thoughts."
+)
+
+# Follow-up suggestions based on common CBT techniques
+CBT_SUGGESTIONS = [
+    "What evidence supports this thought?",
+    "Is there another way to look at this situation?",
+    "What would you tell a friend who was in this situation?"
+]
+
+# Canned replies are flagged as fallbacks so they are not stored as part of a conversation
+MOCK_CHAT_RESPONSE = {
+    "response": "I'm here to help you with cognitive behavioral therapy techniques. " +
+              "What are you feeling right now?",
+    "suggestions": ["Tell me more about that feeling", 
+                   "When did you start feeling this way?",
+                   "What thoughts are associated with this feeling?"],
+    "fallback": True
+}
+
+CHAT_UNAVAILABLE_RESPONSE = {
+    "response": "I'm sorry, I'm having trouble processing your request right now. Please try again later.",
+    "suggestions": ["How are you feeling right now?", 
+                  "Would you like to try a different approach?",
+                  "Let's take a deep breath together."],
+    "fallback": True
+}
+
+CHAT_ERROR_RESPONSE = {
+    "response": "I apologize, but I encountered an error. Please try again later.",
+    "suggestions": ["Let's try a different approach", "How are you feeling right now?"],
+    "fallback": True
+}
+
+def _prepare_chat_history(message: str, history: Optional[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    # Work on a copy, the caller's list is the stored conversation and feeds the single-flight key
+    history = list(history or [])
+    
+    # Add system message if not present
+    if not any(msg.get("role") == "system" for msg in history):
+        history.insert(0, {
+            "role": "system",
+            "content": CHAT_SYSTEM_PROMPT
+        })
+    
+    # Add user message
+    history.append({
+        "role": "user",
+        "content": message
+    })
+    
+    # Keep the prompt size flat over long conversations
+    return fit_history_to_budget(history, settings.CHAT_HISTORY_TOKEN_BUDGET)
 
 async def chat_with_bot(message: str, history: List[Dict[str, str]] = None) -> Dict[str, Any]:
     """
@@ -136,83 +663,154 @@ async def chat_with_bot(message: str, history: List[Dict[str, str]] = None) -> D
         history: Chat history as list of {"role": "user"|"assistant", "content": "message"}
         
     Returns:
-        Dict with response from the chatbot
+        Dict with response from the chatbot, "fallback" is set when it is a canned
+        reply instead of a model completion
     """
     if not settings.HUGGINGFACE_API_KEY:
         logger.warning("Hugging Face API key not set, using mock chatbot response")
+        return dict(MOCK_CHAT_RESPONSE)
+    
+    key = hashlib.sha256(json.dumps([message, history or []], sort_keys=True).encode()).hexdigest()
+    response = await chat_flight.do(key, lambda: _chat_remotely(message, history))
+    # Callers sharing a flight get their own copy
+    return {**response, "suggestions": list(response["suggestions"])}
+
+async def _chat_remotely(message: str, history: Optional[List[Dict[str, str]]]) -> Dict[str, Any]:
+    try:
+        history = _prepare_chat_history(message, history)
+        
+        # For production, consider using a model specifically fine-tuned for CBT
+        # Here we're using a general model
+        response = await _post_inference("chat", CHAT_MODEL, {"inputs": history}, settings.HF_CHAT_TIMEOUT)
+        
+        if response.status_code != 200:
+            logger.error(f"Hugging Face API error: {response.text}")
+            return dict(CHAT_UNAVAILABLE_RESPONSE)
+        
+        bot_response = response.json()
+        
+        # Process response from the model
+        assistant_message = bot_response.get("generated_text", "")
+        
         return {
-            "response": "I'm here to help you with cognitive behavioral therapy techniques. " +
-                      "What are you feeling right now?",
-            "suggestions": ["Tell me more about that feeling", 
-                           "When did you start feeling this way?",
-                           "What thoughts are associated with this feeling?"]
+            "response": assistant_message,
+            "suggestions": list(CBT_SUGGESTIONS),
+            "fallback": False
         }
+        
+    except CircuitOpenError as e:
+        logger.warning(f"Chat model unavailable: {str(e)}")
+        return dict(CHAT_UNAVAILABLE_RESPONSE)
+    except Exception as e:
+        logger.exception(f"Error during chatbot interaction: {str(e)}")
+        return dict(CHAT_ERROR_RESPONSE)
+
+class ChatStreamStats:
+    """
+    Time-to-first-token and throughput counters for streamed chat responses
+    """
+    
+    def __init__(self):
+        self.streams = 0
+        self.failed = 0
+        self.tokens = 0
+        self.total_ttft = 0.0
+        self.total_generation_time = 0.0
+    
+    def record(self, tokens: int, ttft: Optional[float], duration: float) -> None:
+        self.streams += 1
+        self.tokens += tokens
+        if ttft is not None:
+            self.total_ttft += ttft
+            self.total_generation_time += duration - ttft
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "streams": self.streams,
+            "failed": self.failed,
+            "tokens": self.tokens,
+            "avg_time_to_first_token_ms": round(self.total_ttft / self.streams * 1000, 2) if self.streams else 0.0,
+            "tokens_per_second": round(self.tokens / self.total_generation_time, 2) if self.total_generation_time else 0.0,
+        }
+
+chat_stream_stats = ChatStreamStats()
+
+async def stream_chat_with_bot(message: str, history: List[Dict[str, str]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streams a CBT bot reply token by token from the Hugging Face API
+    
+    Args:
+        message: User message
+        history: Chat history as list of {"role": "user"|"assistant", "content": "message"}
+        
+    Yields:
+        {"type": "token", "text": ...} events, then one {"type": "done", "suggestions": [...], "fallback": ...}
+        event, "fallback" being set when the model did not complete the reply
+    """
+    if not settings.HUGGINGFACE_API_KEY:
+        logger.warning("Hugging Face API key not set, using mock chatbot response")
+        for word in MOCK_CHAT_RESPONSE["response"].split(" "):
+            yield {"type": "token", "text": f"{word} "}
+        yield {"type": "done", "suggestions": MOCK_CHAT_RESPONSE["suggestions"], "fallback": True}
+        return
+    
+    history = _prepare_chat_history(message, history)
+    started = time.perf_counter()
+    first_token_at: Optional[float] = None
+    tokens = 0
+    fallback: Optional[Dict[str, Any]] = None
+    breaker = _breaker(CHAT_MODEL)
     
     try:
-        # Prepare conversation history
-        if not history:
-            history = []
-        
-        # Add system message if not present
-        if not any(msg.get("role") == "system" for msg in history):
-            history.insert(0, {
-                "role": "system",
-                "content": "You are a helpful assistant trained in cognitive behavioral therapy (CBT). " +
-                         "Your goal is to help users identify negative thought patterns and develop " +
-                         "healthier thinking habits. Be empathetic and supportive, but also help " +
-                         "users challenge distorted thoughts."
-            })
-        
-        # Add user message
-        history.append({
-            "role": "user",
-            "content": message
-        })
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit for {CHAT_MODEL} is open")
         
-        async with httpx.AsyncClient() as client:
-            headers = {
-                "Authorization": f"Bearer {settings.HUGGINGFACE_API_KEY}",
-                "Content-Type": "application/json"
-            }
-            
-            # For production, consider using a model specifically fine-tuned for CBT
-            # Here we're using a general model
-            response = await client.post(
-                "https://api-inference.huggingface.co/models/meta-llama/Llama-2-7b-chat-hf",
-                headers=headers,
-                json={"inputs": history},
-                timeout=30.0
-            )
-            
+        async with get_hf_client().stream(
+            "POST",
+            f"/{CHAT_MODEL}",
+            json={"inputs": history, "stream": True},
+            timeout=httpx.Timeout(settings.HF_CHAT_TIMEOUT, connect=settings.HF_CONNECT_TIMEOUT)
+        ) as response:
             if response.status_code != 200:
-                logger.error(f"Hugging Face API error: {response.text}")
-                return {
-                    "response": "I'm sorry, I'm having trouble processing your request right now. Please try again later.",
-                    "suggestions": ["How are you feeling right now?", 
-                                  "Would you like to try a different approach?",
-                                  "Let's take a deep breath together."]
-                }
-            
-            bot_response = response.json()
-            
-            # Process response from the model
-            assistant_message = bot_response.get("generated_text", "")
-            
-            # Generate follow-up suggestions based on common CBT techniques
-            suggestions = [
-                "What evidence supports this thought?",
-                "Is there another way to look at this situation?",
-                "What would you tell a friend who was in this situation?"
-            ]
-            
-            return {
-                "response": assistant_message,
-                "suggestions": suggestions
-            }
-            
+                logger.error(f"Hugging Face API error: {(await response.aread()).decode(errors='replace')}")
+                if response.status_code in RETRYABLE_STATUS:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                fallback = CHAT_UNAVAILABLE_RESPONSE
+            else:
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    
+                    event = json.loads(line[len("data:"):])
+                    token = event.get("token") or {}
+                    if token.get("special") or not token.get("text"):
+                        continue
+                    
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    tokens += 1
+                    yield {"type": "token", "text": token["text"]}
+                
+                breaker.record_success()
+    
+    except CircuitOpenError as e:
+        logger.warning(f"Chat model unavailable: {str(e)}")
+        fallback = CHAT_UNAVAILABLE_RESPONSE
     except Exception as e:
-        logger.exception(f"Error during chatbot interaction: {str(e)}")
-        return {
-            "response": "I apologize, but I encountered an error. Please try again later.",
-            "suggestions": ["Let's try a different approach", "How are you feeling right now?"]
-        } 
\ No newline at end of file
+        logger.exception(f"Error during streamed chatbot interaction: {str(e)}")
+        breaker.record_failure()
+        fallback = CHAT_ERROR_RESPONSE
+    
+    if fallback is not None:
+        chat_stream_stats.failed += 1
+        # Only send the apology if the user has not already seen part of a reply
+        if tokens == 0:
+            yield {"type": "token", "text": fallback["response"]}
+        yield {"type": "done", "suggestions": fallback["suggestions"], "fallback": True}
+        return
+    
+    ttft = first_token_at - started if first_token_at is not None else None
+    chat_stream_stats.record(tokens, ttft, time.perf_counter() - started)
+    yield {"type": "done", "suggestions": list(CBT_SUGGESTIONS), "fallback": False}
@@ -0,0 +1,216 @@
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before trying Redis again after an error
+REDIS_RETRY_INTERVAL = 30
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache with a per-entry time to live
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        """
+        Initialize the cache
+
+        Args:
+            max_size: Maximum number of entries kept before the least recently used is evicted
+            ttl: Time to live of each entry in seconds
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class TieredCache:
+    """
+    Two-tier cache: an in-process LRU in front of an optional shared Redis tier.
+    Values must be JSON serializable.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_size: int,
+        ttl: float,
+        redis_url: Optional[str] = None,
+        redis_ttl: Optional[int] = None,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            namespace: Prefix used for Redis keys
+            max_size: Maximum number of entries in the local tier
+            ttl: Time to live of local entries in seconds
+            redis_url: Redis connection URL, the Redis tier is disabled when empty
+            redis_ttl: Time to live of Redis entries in seconds (defaults to ttl)
+        """
+        self.namespace = namespace
+        self.local = TTLCache(max_size, ttl)
+        self.redis_url = redis_url
+        self.redis_ttl = int(redis_ttl or ttl)
+        self.redis_client = None
+        self._redis_retry_at = 0.0
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _redis(self):
+        if not self.redis_url or time.monotonic() < self._redis_retry_at:
+            return None
+
+        if self.redis_client is None:
+            try:
+                self.redis_client = aioredis.from_url(self.redis_url)
+            except Exception as e:
+                logger.warning(f"Failed to connect to Redis for {self.namespace} cache: {str(e)}")
+                self.redis_url = None
+                return None
+
+        return self.redis_client
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    def _redis_failed(self, e: Exception) -> None:
+        # Skip the Redis tier for a while instead of paying a failed round trip on every lookup
+        logger.warning(f"Redis error in {self.namespace} cache, using local tier only for {REDIS_RETRY_INTERVAL}s: {str(e)}")
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        client = self._redis()
+        if client is not None:
+            try:
+                raw = await client.get(self._redis_key(key))
+                if raw is not None:
+                    value = json.loads(raw)
+                    self.local.set(key, value)
+                    self.redis_hits += 1
+                    return value
+            except Exception as e:
+                self._redis_failed(e)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        self.local.set(key, value)
+
+        client = self._redis()
+        if client is not None:
+            try:
+                await client.set(self._redis_key(key), json.dumps(value), ex=self.redis_ttl)
+            except Exception as e:
+                self._redis_failed(e)
+
+    async def delete(self, key: str) -> None:
+        self.local.delete(key)
+
+        client = self._redis()
+        if client is not None:
+            try:
+                await client.delete(self._redis_key(key))
+            except Exception as e:
+                self._redis_failed(e)
+
+    async def clear(self) -> None:
+        self.local.clear()
+
+        client = self._redis()
+        if client is not None:
+            try:
+                keys = [key async for key in client.scan_iter(match=self._redis_key("*"))]
+                if keys:
+                    await client.delete(*keys)
+            except Exception as e:
+                self._redis_failed(e)
+
+    async def ensure_version(self, version: str) -> None:
+        """
+        Purges the cache when the version marker stored in Redis differs from
+        the given one (e.g. after a model change), then records the new version
+
+        Args:
+            version: Identifier of whatever produced the cached values
+        """
+        client = self._redis()
+        if client is None:
+            return
+
+        marker = f"cache-version:{self.namespace}"
+        try:
+            stored = await client.get(marker)
+            if stored is not None and stored.decode() != version:
+                logger.info(f"{self.namespace} cache version changed to {version}, purging")
+                await self.clear()
+            await client.set(marker, version)
+        except Exception as e:
+            self._redis_failed(e)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "size": len(self.local),
+            "max_size": self.local.max_size,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "evictions": self.local.evictions,
+            "hit_rate": round((self.hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+# Authenticated users keyed by user id, looked up on every authenticated request.
+# The API never changes a user row once created, so entries only expire by TTL;
+# an endpoint that edits or deletes users must also delete the cached entry
+user_cache = TieredCache(
+    "user",
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL,
+    redis_url=settings.REDIS_URL if settings.USER_CACHE_REDIS else None,
+)
@@ -0,0 +1,192 @@
+import json
+import time
+import uuid
+import logging
+from typing import Dict, List, Optional
+
+import redis.asyncio as aioredis
+
+from app.config.settings import settings
+from app.services.cache import TTLCache, REDIS_RETRY_INTERVAL
+from app.services.keywords import extract_keywords
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a token in characters and the per-message framing overhead
+CHARS_PER_TOKEN = 4
+MESSAGE_TOKEN_OVERHEAD = 4
+SUMMARY_KEYWORDS = 8
+
+Message = Dict[str, str]
+
+def new_conversation_id() -> str:
+    return uuid.uuid4().hex
+
+def estimate_tokens(message: Message) -> int:
+    return len(message.get("content", "")) // CHARS_PER_TOKEN + MESSAGE_TOKEN_OVERHEAD
+
+class InMemoryConversationStore:
+    """
+    Process-local conversation store, used when Redis is not configured
+    """
+
+    def __init__(self, max_size: int, ttl: int, max_messages: int):
+        """
+        Initialize the store
+
+        Args:
+            max_size: Maximum number of conversations kept before the least recently used is dropped
+            ttl: Seconds a conversation is kept after its last message
+            max_messages: Maximum number of messages kept per conversation
+        """
+        self._conversations = TTLCache(max_size, ttl)
+        self.max_messages = max_messages
+
+    async def get(self, user_id: str, conversation_id: str) -> List[Message]:
+        return list(self._conversations.get(f"{user_id}:{conversation_id}") or [])
+
+    async def append(self, user_id: str, conversation_id: str, messages: List[Message]) -> None:
+        key = f"{user_id}:{conversation_id}"
+        stored = (self._conversations.get(key) or []) + messages
+        self._conversations.set(key, stored[-self.max_messages:])
+
+    async def delete(self, user_id: str, conversation_id: str) -> None:
+        self._conversations.delete(f"{user_id}:{conversation_id}")
+
+class RedisConversationStore:
+    """
+    Conversation store shared between workers, each conversation is a capped
+    Redis list that expires after a period of inactivity. Falls back to an
+    in-process store while Redis is unreachable.
+    """
+
+    def __init__(self, redis_url: str, ttl: int, max_messages: int, fallback: InMemoryConversationStore):
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self.max_messages = max_messages
+        self.fallback = fallback
+        self.redis_client = None
+        self._redis_retry_at = 0.0
+
+    def _redis(self):
+        if time.monotonic() < self._redis_retry_at:
+            return None
+
+        if self.redis_client is None:
+            self.redis_client = aioredis.from_url(self.redis_url)
+
+        return self.redis_client
+
+    def _redis_failed(self, e: Exception) -> None:
+        logger.warning(f"Redis error in conversation store, using local store for {REDIS_RETRY_INTERVAL}s: {str(e)}")
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    @staticmethod
+    def _key(user_id: str, conversation_id: str) -> str:
+        return f"conversation:{user_id}:{conversation_id}"
+
+    async def get(self, user_id: str, conversation_id: str) -> List[Message]:
+        client = self._redis()
+        if client is not None:
+            try:
+                raw = await client.lrange(self._key(user_id, conversation_id), 0, -1)
+                return [json.loads(item) for item in raw]
+            except Exception as e:
+                self._redis_failed(e)
+
+        return await self.fallback.get(user_id, conversation_id)
+
+    async def append(self, user_id: str, conversation_id: str, messages: List[Message]) -> None:
+        client = self._redis()
+        if client is not None:
+            key = self._key(user_id, conversation_id)
+            try:
+                async with client.pipeline(transaction=True) as pipe:
+                    pipe.rpush(key, *[json.dumps(message) for message in messages])
+                    pipe.ltrim(key, -self.max_messages, -1)
+                    pipe.expire(key, self.ttl)
+                    await pipe.execute()
+                return
+            except Exception as e:
+                self._redis_failed(e)
+
+        await self.fallback.append(user_id, conversation_id, messages)
+
+    async def delete(self, user_id: str, conversation_id: str) -> None:
+        await self.fallback.delete(user_id, conversation_id)
+
+        client = self._redis()
+        if client is not None:
+            try:
+                await client.delete(self._key(user_id, conversation_id))
+            except Exception as e:
+                self._redis_failed(e)
+
+def _create_store():
+    local = InMemoryConversationStore(
+        settings.CONVERSATION_CACHE_MAX_SIZE,
+        settings.CONVERSATION_TTL,
+        settings.CONVERSATION_MAX_MESSAGES,
+    )
+    if settings.CONVERSATION_STORE == "redis" and settings.REDIS_URL:
+        return RedisConversationStore(
+            settings.REDIS_URL,
+            settings.CONVERSATION_TTL,
+            settings.CONVERSATION_MAX_MESSAGES,
+            fallback=local,
+        )
+    return local
+
+conversation_store = _create_store()
+
+def _summarize(messages: List[Message]) -> Optional[Message]:
+    text = " ".join(message["content"] for message in messages if message.get("role") == "user")
+    keywords = extract_keywords(text, SUMMARY_KEYWORDS)
+    if not keywords:
+        return None
+
+    return {
+        "role": "system",
+        "content": f"Earlier in this conversation the user talked about: {', '.join(keywords)}.",
+    }
+
+def fit_history_to_budget(history: List[Message], budget: int) -> List[Message]:
+    """
+    Trims a chat history so its estimated size stays within a token budget.
+    System messages and the latest message are always kept; older turns are
+    dropped first and replaced by a one-line keyword summary.
+
+    Args:
+        history: Messages in conversation order, the last one being the new user message
+        budget: Maximum estimated number of tokens for the whole prompt
+
+    Returns:
+        The trimmed history
+    """
+    if sum(estimate_tokens(message) for message in history) <= budget:
+        return history
+
+    system = [message for message in history if message.get("role") == "system"]
+    turns = [message for message in history if message.get("role") != "system"]
+
+    remaining = budget - sum(estimate_tokens(message) for message in system)
+    kept: List[Message] = []
+    # Walk back from the newest turn, the latest message is kept even when it alone exceeds the budget
+    for message in reversed(turns):
+        cost = estimate_tokens(message)
+        if kept and cost > remaining:
+            break
+        kept.append(message)
+        remaining -= cost
+    kept.reverse()
+
+    dropped = turns[:len(turns) - len(kept)]
+    summary = _summarize(dropped)
+    if summary is not None:
+        # Make room for the summary by dropping more of the oldest kept turns if needed
+        while len(kept) > 1 and estimate_tokens(summary) > remaining:
+            remaining += estimate_tokens(kept.pop(0))
+        if estimate_tokens(summary) <= remaining:
+            system.append(summary)
+
+    return system + kept
@@ -0,0 +1,97 @@
+import io
+import csv
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _csv_value(value: Any) -> Any:
+    # Lists such as tags are written as JSON arrays so they survive a round trip through import
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+async def ndjson_chunks(pages: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """
+    Serializes pages of rows as newline-delimited JSON, one chunk per page
+
+    Args:
+        pages: Pages of rows
+
+    Yields:
+        Encoded lines of the page
+    """
+    async for rows in pages:
+        yield "".join(json.dumps(row, default=str) + "\n" for row in rows).encode()
+
+async def csv_chunks(pages: AsyncIterator[List[Dict[str, Any]]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    """
+    Serializes pages of rows as CSV with a header row, one chunk per page
+
+    Args:
+        pages: Pages of rows
+        columns: Columns to write, in order
+
+    Yields:
+        Encoded CSV lines
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    async for rows in pages:
+        writer.writerows([_csv_value(row.get(column)) for column in columns] for row in rows)
+        yield buffer.getvalue().encode()
+        # Reuse one buffer so memory stays bounded by a single page
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """
+    Compresses a byte stream into a gzip file on the fly
+
+    Args:
+        chunks: Uncompressed chunks
+        level: zlib compression level
+
+    Yields:
+        Compressed chunks
+    """
+    # wbits=31 writes a gzip header and trailer instead of a raw zlib stream
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_stream(
+    pages: AsyncIterator[List[Dict[str, Any]]],
+    export_format: str,
+    columns: Sequence[str],
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Builds the response body of an export
+
+    Args:
+        pages: Pages of rows, typically a keyset-paged repository read
+        export_format: 'ndjson' or 'csv'
+        columns: Columns written to CSV
+        compress: Gzip the output
+
+    Returns:
+        Async iterator of body chunks, holding at most one page in memory
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Format must be one of: {', '.join(EXPORT_FORMATS)}")
+
+    chunks = csv_chunks(pages, columns) if export_format == "csv" else ndjson_chunks(pages)
+    return gzip_chunks(chunks) if compress else chunks
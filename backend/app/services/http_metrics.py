@@ -0,0 +1,78 @@
+import time
+import importlib.util
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+def http2_available() -> bool:
+    """
+    Checks whether HTTP/2 support (the optional h2 package) is installed
+
+    Returns:
+        bool: True if httpx can negotiate HTTP/2
+    """
+    return importlib.util.find_spec("h2") is not None
+
+class ConnectionStats:
+    """
+    Connection reuse and setup time counters for a pooled httpx client.
+    Install with `event_hooks=stats.async_hooks()`.
+
+    Each request gets an httpcore trace callback, and the time spent on TCP
+    connect and TLS handshake for that request is stored in
+    `request.extensions["connection_setup_time"]` so callers can separate it
+    from server time.
+    """
+
+    SETUP_EVENTS = ("connection.connect_tcp", "connection.start_tls")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.connections_opened = 0
+        self.connect_failures = 0
+        self.total_setup_time = 0.0
+
+    def _record(self, request: httpx.Request, marks: Dict[str, float], event: str) -> None:
+        name, _, phase = event.rpartition(".")
+        if name not in self.SETUP_EVENTS:
+            return
+
+        now = time.perf_counter()
+        if phase == "started":
+            marks[name] = now
+            return
+
+        elapsed = now - marks.pop(name, now)
+        self.total_setup_time += elapsed
+        request.extensions["connection_setup_time"] = request.extensions.get("connection_setup_time", 0.0) + elapsed
+
+        if name == "connection.connect_tcp":
+            if phase == "complete":
+                self.connections_opened += 1
+            else:
+                self.connect_failures += 1
+
+    async def _on_request_async(self, request: httpx.Request) -> None:
+        self.requests += 1
+        request.extensions["connection_setup_time"] = 0.0
+        marks: Dict[str, float] = {}
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            self._record(request, marks, event)
+
+        request.extensions["trace"] = trace
+
+    def async_hooks(self) -> Dict[str, List[Callable]]:
+        return {"request": [self._on_request_async]}
+
+    def stats(self) -> Dict[str, Any]:
+        reused = max(self.requests - self.connections_opened, 0)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": reused,
+            "connect_failures": self.connect_failures,
+            "reuse_ratio": round(reused / self.requests, 4) if self.requests else 0.0,
+            "avg_setup_ms": round(self.total_setup_time / self.connections_opened * 1000, 2) if self.connections_opened else 0.0,
+        }
@@ -0,0 +1,240 @@
+import csv
+import json
+import zlib
+import codecs
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from postgrest.exceptions import APIError
+from pydantic import BaseModel, ValidationError
+
+from app.services.export import EXPORT_FORMATS
+
+# A record is a parsed row, or an error message for a row that could not be parsed
+Record = Tuple[int, Union[Dict[str, Any], str]]
+
+def resolve_format(import_format: Optional[str], content_type: Optional[str]) -> str:
+    """
+    Picks the import format from the format parameter or the Content-Type header
+
+    Raises:
+        ValueError: If neither names a supported format
+    """
+    if import_format:
+        if import_format not in EXPORT_FORMATS:
+            raise ValueError(f"Format must be one of: {', '.join(EXPORT_FORMATS)}")
+        return import_format
+
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in ("text/csv", "application/csv"):
+        return "csv"
+    if media_type in ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines"):
+        return "ndjson"
+    raise ValueError("Pass format=csv or format=ndjson, or a text/csv or application/x-ndjson Content-Type")
+
+async def gunzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Decompresses a gzip-encoded request body on the fly
+
+    Raises:
+        ValueError: If the body is not valid gzip
+    """
+    decompressor = zlib.decompressobj(31)
+    try:
+        async for chunk in chunks:
+            data = decompressor.decompress(chunk)
+            if data:
+                yield data
+        data = decompressor.flush()
+    except zlib.error as e:
+        raise ValueError(f"Invalid gzip body: {str(e)}")
+    if data:
+        yield data
+
+async def _line_batches(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[str]]:
+    # Decoding is incremental so multi-byte characters may span chunks; a BOM is dropped
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+
+    async for chunk in chunks:
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        pending = lines.pop()
+        if lines:
+            yield lines
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield [pending]
+
+async def _ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    row = 0
+    async for lines in _line_batches(chunks):
+        for line in lines:
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield row, f"Invalid JSON: {str(e)}"
+                continue
+            if not isinstance(record, dict):
+                yield row, "Expected a JSON object"
+                continue
+            yield row, record
+
+async def _csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    header: Optional[List[str]] = None
+    partial: Optional[str] = None
+    row = 0
+
+    async for lines in _line_batches(chunks):
+        complete = []
+        for line in lines:
+            if partial is not None:
+                line = f"{partial}\n{line}"
+                partial = None
+            # An odd number of quotes means a quoted field continues on the next line
+            if line.count('"') % 2:
+                partial = line
+            else:
+                complete.append(line)
+
+        for values in csv.reader(complete):
+            if not values:
+                continue
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            row += 1
+            if len(values) != len(header):
+                yield row, f"Expected {len(header)} columns, got {len(values)}"
+                continue
+            # Empty cells are missing values, not empty strings
+            yield row, {name: value for name, value in zip(header, values) if value != ""}
+
+    if partial is not None:
+        yield row + 1, "Unterminated quoted field"
+
+def read_records(chunks: AsyncIterator[bytes], import_format: str, gzipped: bool = False) -> AsyncIterator[Record]:
+    """
+    Parses a streamed CSV or NDJSON body one record at a time
+
+    Args:
+        chunks: Raw body chunks
+        import_format: 'csv' (with a header row) or 'ndjson'
+        gzipped: The body is gzip-encoded
+
+    Returns:
+        Async iterator of (row number, record or error message)
+    """
+    if gzipped:
+        chunks = gunzip_chunks(chunks)
+    return _csv_records(chunks) if import_format == "csv" else _ndjson_records(chunks)
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()]
+
+def _is_row_error(error: Exception) -> bool:
+    # SQLSTATE classes 22 (data exception) and 23 (integrity constraint violation) come from a row's values
+    return isinstance(error, APIError) and (error.code or "")[:2] in ("22", "23")
+
+def _error_message(error: Exception) -> str:
+    return error.message if isinstance(error, APIError) and error.message else str(error)
+
+class _ImportStopped(Exception):
+    """Raised inside import_records to stop reading records after a batch-level failure"""
+
+async def import_records(
+    records: AsyncIterator[Record],
+    schema: Type[BaseModel],
+    to_row: Callable[[Any], Dict[str, Any]],
+    insert_batch: Callable[[List[Dict[str, Any]]], Awaitable[List[Dict[str, Any]]]],
+    batch_size: int,
+    json_fields: Sequence[str] = (),
+    max_errors: int = 100,
+    on_inserted: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """
+    Validates records against a schema and inserts the valid ones in batches.
+    Invalid rows are reported and skipped without aborting the import, as are
+    rows the database rejects, which are isolated by splitting the failing batch.
+    Any other insert failure, e.g. a connection error or a 5xx, stops the import.
+
+    Args:
+        records: Parsed records, e.g. from read_records
+        schema: Pydantic model each record must satisfy
+        to_row: Builds the database row from a validated model
+        insert_batch: Inserts a list of rows, returning the created rows
+        batch_size: Rows per insert
+        json_fields: List fields that CSV carries as JSON arrays
+        max_errors: Row errors kept for the response, the rest are only counted
+        on_inserted: Called with the created rows of each batch
+
+    Returns:
+        {"imported", "failed", "errors", "stopped_at"}, errors being {"row", "errors"}
+        dicts and stopped_at the first row not imported when the import stopped
+    """
+    result: Dict[str, Any] = {"imported": 0, "failed": 0, "errors": [], "stopped_at": None}
+    batch: List[Dict[str, Any]] = []
+    batch_rows: List[int] = []
+
+    def fail(row: int, messages: List[str]) -> None:
+        result["failed"] += 1
+        if len(result["errors"]) < max_errors:
+            result["errors"].append({"row": row, "errors": messages})
+
+    async def insert(rows: List[Dict[str, Any]], row_numbers: List[int]) -> None:
+        try:
+            created = await insert_batch(rows)
+        except Exception as e:
+            if not _is_row_error(e):
+                # Not caused by a row, so retrying parts of the batch would only repeat it
+                result["stopped_at"] = row_numbers[0]
+                result["errors"].append({"row": row_numbers[0], "errors": [f"Insert failed, import stopped: {_error_message(e)}"]})
+                raise _ImportStopped()
+            if len(rows) == 1:
+                fail(row_numbers[0], [f"Insert failed: {_error_message(e)}"])
+                return
+            # A batch insert is all or nothing, so bisect it to insert the rows that are fine
+            # and report only the ones that fail on their own
+            middle = len(rows) // 2
+            await insert(rows[:middle], row_numbers[:middle])
+            await insert(rows[middle:], row_numbers[middle:])
+        else:
+            result["imported"] += len(created)
+            if on_inserted is not None and created:
+                await on_inserted(created)
+
+    async def flush() -> None:
+        await insert(batch, batch_rows)
+        batch.clear()
+        batch_rows.clear()
+
+    try:
+        async for row, record in records:
+            if isinstance(record, str):
+                fail(row, [record])
+                continue
+
+            try:
+                for field in json_fields:
+                    if isinstance(record.get(field), str):
+                        record[field] = json.loads(record[field])
+                model = schema(**record)
+            except ValueError as e:
+                # ValidationError is a ValueError, as is a malformed JSON array
+                fail(row, _validation_messages(e) if isinstance(e, ValidationError) else [f"Invalid JSON array: {str(e)}"])
+                continue
+
+            batch.append(to_row(model))
+            batch_rows.append(row)
+            if len(batch) >= batch_size:
+                await flush()
+
+        if batch:
+            await flush()
+    except _ImportStopped:
+        # Rows from stopped_at on are not imported, the client can resume from there
+        pass
+
+    return result
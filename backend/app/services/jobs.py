@@ -0,0 +1,315 @@
+import os
+import json
+import time
+import uuid
+import socket
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import redis.asyncio as aioredis
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+FailureHandler = Callable[[Dict[str, Any], Exception], Awaitable[None]]
+
+# A consumer whose heartbeat is older than this is presumed dead and its jobs are requeued
+HEARTBEAT_TTL = 30
+MAINTENANCE_INTERVAL = 1.0
+DEAD_LETTER_MAX = 1000
+
+class JobQueue:
+    """
+    Async background job queue with a fixed number of workers.
+
+    In memory mode jobs live in an asyncio queue and are lost on restart,
+    which is fine for development. In Redis mode jobs are durable: workers
+    atomically move each job to a per-process processing list while it runs,
+    so jobs held by a crashed process are requeued once its heartbeat expires.
+    Failed jobs are retried with exponential backoff up to max_attempts.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        redis_url: Optional[str] = None,
+        workers: int = 4,
+        max_attempts: int = 3,
+        retry_delay: float = 5.0,
+        shutdown_timeout: float = 10.0,
+    ):
+        """
+        Initialize the queue
+
+        Args:
+            name: Queue name, used as the Redis key prefix
+            redis_url: Redis connection URL, jobs are kept in memory when empty
+            workers: Number of jobs processed concurrently by this process
+            max_attempts: Attempts per job before it is given up
+            retry_delay: Delay before the first retry in seconds, doubled per attempt
+            shutdown_timeout: Seconds running jobs get to finish on shutdown
+        """
+        self.name = name
+        self.redis_url = redis_url
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.shutdown_timeout = shutdown_timeout
+        self.redis_client = None
+
+        self.consumer_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._failure_handlers: Dict[str, FailureHandler] = {}
+        self._local: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+
+        self.enqueued = 0
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+        self.in_flight = 0
+
+    @property
+    def durable(self) -> bool:
+        return bool(self.redis_url)
+
+    def _key(self, suffix: str) -> str:
+        return f"jobs:{self.name}:{suffix}"
+
+    def _redis(self):
+        if self.redis_client is None:
+            self.redis_client = aioredis.from_url(self.redis_url)
+        return self.redis_client
+
+    def _local_queue(self) -> asyncio.Queue:
+        if self._local is None:
+            self._local = asyncio.Queue()
+        return self._local
+
+    def register(self, job_type: str, handler: JobHandler, on_failure: Optional[FailureHandler] = None) -> None:
+        """
+        Registers the coroutine that processes a job type
+
+        Args:
+            job_type: Name of the job type
+            handler: Called with the job payload, raising marks the attempt as failed
+            on_failure: Called with the payload and last error once all attempts failed
+        """
+        self._handlers[job_type] = handler
+        if on_failure is not None:
+            self._failure_handlers[job_type] = on_failure
+
+    async def enqueue(self, job_type: str, payload: Dict[str, Any]) -> str:
+        """
+        Adds a job to the queue
+
+        Args:
+            job_type: Registered job type
+            payload: JSON-serializable job arguments
+
+        Returns:
+            The job id
+        """
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job = {"id": uuid.uuid4().hex, "type": job_type, "payload": payload, "attempts": 0}
+        self.enqueued += 1
+
+        if self.durable:
+            try:
+                await self._redis().lpush(self._key("pending"), json.dumps(job))
+                return job["id"]
+            except Exception as e:
+                logger.warning(f"Failed to enqueue {job_type} job in Redis, running it in process: {str(e)}")
+
+        self._local_queue().put_nowait(job)
+        return job["id"]
+
+    async def start(self) -> None:
+        """
+        Starts the workers, called on application startup
+        """
+        if self._tasks:
+            return
+
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._local_worker()) for _ in range(self.workers)]
+        if self.durable:
+            self._tasks += [asyncio.create_task(self._redis_worker()) for _ in range(self.workers)]
+            self._tasks.append(asyncio.create_task(self._maintenance()))
+
+        logger.info(f"Started {self.workers} {self.name} workers ({'redis' if self.durable else 'memory'} mode)")
+
+    async def stop(self) -> None:
+        """
+        Stops the workers, letting running jobs finish within the shutdown timeout
+        """
+        if not self._tasks:
+            return
+
+        self._stopping = True
+        _, pending = await asyncio.wait(self._tasks, timeout=self.shutdown_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.delete(self._key(f"alive:{self.consumer_id}"))
+                await self.redis_client.close()
+            except Exception:
+                pass
+            self.redis_client = None
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        handler = self._handlers.get(job["type"])
+        if handler is None:
+            logger.error(f"Dropping {self.name} job {job['id']} of unknown type {job['type']}")
+            return
+
+        job["attempts"] += 1
+        self.in_flight += 1
+        try:
+            await handler(job["payload"])
+            self.processed += 1
+        except Exception as e:
+            await self._handle_failure(job, e)
+        finally:
+            self.in_flight -= 1
+
+    async def _handle_failure(self, job: Dict[str, Any], error: Exception) -> None:
+        if job["attempts"] < self.max_attempts:
+            delay = self.retry_delay * (2 ** (job["attempts"] - 1))
+            logger.warning(f"{job['type']} job {job['id']} failed (attempt {job['attempts']}), retrying in {delay:.1f}s: {str(error)}")
+            self.retried += 1
+            await self._schedule_retry(job, delay)
+            return
+
+        logger.error(f"{job['type']} job {job['id']} failed after {job['attempts']} attempts: {str(error)}")
+        self.failed += 1
+
+        if self.durable:
+            try:
+                async with self._redis().pipeline(transaction=False) as pipe:
+                    pipe.lpush(self._key("dead"), json.dumps({**job, "error": str(error)}))
+                    pipe.ltrim(self._key("dead"), 0, DEAD_LETTER_MAX - 1)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Failed to record dead {self.name} job: {str(e)}")
+
+        on_failure = self._failure_handlers.get(job["type"])
+        if on_failure is not None:
+            try:
+                await on_failure(job["payload"], error)
+            except Exception as e:
+                logger.exception(f"Failure handler for {job['type']} job {job['id']} raised: {str(e)}")
+
+    async def _schedule_retry(self, job: Dict[str, Any], delay: float) -> None:
+        if self.durable:
+            try:
+                await self._redis().zadd(self._key("delayed"), {json.dumps(job): time.time() + delay})
+                return
+            except Exception as e:
+                logger.warning(f"Failed to schedule {self.name} retry in Redis, retrying in process: {str(e)}")
+
+        asyncio.get_running_loop().call_later(delay, self._local_queue().put_nowait, job)
+
+    async def _local_worker(self) -> None:
+        queue = self._local_queue()
+        while not (self._stopping and queue.empty()):
+            try:
+                job = await asyncio.wait_for(queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            await self._run(job)
+
+    async def _redis_worker(self) -> None:
+        pending = self._key("pending")
+        processing = self._key(f"processing:{self.consumer_id}")
+
+        while not self._stopping:
+            try:
+                raw = await self._redis().blmove(pending, processing, 1, src="RIGHT", dest="LEFT")
+                if raw is None:
+                    continue
+
+                await self._run(json.loads(raw))
+                await self._redis().lrem(processing, 1, raw)
+            except Exception as e:
+                logger.warning(f"{self.name} worker error: {str(e)}")
+                await asyncio.sleep(MAINTENANCE_INTERVAL)
+
+    async def _maintenance(self) -> None:
+        alive = self._key(f"alive:{self.consumer_id}")
+        last_recovery = 0.0
+
+        while not self._stopping:
+            try:
+                client = self._redis()
+                await client.set(alive, "1", ex=HEARTBEAT_TTL)
+                await self._promote_due_retries(client)
+
+                if time.monotonic() - last_recovery > HEARTBEAT_TTL / 3:
+                    last_recovery = time.monotonic()
+                    await self._recover_orphans(client)
+            except Exception as e:
+                logger.warning(f"{self.name} queue maintenance error: {str(e)}")
+
+            await asyncio.sleep(MAINTENANCE_INTERVAL)
+
+    async def _promote_due_retries(self, client) -> None:
+        delayed = self._key("delayed")
+        for raw in await client.zrangebyscore(delayed, 0, time.time(), start=0, num=100):
+            # Only the process that removes the entry requeues it
+            if await client.zrem(delayed, raw):
+                await client.lpush(self._key("pending"), raw)
+
+    async def _recover_orphans(self, client) -> None:
+        prefix = self._key("processing:")
+        async for key in client.scan_iter(match=f"{prefix}*"):
+            consumer = key.decode()[len(prefix):]
+            if consumer == self.consumer_id or await client.exists(self._key(f"alive:{consumer}")):
+                continue
+
+            recovered = 0
+            while await client.lmove(key, self._key("pending"), "RIGHT", "LEFT") is not None:
+                recovered += 1
+            if recovered:
+                logger.warning(f"Requeued {recovered} {self.name} jobs from dead consumer {consumer}")
+
+    async def stats(self) -> Dict[str, Any]:
+        stats = {
+            "mode": "redis" if self.durable else "memory",
+            "workers": self.workers,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "queued_in_process": self._local.qsize() if self._local is not None else 0,
+        }
+
+        if self.durable:
+            try:
+                client = self._redis()
+                stats["queued"] = await client.llen(self._key("pending"))
+                stats["delayed"] = await client.zcard(self._key("delayed"))
+                stats["dead"] = await client.llen(self._key("dead"))
+            except Exception as e:
+                logger.warning(f"Failed to read {self.name} queue stats: {str(e)}")
+
+        return stats
+
+job_queue = JobQueue(
+    "background",
+    redis_url=settings.REDIS_URL if settings.JOB_QUEUE_BACKEND == "redis" else None,
+    workers=settings.JOB_WORKERS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_delay=settings.JOB_RETRY_DELAY,
+)
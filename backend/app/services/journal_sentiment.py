@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.repositories.journals import journal_repository
+from app.services.ai import analyze_sentiment, active_sentiment_model, content_fingerprint
+from app.services.jobs import job_queue
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPE = "journal_sentiment"
+BATCH_JOB_TYPE = "journal_sentiment_batch"
+
+# Values of journal_entries.sentiment_status
+SENTIMENT_PENDING = "pending"
+SENTIMENT_DONE = "done"
+SENTIMENT_FAILED = "failed"
+
+def is_analysis_current(entry: Dict[str, Any]) -> bool:
+    """
+    Whether the persisted analysis of an entry matches its content and the active model
+    
+    Args:
+        entry: Journal entry row
+        
+    Returns:
+        True if the stored analysis can be served as is
+    """
+    return (
+        entry.get("sentiment_score") is not None
+        and entry.get("sentiment_label") is not None
+        and entry.get("content_hash") == content_fingerprint(entry["content"])
+        and entry.get("sentiment_model") == active_sentiment_model()
+    )
+
+def analysis_fields(content: str, sentiment_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "sentiment_score": sentiment_data["score"],
+        "sentiment_label": sentiment_data["label"],
+        "keywords": sentiment_data["keywords"],
+        "suggestions": sentiment_data.get("suggestions"),
+        "sentiment_model": sentiment_data["model"],
+        "content_hash": content_fingerprint(content),
+        "analyzed_at": datetime.utcnow().isoformat(),
+        "sentiment_status": SENTIMENT_DONE
+    }
+
+def analysis_update(entry: Dict[str, Any], sentiment_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds the bulk_update_journal_sentiment row for an entry's analysis,
+    written only if the entry still has the content that was analyzed
+    
+    Args:
+        entry: Journal entry row the analysis was computed from
+        sentiment_data: Result of analyze_sentiment for its content
+        
+    Returns:
+        The entry id, the md5 of the analyzed content (matched by the
+        database against md5(content)) and the analysis columns
+    """
+    return {
+        "id": entry["id"],
+        "content_md5": hashlib.md5(entry["content"].encode()).hexdigest(),
+        **analysis_fields(entry["content"], sentiment_data)
+    }
+
+async def ensure_analysis(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Returns the entry with an up-to-date analysis, analyzing and persisting
+    it only when the content fingerprint or the model has changed
+    
+    Args:
+        entry: Journal entry row
+        
+    Returns:
+        The entry including its analysis columns, or None if analysis failed
+    """
+    if is_analysis_current(entry):
+        return entry
+    
+    sentiment_data = await analyze_sentiment(entry["content"])
+    if not sentiment_data:
+        return None
+    
+    fields = analysis_fields(entry["content"], sentiment_data)
+    if not await journal_repository.bulk_update_analysis([analysis_update(entry, sentiment_data)]):
+        # Edited (or deleted) while it was analyzed, the entry stays pending for the job queued by the edit
+        logger.info(f"Journal entry {entry['id']} changed during sentiment analysis, result not stored")
+        return {**entry, **fields, "sentiment_status": SENTIMENT_PENDING}
+    return {**entry, **fields}
+
+async def _analyze_entry(payload: Dict[str, Any]) -> None:
+    entry_id = payload["entry_id"]
+    
+    # Read the entry when the job runs so the latest content is scored
+    entry = await journal_repository.get_by_id(entry_id)
+    if entry is None:
+        logger.info(f"Journal entry {entry_id} was deleted before its sentiment was analyzed")
+        return
+    
+    if is_analysis_current(entry):
+        if entry.get("sentiment_status") != SENTIMENT_DONE:
+            await journal_repository.update(entry_id, {"sentiment_status": SENTIMENT_DONE})
+        return
+    
+    if await ensure_analysis(entry) is None:
+        raise RuntimeError("Sentiment analysis failed")
+
+async def _mark_failed(payload: Dict[str, Any], error: Exception) -> None:
+    await journal_repository.update(payload["entry_id"], {"sentiment_status": SENTIMENT_FAILED})
+
+job_queue.register(JOB_TYPE, _analyze_entry, on_failure=_mark_failed)
+
+async def enqueue_journal_sentiment(entry_id: str) -> None:
+    """
+    Queues sentiment analysis of a journal entry, the analysis columns and
+    sentiment_status are filled in when the job completes
+    
+    Args:
+        entry_id: ID of the journal entry
+    """
+    await job_queue.enqueue(JOB_TYPE, {"entry_id": str(entry_id)})
+
+async def _analyze_batch(payload: Dict[str, Any]) -> None:
+    entries = await journal_repository.get_many(payload["entry_ids"])
+    stale = [entry for entry in entries if not is_analysis_current(entry)]
+    if not stale:
+        return
+    
+    # Concurrent calls are coalesced into batched inference requests by the sentiment batcher
+    results = await asyncio.gather(*(analyze_sentiment(entry["content"]) for entry in stale), return_exceptions=True)
+    updates = [
+        analysis_update(entry, result)
+        for entry, result in zip(stale, results)
+        if result and not isinstance(result, Exception)
+    ]
+    await journal_repository.bulk_update_analysis(updates)
+    
+    # A retry only re-analyzes the entries that are still stale
+    if len(updates) < len(stale):
+        raise RuntimeError(f"Sentiment analysis failed for {len(stale) - len(updates)} of {len(stale)} entries")
+
+async def _mark_batch_failed(payload: Dict[str, Any], error: Exception) -> None:
+    await journal_repository.set_status_where_pending(payload["entry_ids"], SENTIMENT_FAILED)
+
+job_queue.register(BATCH_JOB_TYPE, _analyze_batch, on_failure=_mark_batch_failed)
+
+async def enqueue_journal_sentiment_batch(entry_ids: List[str]) -> None:
+    """
+    Queues sentiment analysis of many journal entries as one job, written
+    back in a single bulk update
+    
+    Args:
+        entry_ids: IDs of the journal entries
+    """
+    if entry_ids:
+        await job_queue.enqueue(BATCH_JOB_TYPE, {"entry_ids": [str(entry_id) for entry_id in entry_ids]})
@@ -0,0 +1,113 @@
+import re
+import unicodedata
+from typing import Dict, List
+
+import numpy as np
+
+STOPWORDS = frozenset({
+    "i", "me", "my", "myself", "we", "our", "ours", "ourselves", "you",
+    "your", "yours", "yourself", "yourselves", "he", "him", "his", "himself",
+    "she", "her", "hers", "herself", "it", "its", "itself", "they", "them",
+    "their", "theirs", "themselves", "what", "which", "who", "whom", "this",
+    "that", "these", "those", "am", "is", "are", "was", "were", "be", "been",
+    "being", "have", "has", "had", "having", "do", "does", "did", "doing",
+    "a", "an", "the", "and", "but", "if", "or", "because", "as", "until",
+    "while", "of", "at", "by", "for", "with", "about", "against", "between",
+    "into", "through", "during", "before", "after", "above", "below", "to",
+    "from", "up", "down", "in", "out", "on", "off", "over", "under", "again",
+    "further", "then", "once", "here", "there", "when", "where", "why", "how",
+    "all", "any", "both", "each", "few", "more", "most", "other", "some", "such",
+    "no", "nor", "not", "only", "own", "same", "so", "than", "too", "very", "s",
+    "t", "can", "will", "just", "don", "should", "now",
+    # Contractions and filler common in journal entries
+    "i'm", "i've", "i'll", "i'd", "it's", "that's", "don't", "didn't", "doesn't",
+    "can't", "couldn't", "won't", "wouldn't", "isn't", "wasn't", "aren't", "weren't",
+    "also", "really", "would", "could", "still", "even", "much", "like", "today",
+    "yesterday", "something", "things", "thing", "maybe", "getting", "going",
+})
+
+# Letters of any script, so accented and non-Latin words are kept
+_TOKEN_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+# Words within this distance of each other in the filtered sequence are linked
+WINDOW_SIZE = 4
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-4
+
+def _normalize(text: str) -> str:
+    # NFC keeps accented words in one token, and curly apostrophes match the stopword contractions
+    return unicodedata.normalize("NFC", text).lower().replace("\u2019", "'")
+
+def _candidates(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(_normalize(text)) if len(token) > 3 and token not in STOPWORDS]
+
+def extract_keywords(text: str, max_keywords: int = 5) -> List[str]:
+    """
+    Extracts keywords with TextRank over a word co-occurrence graph
+
+    Args:
+        text: The text to extract keywords from
+        max_keywords: Maximum number of keywords to extract
+
+    Returns:
+        List of extracted keywords, most important first
+    """
+    tokens = _candidates(text)
+    if not tokens:
+        return []
+
+    # Ids in order of first occurrence, so ties keep reading order
+    vocabulary: Dict[str, int] = {}
+    ids = np.fromiter((vocabulary.setdefault(token, len(vocabulary)) for token in tokens), dtype=np.int64, count=len(tokens))
+    size = len(vocabulary)
+    words = list(vocabulary)
+
+    if size == 1:
+        return words
+
+    # Undirected co-occurrence edges weighted by how often the pair appears within the window
+    sources = []
+    targets = []
+    for offset in range(1, min(WINDOW_SIZE, len(ids))):
+        sources.append(ids[:-offset])
+        targets.append(ids[offset:])
+    src = np.concatenate(sources + targets)
+    dst = np.concatenate(targets + sources)
+    distinct = src != dst
+    pairs, weights = np.unique(src[distinct] * size + dst[distinct], return_counts=True)
+
+    if len(pairs) == 0:
+        counts = np.bincount(ids, minlength=size)
+        order = np.argsort(-counts, kind="stable")
+        return [words[i] for i in order[:max_keywords]]
+
+    src = pairs // size
+    dst = pairs % size
+    weights = weights.astype(np.float64)
+    out_weight = np.bincount(src, weights=weights, minlength=size)
+    transition = weights / out_weight[src]
+
+    scores = np.ones(size)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) + DAMPING * np.bincount(dst, weights=scores[src] * transition, minlength=size)
+        converged = np.abs(updated - scores).max() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+
+    order = np.argsort(-scores, kind="stable")
+    return [words[i] for i in order[:max_keywords]]
+
+def extract_keywords_batch(texts: List[str], max_keywords: int = 5) -> List[List[str]]:
+    """
+    Extracts keywords for many texts in one call
+
+    Args:
+        texts: The texts to extract keywords from
+        max_keywords: Maximum number of keywords per text
+
+    Returns:
+        One keyword list per text, in input order
+    """
+    return [extract_keywords(text, max_keywords) for text in texts]
@@ -0,0 +1,156 @@
+import re
+import unicodedata
+from typing import Any, Dict, List
+
+import numpy as np
+
+LEXICON_MODEL = "lexicon-v2"
+
+# Word valence in [-1, 1], tuned towards the vocabulary of mood journals
+_LEXICON: Dict[str, float] = {
+    # Positive
+    "happy": 0.8, "happier": 0.8, "happiest": 0.9, "happiness": 0.8, "joy": 0.9, "joyful": 0.9,
+    "glad": 0.6, "good": 0.5, "great": 0.8, "better": 0.5, "best": 0.8, "fine": 0.3, "okay": 0.2,
+    "calm": 0.6, "calmer": 0.6, "relaxed": 0.7, "relaxing": 0.6, "peaceful": 0.8, "peace": 0.7,
+    "content": 0.5, "hopeful": 0.7, "hope": 0.5, "optimistic": 0.7, "grateful": 0.8, "thankful": 0.8,
+    "gratitude": 0.8, "love": 0.8, "loved": 0.8, "loving": 0.7, "proud": 0.7, "confident": 0.7,
+    "excited": 0.7, "exciting": 0.6, "energized": 0.6, "motivated": 0.6, "productive": 0.5,
+    "rested": 0.5, "safe": 0.5, "secure": 0.5, "supported": 0.6, "accomplished": 0.7, "progress": 0.4,
+    "enjoy": 0.6, "enjoyed": 0.6, "fun": 0.6, "laugh": 0.6, "laughed": 0.6, "smile": 0.6, "smiled": 0.6,
+    "wonderful": 0.9, "amazing": 0.9, "awesome": 0.8, "nice": 0.4, "positive": 0.6, "improved": 0.5,
+    "improving": 0.5, "strong": 0.4, "kind": 0.5, "comfortable": 0.5, "relief": 0.6, "relieved": 0.6,
+    "success": 0.7, "successful": 0.7, "beautiful": 0.7, "healthy": 0.5, "energetic": 0.6,
+    # Negative
+    "sad": -0.7, "sadness": -0.7, "unhappy": -0.7, "depressed": -0.9, "depression": -0.8,
+    "anxious": -0.7, "anxiety": -0.7, "worried": -0.6, "worry": -0.5, "worrying": -0.6, "nervous": -0.5,
+    "stressed": -0.7, "stress": -0.6, "stressful": -0.6, "overwhelmed": -0.8, "overwhelming": -0.7,
+    "panic": -0.9, "scared": -0.7, "afraid": -0.7, "fear": -0.7, "terrified": -0.9, "angry": -0.7,
+    "anger": -0.7, "mad": -0.5, "frustrated": -0.6, "frustrating": -0.6, "annoyed": -0.4,
+    "irritated": -0.5, "lonely": -0.7, "alone": -0.4, "isolated": -0.6, "tired": -0.4,
+    "exhausted": -0.7, "drained": -0.6, "hopeless": -0.9, "helpless": -0.8, "worthless": -0.9,
+    "guilty": -0.6, "guilt": -0.6, "ashamed": -0.7, "shame": -0.7, "hurt": -0.6, "pain": -0.6,
+    "painful": -0.6, "cry": -0.6, "cried": -0.6, "crying": -0.6, "tears": -0.5, "bad": -0.6,
+    "worse": -0.6, "worst": -0.8, "awful": -0.8, "terrible": -0.8, "horrible": -0.8, "miserable": -0.9,
+    "upset": -0.6, "difficult": -0.4, "hard": -0.3, "struggle": -0.5, "struggling": -0.6,
+    "restless": -0.4, "insomnia": -0.5, "sick": -0.5, "ill": -0.4, "failed": -0.6, "failure": -0.7,
+    "disappointed": -0.6, "disappointing": -0.6, "negative": -0.5, "numb": -0.5, "empty": -0.6,
+    "broken": -0.7, "crisis": -0.8, "tense": -0.5, "uneasy": -0.5, "dread": -0.8, "hate": -0.8,
+}
+
+_NEGATORS = frozenset({
+    "not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "without", "hardly",
+    "isn't", "wasn't", "aren't", "weren't", "don't", "doesn't", "didn't", "can't", "couldn't",
+    "won't", "wouldn't", "shouldn't", "haven't", "hasn't", "hadn't", "cannot",
+})
+
+_INTENSIFIERS = frozenset({
+    "very", "really", "so", "extremely", "incredibly", "totally", "completely", "deeply",
+    "super", "absolutely", "too", "quite",
+})
+
+# Words that end the clause a negation applies to
+_CLAUSE_BREAKS = frozenset({"but", "however", "although", "though"})
+
+# Punctuation is kept as a token of its own since it also ends a negation
+_TOKEN_RE = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?|[.,;:!?]")
+
+# Normalization constant mapping the summed valence onto [-1, 1]
+_ALPHA = 4.0
+_NEGATION_FACTOR = -0.75
+# Tokens after a negator that it still applies to, e.g. "not feeling very happy"
+_NEGATION_SCOPE = 3
+_INTENSIFIER_FACTOR = 1.5
+
+def _normalize(text: str) -> str:
+    # NFC keeps accented words whole, and folding curly apostrophes lets "don’t" count as a negator
+    return unicodedata.normalize("NFC", text).lower().replace("\u2019", "'")
+
+class LexiconSentimentScorer:
+    """
+    Fast in-process sentiment scorer based on a word valence lexicon.
+    Scores whole batches at once with vectorized NumPy passes and returns
+    predictions in the same shape as the Hugging Face classifier.
+    """
+
+    def __init__(self, lexicon: Dict[str, float] = _LEXICON):
+        self._index = {word: i for i, word in enumerate(lexicon)}
+        self._weights = np.fromiter(lexicon.values(), dtype=np.float64, count=len(lexicon))
+
+    def positive_probability(self, texts: List[str]) -> np.ndarray:
+        """
+        Scores a batch of texts
+
+        Args:
+            texts: Texts to score
+
+        Returns:
+            Array with the probability-like positive score of each text, in [0, 1]
+        """
+        if not texts:
+            return np.zeros(0)
+
+        tokens: List[str] = []
+        doc_lengths = np.empty(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            doc_tokens = _TOKEN_RE.findall(_normalize(text))
+            tokens.extend(doc_tokens)
+            doc_lengths[i] = len(doc_tokens)
+
+        if not tokens:
+            return np.full(len(texts), 0.5)
+
+        doc_ids = np.repeat(np.arange(len(texts)), doc_lengths)
+        word_ids = np.fromiter((self._index.get(token, -1) for token in tokens), dtype=np.int64, count=len(tokens))
+        negators = np.fromiter((token in _NEGATORS for token in tokens), dtype=bool, count=len(tokens))
+        intensifiers = np.fromiter((token in _INTENSIFIERS for token in tokens), dtype=bool, count=len(tokens))
+
+        breaks = np.fromiter(
+            (token in _CLAUSE_BREAKS or not token[0].isalpha() for token in tokens), dtype=bool, count=len(tokens)
+        )
+
+        # Intensifiers apply to the next token within the same text
+        same_doc = np.zeros(len(tokens), dtype=bool)
+        same_doc[1:] = doc_ids[1:] == doc_ids[:-1]
+
+        # Negators apply to the next few tokens, unless the clause or text ends first.
+        # The first token of a text counts as a break, so a negator there can still start a scope
+        positions = np.arange(len(tokens))
+        last_negator = np.maximum.accumulate(np.where(negators, positions, -1))
+        last_break = np.maximum.accumulate(np.where(breaks | ~same_doc, positions, -1))
+        distance = positions - last_negator
+        negated = (last_negator >= last_break) & (distance >= 1) & (distance <= _NEGATION_SCOPE)
+
+        intensified = np.zeros(len(tokens), dtype=bool)
+        intensified[1:] = intensifiers[:-1]
+        intensified &= same_doc
+
+        known = word_ids >= 0
+        valence = np.where(known, self._weights[np.where(known, word_ids, 0)], 0.0)
+        valence *= np.where(negated, _NEGATION_FACTOR, 1.0)
+        valence *= np.where(intensified, _INTENSIFIER_FACTOR, 1.0)
+
+        totals = np.bincount(doc_ids, weights=valence, minlength=len(texts))
+        normalized = totals / np.sqrt(totals * totals + _ALPHA)
+        return (normalized + 1.0) / 2.0
+
+    def score_batch(self, texts: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Scores a batch of texts
+
+        Args:
+            texts: Texts to score
+
+        Returns:
+            One list of {"label", "score"} predictions per text, highest score first
+        """
+        predictions = []
+        for positive in self.positive_probability(texts).tolist():
+            pair = [
+                {"label": "POSITIVE", "score": round(positive, 4)},
+                {"label": "NEGATIVE", "score": round(1.0 - positive, 4)},
+            ]
+            pair.sort(key=lambda item: item["score"], reverse=True)
+            predictions.append(pair)
+        return predictions
+
+lexicon_scorer = LexiconSentimentScorer()
@@ -0,0 +1,224 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+ROLLING_WINDOWS = (7, 30)
+PERCENTILES = (10, 25, 75, 90)
+DEFAULT_EWMA_SPAN = 7
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# The EWMA recurrence is solved in closed form per block; blocks keep the decay powers within float range
+_EWMA_BLOCK = 64
+
+class MoodSeries:
+    """
+    A user's mood history as parallel NumPy arrays sorted by time.
+    Loaded once per request, every statistic below is a vectorized pass over it.
+    """
+
+    def __init__(self, timestamps: np.ndarray, scores: np.ndarray):
+        self.timestamps = timestamps
+        self.scores = scores
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> "MoodSeries":
+        """
+        Builds the series from rows with "timestamp" and "score" columns
+
+        Args:
+            rows: Mood rows in timestamp order, timestamps as UTC ISO strings
+
+        Returns:
+            The mood series
+        """
+        # Timestamps come back from PostgREST in UTC, so the offset suffix can be dropped
+        timestamps = np.array([row["timestamp"][:19] for row in rows], dtype="datetime64[s]")
+        scores = np.fromiter((row["score"] for row in rows), dtype=np.float64, count=len(rows))
+        return cls(timestamps, scores)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def days(self) -> np.ndarray:
+        """Calendar day of each mood, as days since the epoch"""
+        return self.timestamps.astype("datetime64[D]").astype(np.int64)
+
+def _round(values: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(value) else value for value in np.round(values, 2).tolist()]
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+def rolling_mean(sums: np.ndarray, counts: np.ndarray, window: int) -> np.ndarray:
+    """
+    Average over a trailing window of days, weighting each mood equally
+
+    Args:
+        sums: Score sum per consecutive day
+        counts: Mood count per consecutive day
+        window: Window length in days
+
+    Returns:
+        The average of the window ending on each day, NaN when it has no moods
+    """
+    sum_totals = np.concatenate(([0.0], np.cumsum(sums)))
+    count_totals = np.concatenate(([0], np.cumsum(counts)))
+    end = np.arange(1, len(sums) + 1)
+    start = np.maximum(end - window, 0)
+    return _ratio(sum_totals[end] - sum_totals[start], count_totals[end] - count_totals[start])
+
+def ewma(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponentially weighted moving average, y[t] = a * x[t] + (1 - a) * y[t - 1]
+
+    Args:
+        values: Observations in time order
+        span: Smoothing span, a = 2 / (span + 1)
+
+    Returns:
+        The smoothed series, starting at the first observation
+    """
+    alpha = 2.0 / (span + 1)
+    decay = 1.0 - alpha
+    out = np.empty(len(values))
+    if len(values) == 0:
+        return out
+
+    # Within a block, y[k] = decay^(k+1) * (carry + alpha * sum(x[j] / decay^(j+1) for j <= k))
+    powers = decay ** np.arange(1, _EWMA_BLOCK + 1)
+    carry = values[0]
+    for start in range(0, len(values), _EWMA_BLOCK):
+        block = values[start:start + _EWMA_BLOCK]
+        scale = powers[:len(block)]
+        out[start:start + len(block)] = scale * (carry + alpha * np.cumsum(block / scale))
+        carry = out[start + len(block) - 1]
+
+    return out
+
+def _daily_columns(series: MoodSeries, span: int) -> Dict[str, np.ndarray]:
+    days = series.days
+    offsets = days - days[0]
+    sums = np.bincount(offsets, weights=series.scores)
+    counts = np.bincount(offsets)
+    daily = _ratio(sums, counts)
+
+    # The EWMA advances on days with moods only, gaps carry the last value forward
+    logged = counts > 0
+    smoothed = np.full(len(daily), np.nan)
+    smoothed[logged] = ewma(daily[logged], span)
+    smoothed = smoothed[np.maximum.accumulate(np.where(logged, np.arange(len(daily)), 0))]
+
+    columns = {"count": counts, "average_score": daily, "ewma": smoothed}
+    for window in ROLLING_WINDOWS:
+        columns[f"rolling_{window}"] = rolling_mean(sums, counts, window)
+    return columns
+
+def daily_series(series: MoodSeries, span: int = DEFAULT_EWMA_SPAN) -> List[Dict[str, Any]]:
+    """
+    Per-day averages with rolling averages and an EWMA, from the first to the last mood
+
+    Args:
+        series: The mood series
+        span: EWMA span in days with moods
+
+    Returns:
+        One point per calendar day, days without moods have a null daily average
+    """
+    if len(series) == 0:
+        return []
+
+    columns = _daily_columns(series, span)
+    counts = columns.pop("count")
+    values = {name: _round(column) for name, column in columns.items()}
+    dates = np.datetime_as_string((series.days[0] + np.arange(len(counts))).astype("datetime64[D]")).tolist()
+    count_list = counts.tolist()
+
+    return [
+        {"date": dates[i], "count": count_list[i], **{name: column[i] for name, column in values.items()}}
+        for i in range(len(dates))
+    ]
+
+def trend_slope(series: MoodSeries) -> float:
+    """
+    Least-squares slope of score against time
+
+    Returns:
+        Score change per day, 0 when all moods share a timestamp
+    """
+    elapsed = (series.timestamps - series.timestamps[0]).astype(np.float64) / 86400.0
+    centered = elapsed - elapsed.mean()
+    variance = np.dot(centered, centered)
+    if variance == 0:
+        return 0.0
+    return float(np.dot(centered, series.scores - series.scores.mean()) / variance)
+
+def weekday_profile(series: MoodSeries) -> List[Dict[str, Any]]:
+    """
+    Average score per day of the week (UTC)
+
+    Returns:
+        One entry per weekday starting on Monday
+    """
+    # 1970-01-01 was a Thursday
+    weekdays = (series.days + 3) % 7
+    sums = np.bincount(weekdays, weights=series.scores, minlength=7)
+    counts = np.bincount(weekdays, minlength=7)
+    averages = _round(_ratio(sums, counts))
+    return [
+        {"day": WEEKDAYS[i], "average_score": averages[i], "count": int(counts[i])}
+        for i in range(7)
+    ]
+
+def summarize(series: MoodSeries, span: int = DEFAULT_EWMA_SPAN) -> Dict[str, Any]:
+    """
+    Distribution, trend and recent averages of a mood series
+
+    Args:
+        series: The mood series
+        span: EWMA span in days with moods
+
+    Returns:
+        The analytics payload, statistics are null for an empty series
+    """
+    if len(series) == 0:
+        return {
+            "count": 0,
+            "first_timestamp": None,
+            "last_timestamp": None,
+            "mean": None,
+            "median": None,
+            "std": None,
+            "min": None,
+            "max": None,
+            "percentiles": {},
+            "trend_per_day": None,
+            "trend_per_week": None,
+            "rolling": {},
+            "ewma": None,
+            "day_of_week": [],
+        }
+
+    scores = series.scores
+    quantiles = np.percentile(scores, (50,) + PERCENTILES)
+    slope = trend_slope(series)
+    columns = _daily_columns(series, span)
+
+    return {
+        "count": len(series),
+        "first_timestamp": str(series.timestamps[0]),
+        "last_timestamp": str(series.timestamps[-1]),
+        "mean": round(float(scores.mean()), 2),
+        "median": round(float(quantiles[0]), 2),
+        "std": round(float(scores.std()), 2),
+        "min": float(scores.min()),
+        "max": float(scores.max()),
+        "percentiles": {f"p{p}": round(float(q), 2) for p, q in zip(PERCENTILES, quantiles[1:])},
+        "trend_per_day": round(slope, 4),
+        "trend_per_week": round(slope * 7, 4),
+        "rolling": {f"{window}d": _round(columns[f"rolling_{window}"][-1:])[0] for window in ROLLING_WINDOWS},
+        "ewma": _round(columns["ewma"][-1:])[0],
+        "day_of_week": weekday_profile(series),
+    }
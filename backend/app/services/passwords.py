@@ -0,0 +1,151 @@
+import asyncio
+import time
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from passlib.context import CryptContext
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Password hashing
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class PasswordPoolFullError(RuntimeError):
+    """Raised when too many password operations are already waiting"""
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+class PasswordPool:
+    """
+    Runs bcrypt hashing and verification on a bounded worker pool so that
+    a login spike does not block the event loop
+    """
+
+    def __init__(self, kind: str = "thread", workers: int = 4, max_queue: int = 100):
+        """
+        Initialize the pool
+
+        Args:
+            kind: Executor type, either "thread" or "process"
+            workers: Maximum number of concurrent bcrypt operations
+            max_queue: Maximum number of operations waiting for a worker before new ones are rejected
+        """
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.active = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_time = 0.0
+        self.total_run_time = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs a password operation on the pool
+
+        Args:
+            func: Picklable module-level function to run
+            *args: Arguments for the function
+
+        Returns:
+            The function result
+
+        Raises:
+            PasswordPoolFullError: If the wait queue is full
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise PasswordPoolFullError("Too many password operations in progress")
+
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait_time += started_at - queued_at
+        self.active += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.active -= 1
+            self.completed += 1
+            self.total_run_time += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "peak_queue_depth": self.peak_waiting,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_time / self.completed * 1000, 2) if self.completed else 0.0,
+            "avg_run_ms": round(self.total_run_time / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+password_pool = PasswordPool(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+async def hash_password(password: str) -> str:
+    """
+    Hashes a password with bcrypt off the event loop
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        The bcrypt hash
+    """
+    return await password_pool.run(_hash, password)
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    """
+    Verifies a password against a bcrypt hash off the event loop
+
+    Args:
+        password: Plain text password
+        hashed_password: Stored bcrypt hash
+
+    Returns:
+        True if the password matches
+    """
+    return await password_pool.run(_verify, password, hashed_password)
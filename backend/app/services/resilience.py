@@ -0,0 +1,216 @@
+import time
+import random
+import logging
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised when a call is rejected because the circuit for its target is open
+    """
+
+class CircuitBreaker:
+    """
+    Per-target circuit breaker. Opens after a run of consecutive failures so
+    callers fail fast instead of waiting on timeouts, then lets a single trial
+    call through once the recovery time has passed.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_time: float = 30.0):
+        """
+        Initialize the breaker
+
+        Args:
+            name: Target name used in logs and metrics
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_time: Seconds the circuit stays open before a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+        self._trial_started = 0.0
+
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go through now
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() < self._open_until:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            # A trial that never reported back (e.g. a cancelled request) is given up after the recovery time
+            if self._trial_in_flight and time.monotonic() - self._trial_started < self.recovery_time:
+                self.rejected += 1
+                return False
+            self._trial_in_flight = True
+            self._trial_started = time.monotonic()
+
+        return True
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.trip(self.recovery_time)
+
+    def trip(self, duration: float) -> None:
+        """
+        Opens the circuit for the given number of seconds
+
+        Args:
+            duration: Seconds before the next trial call is allowed
+        """
+        if self.state != self.OPEN:
+            self.opened += 1
+            logger.warning(f"Circuit for {self.name} opened for {duration:.1f}s")
+        self.state = self.OPEN
+        self._open_until = time.monotonic() + duration
+        self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_in_s": round(max(0.0, self._open_until - time.monotonic()), 2) if self.state == self.OPEN else 0.0,
+        }
+
+class RetryBudget:
+    """
+    Token bucket bounding retries to a fraction of regular traffic, so an
+    outage cannot multiply the load sent to a struggling upstream
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 1.0, max_tokens: float = 10.0):
+        """
+        Initialize the budget
+
+        Args:
+            ratio: Retry tokens earned per regular request
+            min_per_second: Retry tokens earned per second regardless of traffic
+            max_tokens: Maximum number of tokens that can be saved up
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated_at = time.monotonic()
+
+        self.retries = 0
+        self.exhausted = 0
+
+    def _refill(self, amount: float = 0.0) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + amount + (now - self._updated_at) * self.min_per_second)
+        self._updated_at = now
+
+    def record_request(self) -> None:
+        self._refill(self.ratio)
+
+    def try_retry(self) -> bool:
+        """
+        Takes a retry token if one is available
+
+        Returns:
+            True if the retry may go ahead
+        """
+        self._refill()
+        if self._tokens < 1.0:
+            self.exhausted += 1
+            return False
+
+        self._tokens -= 1.0
+        self.retries += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "tokens": round(self._tokens, 2),
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+        }
+
+class LatencyTracker:
+    """
+    Sliding window of recent call latencies used to derive adaptive timeouts
+    """
+
+    def __init__(self, window_size: int = 200, min_samples: int = 20):
+        self._samples: deque = deque(maxlen=window_size)
+        self.min_samples = min_samples
+
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        if len(self._samples) < self.min_samples:
+            return None
+        return float(np.percentile(np.fromiter(self._samples, dtype=np.float64), percentile))
+
+    def timeout(self, ceiling: float, floor: float, percentile: float = 99.0, multiplier: float = 2.0) -> float:
+        """
+        Derives a timeout from the observed latency distribution
+
+        Args:
+            ceiling: Configured timeout, also used until enough samples are collected
+            floor: Lowest timeout ever returned
+            percentile: Latency percentile the timeout is based on
+            multiplier: Headroom applied to that percentile
+
+        Returns:
+            Timeout in seconds between floor and ceiling
+        """
+        observed = self.percentile(percentile)
+        if observed is None:
+            return ceiling
+        return min(ceiling, max(floor, observed * multiplier))
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.percentile(50)
+        p99 = self.percentile(99)
+        return {
+            "samples": len(self._samples),
+            "p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+            "p99_ms": round(p99 * 1000, 2) if p99 is not None else None,
+        }
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Full-jitter exponential backoff
+
+    Args:
+        attempt: Zero-based retry number
+        base: Delay scale in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        Seconds to wait before the retry
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
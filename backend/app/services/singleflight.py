@@ -0,0 +1,154 @@
+import json
+import time
+import uuid
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import redis.asyncio as aioredis
+
+from app.services.cache import REDIS_RETRY_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution.
+    Within a process, callers share the in-flight task. With a Redis URL,
+    workers also coordinate through a lock: the holder runs the call and
+    publishes its JSON-serializable result, the others wait for it.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        redis_url: Optional[str] = None,
+        lock_ttl: float = 30.0,
+        result_ttl: int = 5,
+        poll_interval: float = 0.05,
+    ):
+        """
+        Initialize the group
+
+        Args:
+            namespace: Prefix used for Redis keys
+            redis_url: Redis connection URL, cross-worker deduplication is disabled when empty
+            lock_ttl: Seconds before an abandoned lock expires, also the longest a waiter waits
+            result_ttl: Seconds a published result stays readable by waiting workers
+            poll_interval: Seconds between checks for a result published by another worker
+        """
+        self.namespace = namespace
+        self.redis_url = redis_url
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.redis_client = None
+        self._redis_retry_at = 0.0
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.calls = 0
+        self.shared_local = 0
+        self.shared_remote = 0
+
+    def _redis(self):
+        if not self.redis_url or time.monotonic() < self._redis_retry_at:
+            return None
+
+        if self.redis_client is None:
+            self.redis_client = aioredis.from_url(self.redis_url)
+
+        return self.redis_client
+
+    def _redis_failed(self, e: Exception) -> None:
+        logger.warning(f"Redis error in {self.namespace} single-flight, deduplicating in process only for {REDIS_RETRY_INTERVAL}s: {str(e)}")
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs fn unless an identical call is already in flight, in which case
+        its result (or exception) is shared
+
+        Args:
+            key: Identifies identical calls, typically a hash of the request content
+            fn: Coroutine function performing the call
+
+        Returns:
+            The result of fn
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared_local += 1
+        else:
+            # The call runs in its own task so that cancelling the caller that started it
+            # does not cancel it for everyone else waiting on the same key
+            task = asyncio.create_task(self._execute(key, fn))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every caller gave up before it was raised
+        if not task.cancelled():
+            task.exception()
+
+    async def _execute(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        client = self._redis()
+        if client is None:
+            self.calls += 1
+            return await fn()
+
+        lock_key = f"singleflight:{self.namespace}:{key}:lock"
+        result_key = f"singleflight:{self.namespace}:{key}:result"
+
+        try:
+            acquired = await client.set(lock_key, uuid.uuid4().hex, nx=True, px=int(self.lock_ttl * 1000))
+        except Exception as e:
+            self._redis_failed(e)
+            self.calls += 1
+            return await fn()
+
+        if acquired:
+            self.calls += 1
+            try:
+                result = await fn()
+                try:
+                    await client.set(result_key, json.dumps(result), ex=self.result_ttl)
+                except Exception as e:
+                    self._redis_failed(e)
+                return result
+            finally:
+                try:
+                    await client.delete(lock_key)
+                except Exception as e:
+                    self._redis_failed(e)
+
+        # Another worker holds the lock, wait for its result until the lock goes away
+        try:
+            deadline = time.monotonic() + self.lock_ttl
+            while time.monotonic() < deadline:
+                raw = await client.get(result_key)
+                if raw is not None:
+                    self.shared_remote += 1
+                    return json.loads(raw)
+                if not await client.exists(lock_key):
+                    break
+                await asyncio.sleep(self.poll_interval)
+        except Exception as e:
+            self._redis_failed(e)
+
+        self.calls += 1
+        return await fn()
+
+    def stats(self) -> Dict[str, Any]:
+        saved = self.shared_local + self.shared_remote
+        return {
+            "in_flight": len(self._inflight),
+            "upstream_calls": self.calls,
+            "shared_in_process": self.shared_local,
+            "shared_across_workers": self.shared_remote,
+            "saved_calls": saved,
+            "saved_ratio": round(saved / (saved + self.calls), 4) if saved + self.calls else 0.0,
+        }
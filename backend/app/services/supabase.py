@@ -1,19 +1,98 @@
-from supabase import create_client, Client
-from app.config.settings import settings
+from postgrest import AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_HEADERS
+from typing import Dict, Optional, Union
+import logging
 import httpx
 
-def get_supabase_client() -> Client:
+from app.config.settings import settings
+from app.services.http_metrics import ConnectionStats, http2_available
+
+logger = logging.getLogger(__name__)
+
+# Process-wide client, created on first use or at application startup
+_postgrest: Optional[AsyncPostgrestClient] = None
+
+supabase_connection_stats = ConnectionStats("supabase")
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.SUPABASE_POOL_SIZE,
+        max_keepalive_connections=settings.SUPABASE_POOL_KEEPALIVE,
+        keepalive_expiry=settings.SUPABASE_KEEPALIVE_EXPIRY,
+    )
+
+def _use_http2() -> bool:
+    return settings.SUPABASE_HTTP2 and http2_available()
+
+class PooledAsyncPostgrestClient(AsyncPostgrestClient):
     """
-    Creates and returns a Supabase client instance
-    
+    Async PostgREST client whose session uses the shared pool settings and metrics
+    """
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, httpx.Timeout],
+    ) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=_pool_limits(),
+            http2=_use_http2(),
+            event_hooks=supabase_connection_stats.async_hooks(),
+        )
+
+def get_async_postgrest() -> AsyncPostgrestClient:
+    """
+    Returns the shared async PostgREST client used by the repositories
+
     Returns:
-        Client: A configured Supabase client
+        AsyncPostgrestClient: A configured client for the Supabase REST API
     """
-    if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
-        raise ValueError("Supabase URL and key must be provided in environment variables")
-    
-    client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-    return client
+    global _postgrest
+
+    if _postgrest is None:
+        if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+            raise ValueError("Supabase URL and key must be provided in environment variables")
+
+        _postgrest = PooledAsyncPostgrestClient(
+            f"{settings.SUPABASE_URL}/rest/v1",
+            headers={**DEFAULT_POSTGREST_CLIENT_HEADERS, "apiKey": settings.SUPABASE_KEY},
+        )
+        _postgrest.auth(settings.SUPABASE_KEY)
+
+    return _postgrest
+
+def init_supabase() -> None:
+    """
+    Creates the shared PostgREST client, called on application startup
+    """
+    try:
+        get_async_postgrest()
+    except ValueError as e:
+        logger.warning(f"Supabase client not initialized: {str(e)}")
+
+async def close_supabase() -> None:
+    """
+    Closes the pooled Supabase connections, called on application shutdown
+    """
+    global _postgrest
+
+    if _postgrest is not None:
+        await _postgrest.aclose()
+        _postgrest = None
+
+def supabase_pool_stats() -> dict:
+    """
+    Returns connection reuse statistics for the Supabase pool
+    """
+    return {
+        **supabase_connection_stats.stats(),
+        "pool_size": settings.SUPABASE_POOL_SIZE,
+        "http2": _use_http2(),
+    }
 
 async def healthcheck_supabase() -> bool:
     """
@@ -1,18 +0,0 @@
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
-
-load_dotenv()
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-_supabase: Client = None
-
-def get_supabase_client() -> Client:
-    global _supabase
-    if _supabase is None:
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            raise RuntimeError("Supabase credentials are not set in environment variables.")
-        _supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-    return _supabase 
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""
+Benchmarks and reports that back the performance work, run from the backend directory:
+
+    python -m scripts.<name> --help
+"""
@@ -0,0 +1,97 @@
+"""
+Export benchmark: peak memory and time to export 100k moods with the
+streamed export (one keyset page in memory at a time) against reading every
+row first and serializing the whole body, as the export originally did. Rows
+are synthetic pages, so no database is needed. Each run happens in a fresh
+process so its peak RSS is its own:
+
+    python -m scripts.bench_export --rows 100000 --format csv --gzip
+"""
+import sys
+import time
+import uuid
+import asyncio
+import argparse
+import resource
+import multiprocessing
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List
+
+from app.config.settings import settings
+from app.repositories.moods import mood_repository
+from app.services.export import export_stream
+from scripts.common import print_table
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+async def mood_pages(rows: int, page_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    user_id = str(uuid.uuid4())
+    started = datetime(2024, 1, 1)
+    for start in range(0, rows, page_size):
+        yield [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "score": i % 10 + 1,
+                "notes": f"mood note {i} with a few words, long enough to matter on the wire",
+                "timestamp": (started + timedelta(minutes=i)).isoformat(),
+                "created_at": (started + timedelta(minutes=i)).isoformat(),
+            }
+            for i in range(start, min(start + page_size, rows))
+        ]
+        # Let other tasks run, like a page read from the database would
+        await asyncio.sleep(0)
+
+async def streamed(rows: int, export_format: str, compress: bool) -> int:
+    size = 0
+    async for chunk in export_stream(mood_pages(rows, settings.EXPORT_PAGE_SIZE), export_format, mood_repository.fields, compress):
+        size += len(chunk)
+    return size
+
+async def buffered(rows: int, export_format: str, compress: bool) -> int:
+    everything = [row async for page in mood_pages(rows, settings.EXPORT_PAGE_SIZE) for row in page]
+
+    async def one_page() -> AsyncIterator[List[Dict[str, Any]]]:
+        yield everything
+
+    body = b"".join([chunk async for chunk in export_stream(one_page(), export_format, mood_repository.fields, compress)])
+    return len(body)
+
+APPROACHES = {"streamed": streamed, "buffered": buffered}
+
+def measure(approach: str, rows: int, export_format: str, compress: bool) -> Dict[str, Any]:
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    size = asyncio.run(APPROACHES[approach](rows, export_format, compress))
+    return {
+        "approach": approach,
+        "seconds": round(time.perf_counter() - started, 2),
+        "output_mb": round(size / (1024 * 1024), 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "growth_mb": round(peak_rss_mb() - baseline, 1),
+    }
+
+def run(rows: int, export_format: str, compress: bool) -> None:
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for approach in APPROACHES:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(measure, (approach, rows, export_format, compress)))
+
+    print(f"{rows} moods as {export_format}{' (gzip)' if compress else ''}, pages of {settings.EXPORT_PAGE_SIZE}")
+    print_table(results)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare memory use of streamed and buffered exports")
+    parser.add_argument("--rows", type=int, default=100000, help="moods exported")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson", help="export format")
+    parser.add_argument("--gzip", action="store_true", help="compress the export")
+    args = parser.parse_args()
+
+    run(args.rows, args.format, args.gzip)
+
+if __name__ == "__main__":
+    main()
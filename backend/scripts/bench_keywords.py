@@ -0,0 +1,74 @@
+"""
+Keyword extraction benchmark: TextRank latency for entries of 100 to 50,000
+words, and throughput of the batch API over many journal-sized entries.
+Entries are synthetic, with Zipf-distributed words like natural text:
+
+    python -m scripts.bench_keywords --repeat 20 --entries 1000
+"""
+import time
+import random
+import argparse
+from typing import Callable, List
+
+from app.services.keywords import extract_keywords, extract_keywords_batch
+from scripts.common import print_table, summarize
+
+ENTRY_WORDS = (100, 1000, 10000, 50000)
+BATCH_ENTRY_WORDS = 300
+SYLLABLES = ("ka", "lo", "mi", "ren", "to", "sa", "vel", "ni", "dor", "pa", "quin", "es", "ru", "tha", "mo", "lin")
+
+def make_vocabulary(size: int, rng: random.Random) -> List[str]:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+def make_entry(words: int, vocabulary: List[str], weights: List[float], rng: random.Random) -> str:
+    tokens = rng.choices(vocabulary, weights=weights, k=words)
+    # A sentence break every dozen words or so
+    return " ".join(f"{token}." if i % 12 == 11 else token for i, token in enumerate(tokens))
+
+def time_runs(fn: Callable[[], object], repeat: int) -> List[float]:
+    fn()
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+def run(repeat: int, entries: int, vocabulary_size: int) -> None:
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(vocabulary_size, rng)
+    weights = [1.0 / rank for rank in range(1, len(vocabulary) + 1)]
+
+    single = []
+    for words in ENTRY_WORDS:
+        text = make_entry(words, vocabulary, weights, rng)
+        single.append({"words": words, **summarize(time_runs(lambda: extract_keywords(text), repeat))})
+
+    print(f"extract_keywords, {repeat} runs per size, latency in ms")
+    print_table(single)
+
+    texts = [make_entry(BATCH_ENTRY_WORDS, vocabulary, weights, rng) for _ in range(entries)]
+    durations = time_runs(lambda: extract_keywords_batch(texts), max(1, repeat // 10))
+    best = min(durations)
+
+    print(f"\nextract_keywords_batch, {entries} entries of {BATCH_ENTRY_WORDS} words")
+    print_table([{
+        "entries": entries,
+        "best_ms": round(best * 1000, 2),
+        "entries_per_s": round(entries / best),
+    }])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure keyword extraction latency and batch throughput")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per entry size")
+    parser.add_argument("--entries", type=int, default=1000, help="entries in the batch run")
+    parser.add_argument("--vocabulary", type=int, default=5000, help="distinct words in the synthetic text")
+    args = parser.parse_args()
+
+    run(args.repeat, args.entries, args.vocabulary)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Local lexicon sentiment benchmark: texts scored per second at a few batch
+sizes, and how often its label agrees with a reference on a small labelled
+journal corpus. The reference is the remote Hugging Face model when
+HUGGINGFACE_API_KEY is set, otherwise the corpus labels:
+
+    python -m scripts.bench_lexicon --texts 20000
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, List, Optional
+
+from app.config.settings import settings
+from app.services.ai import use_local_sentiment, _query_sentiment_model, init_ai_client, close_ai_client
+from app.services.lexicon import LEXICON_MODEL, lexicon_scorer
+from scripts.common import print_table
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "sentiment_corpus.jsonl")
+BATCH_SIZES = (1, 16, 256)
+
+def load_corpus(path: str) -> List[Dict[str, str]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def top_label(predictions: List[Dict[str, float]]) -> str:
+    return max(predictions, key=lambda item: item["score"])["label"]
+
+def throughput(texts: List[str], batch_size: int) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        lexicon_scorer.positive_probability(texts[start:start + batch_size])
+    return len(texts) / (time.perf_counter() - started)
+
+async def remote_labels(texts: List[str]) -> List[Optional[str]]:
+    init_ai_client()
+    try:
+        labels: List[Optional[str]] = []
+        for start in range(0, len(texts), settings.SENTIMENT_BATCH_SIZE):
+            predictions = await _query_sentiment_model(texts[start:start + settings.SENTIMENT_BATCH_SIZE])
+            labels.extend(top_label(p) if p else None for p in predictions)
+        return labels
+    finally:
+        await close_ai_client()
+
+def agreement_report(local: List[str], reference: List[Optional[str]]) -> List[Dict[str, object]]:
+    rows = []
+    for label in ("POSITIVE", "NEGATIVE"):
+        scored = [(l, r) for l, r in zip(local, reference) if r == label]
+        agreed = sum(l == r for l, r in scored)
+        rows.append({"reference": label, "texts": len(scored), "agreed": agreed,
+                     "agreement": f"{agreed / len(scored):.1%}" if scored else "-"})
+    scored = [(l, r) for l, r in zip(local, reference) if r is not None]
+    agreed = sum(l == r for l, r in scored)
+    rows.append({"reference": "all", "texts": len(scored), "agreed": agreed,
+                 "agreement": f"{agreed / len(scored):.1%}" if scored else "-"})
+    return rows
+
+def run(corpus_path: str, texts: int, show_disagreements: bool) -> None:
+    corpus = load_corpus(corpus_path)
+    sample = [corpus[i % len(corpus)]["text"] for i in range(texts)]
+
+    print(f"{LEXICON_MODEL} throughput over {texts} texts")
+    print_table([
+        {"batch_size": batch_size, "texts_per_s": round(throughput(sample, batch_size))}
+        for batch_size in BATCH_SIZES
+    ])
+
+    corpus_texts = [row["text"] for row in corpus]
+    local = [top_label(p) for p in lexicon_scorer.score_batch(corpus_texts)]
+    if use_local_sentiment():
+        source = "corpus labels"
+        reference = [row["label"] for row in corpus]
+    else:
+        source = settings.SENTIMENT_MODEL
+        reference = asyncio.run(remote_labels(corpus_texts))
+
+    print(f"\nAgreement with {source} on {len(corpus)} texts")
+    print_table(agreement_report(local, reference))
+
+    if show_disagreements:
+        print()
+        for text, l, r in zip(corpus_texts, local, reference):
+            if r is not None and l != r:
+                print(f"{l:<8}  expected {r:<8}  {text}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure lexicon sentiment throughput and agreement")
+    parser.add_argument("--texts", type=int, default=20000, help="texts scored per throughput run")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="JSON lines with text and label")
+    parser.add_argument("--show-disagreements", action="store_true", help="list the texts the labels differ on")
+    args = parser.parse_args()
+
+    run(args.corpus, args.texts, args.show_disagreements)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Mood aggregation benchmark: bucketing every mood row in Python, as
+/moods/aggregate did originally, against reading the trigger-maintained
+rollups over RPC. Seeds a throwaway user on the configured Supabase project:
+
+    python -m scripts.bench_mood_aggregation --moods 10000 --repeat 20
+"""
+import asyncio
+import argparse
+import statistics
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List
+
+from app.repositories.moods import mood_repository
+from scripts.common import benchmark_user, print_table, summarize, timed
+
+PERIODS = ("day", "week", "month")
+
+def bucket_label(timestamp: str, period: str) -> str:
+    moment = datetime.fromisoformat(timestamp[:19])
+    if period == "day":
+        return moment.strftime("%Y-%m-%d")
+    if period == "week":
+        return (moment - timedelta(days=moment.weekday())).strftime("%Y-%m-%d")
+    return moment.strftime("%Y-%m")
+
+async def aggregate_rows(user_id: str, period: str, start: date, end: date) -> List[Dict[str, Any]]:
+    # Every column of every mood in the range crosses the wire, one keyset page at a time
+    scores = defaultdict(list)
+    async for rows in mood_repository.iter_for_user(
+        user_id,
+        'timestamp',
+        start=datetime.combine(start, datetime.min.time()),
+        end=datetime.combine(end, datetime.max.time()),
+    ):
+        for row in rows:
+            scores[bucket_label(row["timestamp"], period)].append(row["score"])
+    return [
+        {"bucket": bucket, "average_score": round(statistics.mean(values), 2), "count": len(values)}
+        for bucket, values in sorted(scores.items())
+    ]
+
+async def run(moods: int, repeat: int) -> None:
+    end = date.today()
+    start = end - timedelta(days=3 * 365)
+
+    results = []
+    async with benchmark_user(moods) as user_id:
+        for period in PERIODS:
+            approaches = {
+                "rows": lambda: aggregate_rows(user_id, period, start, end),
+                "rollups": lambda: mood_repository.aggregate(user_id, period, start, end),
+            }
+            for name, fn in approaches.items():
+                buckets = len(await fn())
+                results.append({"period": period, "approach": name, "buckets": buckets, **summarize(await timed(fn, repeat))})
+
+    print(f"{moods} moods over three years, {repeat} runs each, latency in ms")
+    print_table(results)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare row-by-row and rollup mood aggregation")
+    parser.add_argument("--moods", type=int, default=10000, help="moods seeded for the benchmark user")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per period and approach")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.moods, args.repeat))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Mood list pagination benchmark: latency of page 1 and a deep page with
+offset (skip) and keyset (cursor) pagination. Offset pages scan past every
+skipped row, keyset pages seek through the index. Seeds a throwaway user on
+the configured Supabase project:
+
+    python -m scripts.bench_pagination --page 500 --limit 20 --repeat 20
+"""
+import asyncio
+import argparse
+
+from app.repositories.moods import mood_repository
+from scripts.common import benchmark_user, print_table, summarize, timed
+
+async def run(page: int, limit: int, repeat: int) -> None:
+    skip = (page - 1) * limit
+
+    results = []
+    # A few extra moods so the deep page is full
+    async with benchmark_user(skip + 2 * limit) as user_id:
+        # The cursor of the deep page comes from the last row of the page before it
+        _, cursor = await mood_repository.list_for_user(user_id, skip=skip - limit, limit=limit)
+
+        offset_rows, _ = await mood_repository.list_for_user(user_id, skip=skip, limit=limit)
+        keyset_rows, _ = await mood_repository.list_for_user(user_id, cursor=cursor, limit=limit)
+        if [row["id"] for row in offset_rows] != [row["id"] for row in keyset_rows]:
+            raise RuntimeError(f"Offset and keyset pagination returned different rows for page {page}")
+
+        approaches = {
+            ("offset", 1): lambda: mood_repository.list_for_user(user_id, limit=limit),
+            ("keyset", 1): lambda: mood_repository.list_for_user(user_id, limit=limit),
+            ("offset", page): lambda: mood_repository.list_for_user(user_id, skip=skip, limit=limit),
+            ("keyset", page): lambda: mood_repository.list_for_user(user_id, cursor=cursor, limit=limit),
+        }
+        for (name, number), fn in approaches.items():
+            results.append({"approach": name, "page": number, **summarize(await timed(fn, repeat))})
+
+    print(f"Pages of {limit} moods, {repeat} runs each, latency in ms")
+    print_table(results)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare offset and keyset pagination of the mood list")
+    parser.add_argument("--page", type=int, default=500, help="deep page to read")
+    parser.add_argument("--limit", type=int, default=20, help="moods per page")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per approach and page")
+    args = parser.parse_args()
+    if args.page < 2:
+        parser.error("--page must be at least 2")
+
+    asyncio.run(run(args.page, args.limit, args.repeat))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Login storm benchmark: latency of an unrelated endpoint (/health) while a
+burst of bcrypt verifications runs, with bcrypt on the event loop as the login
+route did originally and on the thread and process password pools. Runs the
+app in process, no database needed:
+
+    python -m scripts.bench_password_pool --logins 64 --workers 4
+"""
+import asyncio
+import argparse
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from app.main import app
+from app.services.passwords import PasswordPool, PasswordPoolFullError, _verify, pwd_context
+from scripts.common import print_table, summarize
+
+PASSWORD = "correct horse battery staple"
+PROBE_INTERVAL = 0.005
+
+async def probe(client: httpx.AsyncClient, done: asyncio.Event) -> List[float]:
+    # Probes are due every PROBE_INTERVAL and timed from when they were due, so
+    # time spent waiting for a blocked event loop counts as latency
+    durations = []
+    due = time.perf_counter()
+    while True:
+        await client.get("/health")
+        durations.append(time.perf_counter() - due)
+        if done.is_set():
+            return durations
+        due += PROBE_INTERVAL
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+
+async def login_storm(verify: Callable[[str, str], Awaitable[bool]], logins: int) -> Dict[str, Any]:
+    hashed = pwd_context.hash(PASSWORD)
+    rejected = 0
+
+    async def login() -> None:
+        nonlocal rejected
+        try:
+            await verify(PASSWORD, hashed)
+        except PasswordPoolFullError:
+            rejected += 1
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        await client.get("/health")
+        done = asyncio.Event()
+        probing = asyncio.create_task(probe(client, done))
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        durations = await probing
+
+    return {
+        "logins_per_s": round(logins / elapsed, 1),
+        "rejected": rejected,
+        "probes": len(durations),
+        **summarize(durations),
+    }
+
+async def run(logins: int, workers: int) -> None:
+    async def inline(password: str, hashed: str) -> bool:
+        return _verify(password, hashed)
+
+    results = [{"bcrypt": "event loop", **await login_storm(inline, logins)}]
+    for kind in ("thread", "process"):
+        pool = PasswordPool(kind=kind, workers=workers, max_queue=logins)
+        try:
+            results.append({"bcrypt": f"{kind} pool", **await login_storm(lambda *args: pool.run(_verify, *args), logins)})
+        finally:
+            pool.shutdown()
+
+    print(f"{logins} concurrent logins, {workers} pool workers, /health latency in ms")
+    print_table(results)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure /health latency during a bcrypt login storm")
+    parser.add_argument("--logins", type=int, default=64, help="password verifications started at once")
+    parser.add_argument("--workers", type=int, default=4, help="workers of the thread and process pools")
+    args = parser.parse_args()
+
+    # The app logs every request at debug level
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(run(args.logins, args.workers))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Helpers shared by the benchmark scripts: timing summaries and a throwaway
+user with seeded moods on the Supabase project from SUPABASE_URL.
+"""
+import time
+import uuid
+import random
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, Dict, List
+
+import numpy as np
+
+from app.repositories.moods import mood_repository
+from app.repositories.users import user_repository
+from app.services.supabase import init_supabase, close_supabase
+
+SEED_BATCH_SIZE = 1000
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    """
+    Summarizes durations in seconds as milliseconds
+
+    Returns:
+        {"p50", "p95", "p99", "max"} in ms
+    """
+    ms = np.array(durations) * 1000
+    return {
+        "p50": round(float(np.percentile(ms, 50)), 2),
+        "p95": round(float(np.percentile(ms, 95)), 2),
+        "p99": round(float(np.percentile(ms, 99)), 2),
+        "max": round(float(ms.max()), 2),
+    }
+
+async def timed(fn: Callable[[], Awaitable[object]], repeat: int) -> List[float]:
+    """
+    Runs fn repeat times after one warm-up call
+
+    Returns:
+        Duration of each run in seconds
+    """
+    await fn()
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    columns = list(rows[0])
+    widths = [max(len(str(column)), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(str(column).ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+async def seed_moods(user_id: str, count: int, days: int = 3 * 365) -> None:
+    """
+    Inserts count moods spread over the last days, in batches
+    """
+    now = datetime.utcnow()
+    rng = random.Random(count)
+    for start in range(0, count, SEED_BATCH_SIZE):
+        await mood_repository.insert_many([
+            {
+                "user_id": user_id,
+                "score": rng.randint(1, 10),
+                "notes": "benchmark mood with a note long enough to matter on the wire",
+                "timestamp": (now - timedelta(seconds=rng.randrange(days * 86400))).isoformat(),
+                "created_at": now.isoformat(),
+            }
+            for _ in range(min(SEED_BATCH_SIZE, count - start))
+        ])
+
+@asynccontextmanager
+async def benchmark_user(moods: int = 0) -> AsyncIterator[str]:
+    """
+    Creates a throwaway user with seeded moods and deletes both afterwards
+
+    Yields:
+        The user id
+    """
+    init_supabase()
+    user = await user_repository.insert_if_new_email({
+        "email": f"benchmark-{uuid.uuid4().hex[:12]}@example.com",
+        "password": "not-a-hash",
+        "full_name": "Benchmark User",
+        "created_at": datetime.utcnow().isoformat(),
+    })
+    try:
+        if moods:
+            await seed_moods(user["id"], moods)
+        yield user["id"]
+    finally:
+        await mood_repository.query().delete().eq("user_id", user["id"]).execute()
+        await user_repository.query().delete().eq("id", user["id"]).execute()
+        await close_supabase()
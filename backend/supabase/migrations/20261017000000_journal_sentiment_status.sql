@@ -0,0 +1,15 @@
+-- Sentiment of journal entries is analyzed by a background job after the
+-- entry is written; sentiment_status tracks where that job is.
+alter table journal_entries
+    add column if not exists sentiment_status text not null default 'pending'
+        check (sentiment_status in ('pending', 'done', 'failed'));
+
+-- Entries written before background analysis already have their score
+update journal_entries
+    set sentiment_status = 'done'
+    where sentiment_score is not null;
+
+-- Lets operators find entries whose analysis never completed
+create index if not exists journal_entries_sentiment_pending_idx
+    on journal_entries (created_at)
+    where sentiment_status <> 'done';
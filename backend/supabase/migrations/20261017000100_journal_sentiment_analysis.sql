@@ -0,0 +1,10 @@
+-- Persist the full sentiment analysis of journal entries so reads are served
+-- from the database. content_hash and sentiment_model record what the stored
+-- analysis was computed from; it is recomputed only when either changes.
+alter table journal_entries
+    add column if not exists sentiment_label text,
+    add column if not exists keywords text[] not null default '{}',
+    add column if not exists suggestions text[],
+    add column if not exists sentiment_model text,
+    add column if not exists content_hash text,
+    add column if not exists analyzed_at timestamptz;
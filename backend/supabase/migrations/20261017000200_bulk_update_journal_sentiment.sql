@@ -0,0 +1,36 @@
+-- Writes the analysis of many journal entries in one statement, used by the
+-- sentiment backfill (python -m app.cli.backfill). PostgREST upserts cannot
+-- update a subset of columns of existing rows, hence the function. It returns
+-- a one-row table because postgrest-py only accepts list responses.
+create or replace function bulk_update_journal_sentiment(updates jsonb)
+returns table (updated integer)
+language sql
+as $$
+    with rows as (
+        select *
+        from jsonb_to_recordset(updates) as r(
+            id uuid,
+            sentiment_score double precision,
+            sentiment_label text,
+            keywords text[],
+            suggestions text[],
+            sentiment_model text,
+            content_hash text,
+            analyzed_at timestamptz
+        )
+    ), updated as (
+        update journal_entries j
+        set sentiment_score = r.sentiment_score,
+            sentiment_label = r.sentiment_label,
+            keywords = coalesce(r.keywords, '{}'),
+            suggestions = r.suggestions,
+            sentiment_model = r.sentiment_model,
+            content_hash = r.content_hash,
+            analyzed_at = r.analyzed_at,
+            sentiment_status = 'done'
+        from rows r
+        where j.id = r.id
+        returning 1
+    )
+    select count(*)::integer from updated;
+$$;
@@ -0,0 +1,104 @@
+-- Per-user mood rollups, one row per day, week and month bucket, kept up to
+-- date by a trigger on moods so /moods/aggregate/{period} reads O(buckets)
+-- rows instead of scanning raw moods. Buckets are UTC dates: the day, the
+-- Monday of the ISO week, or the first day of the month.
+create table if not exists mood_rollups (
+    user_id uuid not null,
+    period text not null check (period in ('day', 'week', 'month')),
+    bucket date not null,
+    score_sum bigint not null default 0,
+    entries bigint not null default 0,
+    primary key (user_id, period, bucket)
+);
+
+create or replace function apply_mood_rollup(p_user_id uuid, p_timestamp timestamptz, p_score integer, p_sign integer)
+returns void
+language plpgsql
+as $$
+declare
+    v_period text;
+    v_bucket date;
+begin
+    foreach v_period in array array['day', 'week', 'month'] loop
+        v_bucket := date_trunc(v_period, p_timestamp at time zone 'UTC')::date;
+
+        insert into mood_rollups (user_id, period, bucket, score_sum, entries)
+        values (p_user_id, v_period, v_bucket, p_sign * p_score, p_sign)
+        on conflict (user_id, period, bucket) do update
+            set score_sum = mood_rollups.score_sum + excluded.score_sum,
+                entries = mood_rollups.entries + excluded.entries;
+
+        delete from mood_rollups
+        where user_id = p_user_id and period = v_period and bucket = v_bucket and entries <= 0;
+    end loop;
+end;
+$$;
+
+create or replace function moods_rollup_trigger()
+returns trigger
+language plpgsql
+as $$
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        perform apply_mood_rollup(old.user_id, old."timestamp", old.score, -1);
+    end if;
+    if tg_op in ('INSERT', 'UPDATE') then
+        perform apply_mood_rollup(new.user_id, new."timestamp", new.score, 1);
+    end if;
+    return null;
+end;
+$$;
+
+drop trigger if exists moods_rollup on moods;
+create trigger moods_rollup
+    after insert or delete or update of score, "timestamp", user_id on moods
+    for each row execute function moods_rollup_trigger();
+
+-- Reads the rollup buckets overlapping a date range, labelled as day and week
+-- dates (YYYY-MM-DD) or months (YYYY-MM)
+create or replace function aggregate_mood_rollups(
+    p_user_id uuid,
+    p_period text,
+    p_start date,
+    p_end date
+)
+returns table (bucket text, score_sum bigint, entries bigint)
+language sql
+stable
+as $$
+    select
+        case p_period when 'month' then to_char(r.bucket, 'YYYY-MM') else to_char(r.bucket, 'YYYY-MM-DD') end,
+        r.score_sum,
+        r.entries
+    from mood_rollups r
+    where r.user_id = p_user_id
+        and r.period = p_period
+        and r.bucket >= date_trunc(p_period, p_start)::date
+        and r.bucket <= p_end
+    order by r.bucket;
+$$;
+
+-- Consistency repair: recomputes the rollups of one user (or everyone when
+-- p_user_id is null) from raw moods. Mood writes wait while it runs.
+create or replace function rebuild_mood_rollups(p_user_id uuid default null)
+returns table (buckets bigint)
+language plpgsql
+as $$
+begin
+    lock table moods in share mode;
+
+    delete from mood_rollups where p_user_id is null or user_id = p_user_id;
+
+    insert into mood_rollups (user_id, period, bucket, score_sum, entries)
+    select m.user_id, p.period, date_trunc(p.period, m."timestamp" at time zone 'UTC')::date, sum(m.score), count(*)
+    from moods m
+    cross join (values ('day'), ('week'), ('month')) as p(period)
+    where p_user_id is null or m.user_id = p_user_id
+    group by 1, 2, 3;
+
+    return query
+        select count(*) from mood_rollups where p_user_id is null or user_id = p_user_id;
+end;
+$$;
+
+select * from rebuild_mood_rollups();
@@ -0,0 +1,9 @@
+-- Cursor pagination orders listings by (timestamp, id) and seeks past the
+-- last row of the previous page, which these indexes serve in either
+-- direction without scanning skipped rows. The mood index includes the score
+-- so range aggregation and rollup rebuilds read only the index.
+create index if not exists moods_user_timestamp_id_idx
+    on moods (user_id, "timestamp", id) include (score);
+
+create index if not exists journal_entries_user_created_at_id_idx
+    on journal_entries (user_id, created_at, id);
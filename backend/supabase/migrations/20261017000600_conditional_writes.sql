@@ -0,0 +1,24 @@
+-- Registration inserts with on_conflict=email and ignores duplicates, so the
+-- unique index is what decides whether an email is already taken.
+create unique index if not exists users_email_key
+    on users (email);
+
+-- Editing the content of a journal entry invalidates its sentiment analysis.
+-- Done in the update itself so the API does not need to read the old content
+-- first; the analysis job resets the status once the new content is scored.
+create or replace function mark_journal_sentiment_stale()
+returns trigger
+language plpgsql
+as $$
+begin
+    if new.content is distinct from old.content then
+        new.sentiment_status := 'pending';
+    end if;
+    return new;
+end;
+$$;
+
+drop trigger if exists journal_entries_sentiment_stale on journal_entries;
+create trigger journal_entries_sentiment_stale
+    before update of content on journal_entries
+    for each row execute function mark_journal_sentiment_stale();
@@ -0,0 +1,38 @@
+-- An entry can be edited while its previous content is being analyzed. Each
+-- analysis row now carries the md5 of the content it was computed from and is
+-- only written if the entry still has that content; otherwise the entry stays
+-- pending for the job queued by the edit.
+create or replace function bulk_update_journal_sentiment(updates jsonb)
+returns table (updated integer)
+language sql
+as $$
+    with rows as (
+        select *
+        from jsonb_to_recordset(updates) as r(
+            id uuid,
+            content_md5 text,
+            sentiment_score double precision,
+            sentiment_label text,
+            keywords text[],
+            suggestions text[],
+            sentiment_model text,
+            content_hash text,
+            analyzed_at timestamptz
+        )
+    ), updated as (
+        update journal_entries j
+        set sentiment_score = r.sentiment_score,
+            sentiment_label = r.sentiment_label,
+            keywords = coalesce(r.keywords, '{}'),
+            suggestions = r.suggestions,
+            sentiment_model = r.sentiment_model,
+            content_hash = r.content_hash,
+            analyzed_at = r.analyzed_at,
+            sentiment_status = 'done'
+        from rows r
+        where j.id = r.id
+            and md5(j.content) = r.content_md5
+        returning 1
+    )
+    select count(*)::integer from updated;
+$$;
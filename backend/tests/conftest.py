@@ -0,0 +1,82 @@
+import os
+
+# Settings are read when the app is imported, so configure it first: no Redis,
+# no Hugging Face key (local lexicon sentiment, mock chat) and a fake Supabase
+os.environ.update({
+    "SUPABASE_URL": "http://supabase.test",
+    "SUPABASE_KEY": "test-key",
+    "HUGGINGFACE_API_KEY": "",
+    "MODEL_ENDPOINT": "",
+    "REDIS_URL": "",
+    "SUPABASE_HTTP2": "False",
+})
+
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from postgrest import AsyncPostgrestClient
+
+from app.main import app
+from app.routers.auth import get_current_user
+from app.services import supabase as supabase_service
+
+USER_ID = "5b0f6a4e-3c1d-4f7a-9a55-0a6f3e2b9c11"
+
+class PostgrestRecorder:
+    """
+    Answers PostgREST requests from a queue of canned responses, or a handler,
+    and records every request made
+    """
+
+    def __init__(self):
+        self.requests: List[httpx.Request] = []
+        self.responses: List[httpx.Response] = []
+        self.handler: Optional[Callable[[httpx.Request], httpx.Response]] = None
+
+    def respond(self, data: Any, status_code: int = 200) -> None:
+        self.responses.append(httpx.Response(status_code, json=data))
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.handler is not None:
+            return self.handler(request)
+        if self.responses:
+            return self.responses.pop(0)
+        return httpx.Response(200, json=[])
+
+    @staticmethod
+    def params(request: httpx.Request) -> Dict[str, List[str]]:
+        params: Dict[str, List[str]] = {}
+        for name, value in request.url.params.multi_items():
+            params.setdefault(name, []).append(value)
+        return params
+
+    @staticmethod
+    def body(request: httpx.Request) -> Any:
+        return json.loads(request.content) if request.content else None
+
+@pytest.fixture
+def postgrest(monkeypatch) -> PostgrestRecorder:
+    recorder = PostgrestRecorder()
+
+    class MockPostgrestClient(AsyncPostgrestClient):
+        def create_session(self, base_url, headers, timeout) -> httpx.AsyncClient:
+            return httpx.AsyncClient(
+                base_url=base_url,
+                headers=headers,
+                timeout=timeout,
+                transport=httpx.MockTransport(recorder),
+            )
+
+    monkeypatch.setattr(supabase_service, "_postgrest", MockPostgrestClient("http://supabase.test/rest/v1"))
+    return recorder
+
+@pytest.fixture
+def client(postgrest) -> TestClient:
+    # Not used as a context manager, so the startup hooks (job workers, HF client) do not run
+    app.dependency_overrides[get_current_user] = lambda: {"id": USER_ID, "email": "user@example.com"}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
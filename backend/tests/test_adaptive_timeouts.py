@@ -0,0 +1,32 @@
+import asyncio
+
+import httpx
+
+from app.services import ai
+
+def post(batch_size: int) -> httpx.Response:
+    return asyncio.run(ai._post_inference("sentiment", "model", {"inputs": ["text"] * batch_size}, 30.0, batch_size))
+
+def test_batch_sizes_get_separate_latency_windows(monkeypatch):
+    timeouts = []
+
+    def inference(request: httpx.Request) -> httpx.Response:
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json=[])
+
+    monkeypatch.setattr(ai, "_latency_trackers", {})
+    monkeypatch.setattr(ai, "get_hf_client", lambda: httpx.AsyncClient(base_url="http://hf.test", transport=httpx.MockTransport(inference)))
+
+    # Single texts are fast, 32-text batches are slow
+    for _ in range(30):
+        ai._latency_tracker(ai._latency_window("sentiment", 1)).record(0.3)
+        ai._latency_tracker(ai._latency_window("sentiment", 32)).record(4.0)
+    post(1)
+    post(32)
+    post(20)
+
+    assert ai._latency_window("sentiment", 20) == "sentiment:32"
+    assert set(ai._latency_trackers) == {"sentiment:1", "sentiment:32"}
+    # Single texts keep a tight timeout (at the floor) while large batches get headroom from their own p99
+    assert timeouts[0] == ai.settings.HF_MIN_TIMEOUT
+    assert timeouts[1] == timeouts[2] == 8.0
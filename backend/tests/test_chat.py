@@ -0,0 +1,33 @@
+import asyncio
+
+from app.services.ai import _prepare_chat_history
+from app.services.conversations import conversation_store
+from tests.conftest import USER_ID
+
+def stored(conversation_id):
+    return asyncio.run(conversation_store.get(USER_ID, conversation_id))
+
+def test_fallback_reply_is_not_stored(client):
+    # Without a Hugging Face key the assistant answers with a canned reply
+    response = client.post("/ai/ai/chat", json={"message": "I feel anxious"})
+
+    assert response.status_code == 200
+    assert response.json()["response"]
+    assert stored(response.json()["conversation_id"]) == []
+
+def test_streamed_fallback_reply_is_not_stored(client):
+    response = client.post("/ai/ai/chat/stream", json={"message": "I feel anxious"})
+
+    assert response.status_code == 200
+    assert "event: done" in response.text
+    assert stored(response.headers["X-Conversation-Id"]) == []
+
+def test_preparing_the_prompt_leaves_the_history_untouched():
+    history = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello"}]
+    before = [dict(message) for message in history]
+
+    prompt = _prepare_chat_history("I feel anxious", history)
+
+    assert history == before
+    assert prompt[0]["role"] == "system"
+    assert prompt[-1] == {"role": "user", "content": "I feel anxious"}
@@ -0,0 +1,146 @@
+import gzip
+import json
+
+import httpx
+
+from tests.conftest import USER_ID
+
+def echo_insert(request: httpx.Request) -> httpx.Response:
+    rows = json.loads(request.content)
+    return httpx.Response(201, json=[{"id": f"row-{i}", **row} for i, row in enumerate(rows)])
+
+def ndjson(*lines) -> bytes:
+    return "".join((line if isinstance(line, str) else json.dumps(line)) + "\n" for line in lines).encode()
+
+def test_invalid_rows_are_reported_and_valid_rows_inserted(client, postgrest):
+    postgrest.handler = echo_insert
+    body = ndjson(
+        {"score": 7, "notes": "walk", "timestamp": "2026-10-01T08:00:00"},
+        {"score": 11},
+        "{not json",
+        "[1, 2]",
+        {"score": 4},
+    )
+
+    response = client.post(
+        "/moods/moods/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 2
+    assert result["failed"] == 3
+    assert [error["row"] for error in result["errors"]] == [2, 3, 4]
+    assert result["errors"][0]["errors"][0].startswith("score:")
+    assert result["errors"][1]["errors"][0].startswith("Invalid JSON")
+    assert result["errors"][2]["errors"] == ["Expected a JSON object"]
+
+    # Both valid rows go in a single insert
+    assert len(postgrest.requests) == 1
+    inserted = postgrest.body(postgrest.requests[0])
+    assert [row["score"] for row in inserted] == [7, 4]
+    assert all(row["user_id"] == USER_ID for row in inserted)
+
+def test_gzipped_csv_is_imported_in_batches(client, postgrest):
+    postgrest.handler = echo_insert
+    csv_body = "score,notes,timestamp\n" + "".join(f"{i},note {i},2026-10-0{i}T08:00:00\n" for i in range(1, 6))
+
+    response = client.post(
+        "/moods/moods/import",
+        params={"format": "csv", "batch_size": 2},
+        content=gzip.compress(csv_body.encode()),
+        headers={"Content-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"imported": 5, "failed": 0, "errors": [], "stopped_at": None}
+    assert [len(postgrest.body(request)) for request in postgrest.requests] == [2, 2, 1]
+
+def test_rejected_rows_are_isolated_from_their_batch(client, postgrest):
+    inserted = []
+
+    def insert(request: httpx.Request) -> httpx.Response:
+        rows = json.loads(request.content)
+        # Inserts are all or nothing, like a batch insert in PostgreSQL
+        if any(row["notes"] == "rejected" for row in rows):
+            return httpx.Response(400, json={"message": "rejected by a check constraint", "code": "23514"})
+        inserted.extend(row["notes"] for row in rows)
+        return echo_insert(request)
+
+    postgrest.handler = insert
+    notes = ["a", "b", "rejected", "c", "d", "e", "rejected", "f"]
+    body = ndjson(*({"score": 5, "notes": note} for note in notes))
+
+    response = client.post(
+        "/moods/moods/import",
+        params={"format": "ndjson", "batch_size": 8},
+        content=body,
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 6
+    assert result["failed"] == 2
+    assert [error["row"] for error in result["errors"]] == [3, 7]
+    assert "rejected by a check constraint" in result["errors"][0]["errors"][0]
+    assert sorted(inserted) == ["a", "b", "c", "d", "e", "f"]
+
+def test_journal_csv_reads_list_columns_as_json(client, postgrest):
+    postgrest.handler = echo_insert
+    body = 'title,content,tags\nMonday,A calm day,"[""calm"", ""walk""]"\nTuesday,Rainy,not-json\n'
+
+    response = client.post(
+        "/journals/journals/import",
+        params={"defer_sentiment": True},
+        content=body.encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 1
+    assert result["errors"][0]["row"] == 2
+    assert result["errors"][0]["errors"][0].startswith("Invalid JSON array")
+    assert postgrest.body(postgrest.requests[0])[0]["tags"] == ["calm", "walk"]
+
+def test_unknown_format_is_rejected(client, postgrest):
+    response = client.post("/moods/moods/import", content=b"score\n5\n", headers={"Content-Type": "text/plain"})
+
+    assert response.status_code == 400
+    assert postgrest.requests == []
+
+def test_transport_failure_stops_the_import(client, postgrest):
+    def unreachable(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    postgrest.handler = unreachable
+    body = ndjson(*({"score": 5} for _ in range(20)))
+
+    response = client.post("/moods/moods/import", params={"format": "ndjson", "batch_size": 8}, content=body)
+
+    assert response.status_code == 200
+    result = response.json()
+    # One attempt, no bisection and no further batches
+    assert len(postgrest.requests) == 1
+    assert result["imported"] == 0
+    assert result["stopped_at"] == 1
+    assert result["errors"] == [{"row": 1, "errors": ["Insert failed, import stopped: connection refused"]}]
+
+def test_server_error_stops_after_the_imported_batches(client, postgrest):
+    def insert(request: httpx.Request) -> httpx.Response:
+        if len(postgrest.requests) > 1:
+            return httpx.Response(503, json={"message": "statement timeout", "code": "57014"})
+        return echo_insert(request)
+
+    postgrest.handler = insert
+    body = ndjson(*({"score": 5} for _ in range(20)))
+
+    response = client.post("/moods/moods/import", params={"format": "ndjson", "batch_size": 8}, content=body)
+
+    result = response.json()
+    assert len(postgrest.requests) == 2
+    assert result["imported"] == 8
+    assert result["stopped_at"] == 9
+    assert result["errors"][0]["errors"] == ["Insert failed, import stopped: statement timeout"]
@@ -0,0 +1,34 @@
+import asyncio
+import hashlib
+
+from app.services.journal_sentiment import ensure_analysis, SENTIMENT_DONE, SENTIMENT_PENDING
+from tests.conftest import USER_ID
+
+ENTRY_ID = "7c1d2e3f-0000-4000-8000-000000000001"
+
+def journal_entry(content: str):
+    return {"id": ENTRY_ID, "user_id": USER_ID, "content": content, "sentiment_status": SENTIMENT_PENDING}
+
+def test_analysis_is_written_for_the_analyzed_content(client, postgrest):
+    postgrest.respond([journal_entry("A calm and happy day")])
+    postgrest.respond([{"updated": 1}])
+
+    response = client.get(f"/journals/journals/{ENTRY_ID}/analysis")
+
+    assert response.status_code == 200
+    write = postgrest.requests[1]
+    assert write.url.path.endswith("/rpc/bulk_update_journal_sentiment")
+    [row] = postgrest.body(write)["updates"]
+    assert row["id"] == ENTRY_ID
+    assert row["content_md5"] == hashlib.md5("A calm and happy day".encode()).hexdigest()
+    assert row["sentiment_status"] == SENTIMENT_DONE
+
+def test_analysis_of_edited_content_leaves_the_entry_pending(postgrest):
+    # The guarded write matched no row: the content was edited while it was analyzed
+    postgrest.respond([{"updated": 0}])
+
+    analyzed = asyncio.run(ensure_analysis(journal_entry("A calm and happy day")))
+
+    assert len(postgrest.requests) == 1
+    assert analyzed["sentiment_label"] is not None
+    assert analyzed["sentiment_status"] == SENTIMENT_PENDING
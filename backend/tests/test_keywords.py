@@ -0,0 +1,19 @@
+from app.services.keywords import extract_keywords, extract_keywords_batch
+
+def test_keywords_keep_non_ascii_words():
+    assert extract_keywords("Café résumé naïve") == ["café", "résumé", "naïve"]
+
+def test_keywords_of_decomposed_accents_match_composed():
+    assert extract_keywords("cafe\u0301 au lait") == extract_keywords("caf\u00e9 au lait") == ["caf\u00e9", "lait"]
+
+def test_punctuation_and_stopwords_are_dropped():
+    keywords = extract_keywords("Work, work and more work... I'm exhausted; work never stops!")
+
+    assert keywords[0] == "work"
+    assert "i'm" not in keywords
+    assert all(keyword.isalpha() for keyword in keywords)
+
+def test_batch_matches_single_calls():
+    texts = ["Long walk by the river", "", "Deadline stress at work again, work everywhere"]
+
+    assert extract_keywords_batch(texts) == [extract_keywords(text) for text in texts]
@@ -0,0 +1,41 @@
+import pytest
+
+from app.services.lexicon import lexicon_scorer
+
+def positive(text: str) -> float:
+    return float(lexicon_scorer.positive_probability([text])[0])
+
+@pytest.mark.parametrize("text", [
+    "I am not very happy",
+    "I don't feel good today",
+    "I don’t feel good today",
+    "I never feel calm",
+])
+def test_negation_reaches_past_the_next_word(text):
+    assert positive(text) < 0.5
+
+@pytest.mark.parametrize("text", [
+    "not bad",
+    "I am not sad, I am happy",
+    "I was not sure but happy in the end",
+])
+def test_negation_stops_at_the_clause(text):
+    assert positive(text) > 0.5
+
+def test_negation_does_not_cross_texts():
+    scores = lexicon_scorer.positive_probability(["I am not", "happy"])
+
+    assert scores[1] == pytest.approx(positive("happy"))
+
+def test_batch_scores_match_single_texts():
+    texts = ["a wonderful calm morning", "so tired and anxious", "", "nothing to report"]
+
+    batch = lexicon_scorer.positive_probability(texts)
+
+    assert batch.tolist() == pytest.approx([positive(text) for text in texts])
+
+def test_predictions_have_the_classifier_shape():
+    predictions = lexicon_scorer.score_batch(["a wonderful day"])[0]
+
+    assert [item["label"] for item in predictions] == ["POSITIVE", "NEGATIVE"]
+    assert sum(item["score"] for item in predictions) == pytest.approx(1.0)
@@ -0,0 +1,118 @@
+import pytest
+
+from app.routers import journals as journals_router
+from tests.conftest import USER_ID
+
+MOOD_ID = "0d4c1b7e-8f2a-4c3e-9b6d-1e2f3a4b5c6d"
+ENTRY_ID = "7a9e2c4d-1b3f-4e5a-8c6d-2f1e0a9b8c7d"
+
+MOOD_ROW = {
+    "id": MOOD_ID,
+    "user_id": USER_ID,
+    "score": 7,
+    "notes": None,
+    "timestamp": "2026-10-16T08:00:00+00:00",
+    "created_at": "2026-10-16T08:00:00+00:00",
+}
+
+ENTRY_ROW = {
+    "id": ENTRY_ID,
+    "user_id": USER_ID,
+    "title": "Monday",
+    "content": "A calm day",
+    "created_at": "2026-10-16T08:00:00+00:00",
+    "sentiment_status": "done",
+    "tags": [],
+    "image_urls": [],
+}
+
+def assert_owned(request, method, table, row_id):
+    assert request.method == method
+    assert request.url.path == f"/rest/v1/{table}"
+    params = request.url.params
+    assert params["id"] == f"eq.{row_id}"
+    assert params["user_id"] == f"eq.{USER_ID}"
+
+def test_update_mood_is_one_request(client, postgrest):
+    postgrest.respond([MOOD_ROW])
+
+    response = client.put(f"/moods/moods/{MOOD_ID}", json={"score": 7})
+
+    assert response.status_code == 200
+    assert response.json()["score"] == 7
+    assert len(postgrest.requests) == 1
+    assert_owned(postgrest.requests[0], "PATCH", "moods", MOOD_ID)
+    assert postgrest.body(postgrest.requests[0]) == {"score": 7}
+
+def test_update_foreign_mood_is_not_found(client, postgrest):
+    postgrest.respond([])
+
+    response = client.put(f"/moods/moods/{MOOD_ID}", json={"score": 3})
+
+    assert response.status_code == 404
+    assert len(postgrest.requests) == 1
+
+def test_delete_mood_is_one_request(client, postgrest):
+    postgrest.respond([MOOD_ROW])
+
+    response = client.delete(f"/moods/moods/{MOOD_ID}")
+
+    assert response.status_code == 204
+    assert len(postgrest.requests) == 1
+    assert_owned(postgrest.requests[0], "DELETE", "moods", MOOD_ID)
+
+def test_delete_foreign_mood_is_not_found(client, postgrest):
+    postgrest.respond([])
+
+    assert client.delete(f"/moods/moods/{MOOD_ID}").status_code == 404
+    assert len(postgrest.requests) == 1
+
+def test_update_journal_entry_is_one_request(client, postgrest):
+    postgrest.respond([{**ENTRY_ROW, "title": "Tuesday"}])
+
+    response = client.put(f"/journals/journals/{ENTRY_ID}", json={"title": "Tuesday"})
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Tuesday"
+    assert len(postgrest.requests) == 1
+    assert_owned(postgrest.requests[0], "PATCH", "journal_entries", ENTRY_ID)
+    body = postgrest.body(postgrest.requests[0])
+    assert body["title"] == "Tuesday"
+    assert "updated_at" in body
+
+@pytest.mark.parametrize("status, enqueued", [("pending", [ENTRY_ID]), ("done", [])])
+def test_journal_content_edit_reanalyzes_only_when_marked_pending(client, postgrest, monkeypatch, status, enqueued):
+    queued = []
+
+    async def enqueue(entry_id):
+        queued.append(entry_id)
+
+    monkeypatch.setattr(journals_router, "enqueue_journal_sentiment", enqueue)
+    postgrest.respond([{**ENTRY_ROW, "sentiment_status": status}])
+
+    response = client.put(f"/journals/journals/{ENTRY_ID}", json={"content": "A calm day"})
+
+    assert response.status_code == 200
+    assert len(postgrest.requests) == 1
+    assert queued == enqueued
+
+def test_update_foreign_journal_entry_is_not_found(client, postgrest):
+    postgrest.respond([])
+
+    assert client.put(f"/journals/journals/{ENTRY_ID}", json={"title": "Tuesday"}).status_code == 404
+    assert len(postgrest.requests) == 1
+
+def test_delete_journal_entry_is_one_request(client, postgrest):
+    postgrest.respond([ENTRY_ROW])
+
+    response = client.delete(f"/journals/journals/{ENTRY_ID}")
+
+    assert response.status_code == 204
+    assert len(postgrest.requests) == 1
+    assert_owned(postgrest.requests[0], "DELETE", "journal_entries", ENTRY_ID)
+
+def test_delete_foreign_journal_entry_is_not_found(client, postgrest):
+    postgrest.respond([])
+
+    assert client.delete(f"/journals/journals/{ENTRY_ID}").status_code == 404
+    assert len(postgrest.requests) == 1
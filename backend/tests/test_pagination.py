@@ -0,0 +1,89 @@
+from app.repositories.base import decode_cursor, encode_cursor
+from tests.conftest import USER_ID
+
+def mood(row_id, timestamp, score=5):
+    return {
+        "id": row_id,
+        "user_id": USER_ID,
+        "score": score,
+        "notes": None,
+        "timestamp": timestamp,
+        "created_at": timestamp,
+    }
+
+ROWS = [
+    mood("3f2e1d0c-0000-4000-8000-000000000003", "2026-10-16T09:00:00+00:00"),
+    mood("3f2e1d0c-0000-4000-8000-000000000002", "2026-10-16T08:00:00+00:00"),
+    mood("3f2e1d0c-0000-4000-8000-000000000001", "2026-10-16T08:00:00+00:00"),
+]
+
+def test_first_page_orders_by_keyset_and_returns_next_cursor(client, postgrest):
+    postgrest.respond(ROWS)
+
+    response = client.get("/moods/moods/", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert [row["id"] for row in response.json()] == [row["id"] for row in ROWS[:2]]
+    assert response.headers["X-Next-Cursor"] == encode_cursor(ROWS[1], "timestamp")
+
+    params = postgrest.requests[0].url.params
+    assert params["order"] == "timestamp.desc,id.desc"
+    # One extra row tells whether there is a next page
+    assert params["limit"] == "3"
+    assert "or" not in params
+    assert "offset" not in params
+
+def test_last_page_has_no_next_cursor(client, postgrest):
+    postgrest.respond(ROWS[:2])
+
+    response = client.get("/moods/moods/", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+
+def test_cursor_seeks_past_the_previous_page(client, postgrest):
+    cursor = encode_cursor(ROWS[1], "timestamp")
+    postgrest.respond(ROWS[2:])
+
+    response = client.get("/moods/moods/", params={"limit": 2, "cursor": cursor})
+
+    assert response.status_code == 200
+    params = postgrest.requests[0].url.params
+    timestamp, row_id = ROWS[1]["timestamp"], ROWS[1]["id"]
+    assert params["or"] == f'(timestamp.lt."{timestamp}",and(timestamp.eq."{timestamp}",id.lt.{row_id}))'
+    assert params["order"] == "timestamp.desc,id.desc"
+    assert "offset" not in params
+
+def test_journal_cursor_uses_created_at(client, postgrest):
+    row = {"id": "3f2e1d0c-0000-4000-8000-00000000000a", "created_at": "2026-10-15T20:00:00+00:00"}
+    postgrest.respond([])
+
+    response = client.get("/journals/journals/", params={"cursor": encode_cursor(row, "created_at")})
+
+    assert response.status_code == 200
+    params = postgrest.requests[0].url.params
+    assert params["or"] == (
+        f'(created_at.lt."{row["created_at"]}",and(created_at.eq."{row["created_at"]}",id.lt.{row["id"]}))'
+    )
+    assert params["order"] == "created_at.desc,id.desc"
+
+def test_cursor_round_trips():
+    assert decode_cursor(encode_cursor(ROWS[0], "timestamp")) == (ROWS[0]["timestamp"], ROWS[0]["id"])
+
+def test_malformed_cursor_is_rejected_without_a_query(client, postgrest):
+    # A sort value that would break out of the or= filter
+    forged = encode_cursor({"timestamp": '2026",id.gt.0', "id": ROWS[0]["id"]}, "timestamp")
+
+    for cursor in ("not-a-cursor", forged):
+        response = client.get("/moods/moods/", params={"cursor": cursor})
+        assert response.status_code == 400
+
+    assert postgrest.requests == []
+
+def test_cursor_and_skip_are_exclusive(client, postgrest):
+    cursor = encode_cursor(ROWS[0], "timestamp")
+
+    response = client.get("/moods/moods/", params={"cursor": cursor, "skip": 20})
+
+    assert response.status_code == 400
+    assert postgrest.requests == []
@@ -0,0 +1,32 @@
+from tests.conftest import USER_ID
+
+MOOD_ID = "3f2e1d0c-0000-4000-8000-000000000001"
+
+def test_fields_projects_the_list_select(client, postgrest):
+    postgrest.respond([{"id": MOOD_ID, "timestamp": "2026-10-16T08:00:00+00:00", "score": 5}])
+
+    response = client.get("/moods/moods/", params={"fields": "score"})
+
+    assert response.status_code == 200
+    # The id and sort key are always selected, the next cursor is built from them
+    assert postgrest.requests[0].url.params["select"] == "id,timestamp,score"
+    assert set(response.json()[0]) == {"id", "timestamp", "score"}
+
+def test_fields_projects_the_detail_select(client, postgrest):
+    postgrest.respond([{"id": MOOD_ID, "notes": "walk"}])
+
+    response = client.get(f"/moods/moods/{MOOD_ID}", params={"fields": "notes,notes"})
+
+    assert response.status_code == 200
+    params = postgrest.requests[0].url.params
+    assert params["select"] == "id,notes"
+    assert params["user_id"] == f"eq.{USER_ID}"
+    assert response.json() == {"id": MOOD_ID, "notes": "walk"}
+
+def test_unknown_fields_are_rejected(client, postgrest):
+    for path in ("/moods/moods/", f"/moods/moods/{MOOD_ID}", "/moods/moods/export", "/journals/journals/"):
+        response = client.get(path, params={"fields": "notes,password" if path.startswith("/moods") else "title,password"})
+        assert response.status_code == 400, path
+        assert "Unknown fields: password" in response.json()["detail"]
+
+    assert postgrest.requests == []
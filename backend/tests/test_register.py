@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers.auth import register_user
+from app.schemas.auth import UserCreate
+
+# The /register stub declared earlier in the router shadows this handler's route, so it is called directly
+def register(email: str = "new@example.com"):
+    return asyncio.run(register_user(UserCreate(email=email, full_name="New User", password="correct horse")))
+
+def test_new_email_is_one_upsert(postgrest):
+    postgrest.respond([{"id": "6e1f0c2a-0000-4000-8000-000000000001", "email": "new@example.com", "full_name": "New User"}])
+
+    user = register()
+
+    assert user["email"] == "new@example.com"
+    assert len(postgrest.requests) == 1
+    request = postgrest.requests[0]
+    assert request.method == "POST"
+    assert request.url.path == "/rest/v1/users"
+    assert request.url.params["on_conflict"] == "email"
+    assert "resolution=ignore-duplicates" in request.headers["prefer"]
+    # Only the hash is sent
+    assert postgrest.body(request)["password"] != "correct horse"
+
+def test_duplicate_email_is_a_conflict(postgrest):
+    # An ignored duplicate returns no rows
+    postgrest.respond([])
+
+    with pytest.raises(HTTPException) as error:
+        register()
+
+    assert error.value.status_code == 409
+    assert len(postgrest.requests) == 1
@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from app.services.ai import analyze_sentiment
+
+@pytest.mark.parametrize("text", ["", "   \n"])
+def test_blank_text_is_neutral(text):
+    result = asyncio.run(analyze_sentiment(text))
+
+    assert result["label"] == "NEUTRAL"
+    assert result["score"] == 0.5
+
+def test_long_text_is_scored_in_chunks():
+    text = "I had a wonderful calm morning. " * 40 + "Then I felt anxious and exhausted. " * 40
+
+    result = asyncio.run(analyze_sentiment(text))
+
+    assert len(result["chunks"]) > 1
+    assert sum(chunk["length"] for chunk in result["chunks"]) <= len(text)
+
+def test_sentiment_endpoint_rejects_blank_text(client):
+    for text in ("", "   "):
+        assert client.post("/ai/ai/sentiment", json={"text": text}).status_code == 422
+
+def test_sentiment_endpoint_scores_locally(client):
+    response = client.post("/ai/ai/sentiment", json={"text": "I don't feel good today."})
+
+    assert response.status_code == 200
+    assert response.json()["label"] == "NEGATIVE"
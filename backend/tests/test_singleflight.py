@@ -0,0 +1,58 @@
+import asyncio
+
+from app.services.singleflight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        group = SingleFlight("test")
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(group.do("key", fn) for _ in range(5)))
+        return results, calls, group.stats()
+
+    results, calls, stats = asyncio.run(scenario())
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert stats["shared_in_process"] == 4
+    assert stats["in_flight"] == 0
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    async def scenario():
+        group = SingleFlight("test")
+
+        async def fn():
+            await asyncio.sleep(0.05)
+            return 42
+
+        leader = asyncio.create_task(group.do("key", fn))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(group.do("key", fn))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await waiter, leader.cancelled()
+
+    assert asyncio.run(scenario()) == (42, True)
+
+def test_errors_are_shared_and_the_key_is_released():
+    async def scenario():
+        group = SingleFlight("test")
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(group.do("key", fail), group.do("key", fail), return_exceptions=True)
+        # A later call runs again instead of reusing the failure
+        retried = await group.do("key", lambda: asyncio.sleep(0, result="ok"))
+        return results, retried
+
+    results, retried = asyncio.run(scenario())
+
+    assert [str(result) for result in results] == ["upstream down", "upstream down"]
+    assert retried == "ok"
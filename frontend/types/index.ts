@@ -22,6 +22,8 @@ export interface JournalEntry {
   created_at: string;
   updated_at?: string;
   sentiment_score?: number;
+  sentiment_status?: 'pending' | 'done' | 'failed';
+  sentiment_label?: string;
   tags: string[];
   image_urls: string[];
 }